@@ -210,46 +210,46 @@ def main():
             logger.info("Step 6: Generating reports and dashboards")
             
             # Initialize report generators
-            pdf_generator = PDFGenerator()
             dashboard_prep = DashboardPrep()
             
-            # Generate PDF reports
-            
-            # Monthly summary report
-            summary_data = {
-                'merchant_count': len(processed_df),
-                'agent_count': len(agent_metrics),
-                'total_volume': processed_df['total_volume'].sum(),
-                'total_txns': processed_df['total_txns'].sum() if 'total_txns' in processed_df.columns else 0,
-                'total_profit': processed_df['net_profit'].sum(),
-                'processing_time': time.time() - start_time
-            }
-            
-            monthly_report_path = pdf_generator.create_monthly_summary(
-                args.month, 
-                summary_data,
-                agent_metrics,
-                top_merchants
-            )
-            report_files.append(monthly_report_path)
-            
-            # Agent statements
-            for _, agent_row in agent_metrics.iterrows():
-                agent_name = agent_row['agent_name']
-                agent_data = agent_row.to_dict()
+            # Background PDF writes are flushed when the block exits, before anything
+            # reads the report files, and also when a report fails part way
+            with PDFGenerator() as pdf_generator:
+                # Monthly summary report
+                summary_data = {
+                    'merchant_count': len(processed_df),
+                    'agent_count': len(agent_metrics),
+                    'total_volume': processed_df['total_volume'].sum(),
+                    'total_txns': processed_df['total_txns'].sum() if 'total_txns' in processed_df.columns else 0,
+                    'total_profit': processed_df['net_profit'].sum(),
+                    'processing_time': time.time() - start_time
+                }
                 
-                # Get merchants for this agent
-                agent_merchants = processed_df[processed_df['agent_name'] == agent_name]
+                monthly_report_path = pdf_generator.create_monthly_summary(
+                    args.month, 
+                    summary_data,
+                    agent_metrics,
+                    top_merchants
+                )
+                report_files.append(monthly_report_path)
                 
-                if not agent_merchants.empty:
-                    agent_report_path = pdf_generator.create_agent_statement(
-                        agent_name,
-                        args.month,
-                        agent_data,
-                        agent_merchants
-                    )
-                    report_files.append(agent_report_path)
-            
+                # Agent statements
+                for _, agent_row in agent_metrics.iterrows():
+                    agent_name = agent_row['agent_name']
+                    agent_data = agent_row.to_dict()
+                    
+                    # Get merchants for this agent
+                    agent_merchants = processed_df[processed_df['agent_name'] == agent_name]
+                    
+                    if not agent_merchants.empty:
+                        agent_report_path = pdf_generator.create_agent_statement(
+                            agent_name,
+                            args.month,
+                            agent_data,
+                            agent_merchants
+                        )
+                        report_files.append(agent_report_path)
+
             # Generate dashboard JSON files
             dashboard_prep.generate_top_merchants_json(top_merchants)
             dashboard_prep.generate_top_agents_json(top_agents)
@@ -14,8 +14,40 @@ import json
 
 from irelandpay_analytics.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Slack limits: blocks per message and characters per block text
+SLACK_MAX_BLOCKS = 50
+SLACK_MAX_TEXT_LENGTH = 3000
+
+# Skeleton shared by every Slack header block; copied and filled per message
+_HEADER_BLOCK_TEMPLATE = {"type": "header", "text": {"type": "plain_text", "text": ""}}
+
+
+def _header_block(text: str) -> Dict[str, Any]:
+    """Build a Slack header block from the shared skeleton."""
+    return {**_HEADER_BLOCK_TEMPLATE, "text": {**_HEADER_BLOCK_TEMPLATE["text"], "text": text}}
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a Slack payload straight to bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _trim_block_text(text: str) -> str:
+    """Trim text to fit within a single Slack block."""
+    if len(text) <= SLACK_MAX_TEXT_LENGTH:
+        return text
+    return text[:SLACK_MAX_TEXT_LENGTH - 3] + "..."
+
+
 class Notifier:
     """Sends email and Slack notifications."""
     
@@ -28,6 +60,15 @@ class Notifier:
         self.sender_email = settings.SENDER_EMAIL
         self.slack_webhook_url = settings.SLACK_WEBHOOK_URL
         
+        # Resolve the admin recipient list once instead of on every notification
+        recipients = settings.EMAIL_RECIPIENTS or ()
+        if isinstance(recipients, str):
+            recipients = recipients.split(',')
+        self.recipients = tuple(r for r in recipients if r)
+        
+        # Slack blocks queued for a single batched webhook call (see flush_slack)
+        self._slack_queue: List[Dict[str, Any]] = []
+        
         logger.info("Initialized Notifier")
     
     def send_email(self, recipient_emails: List[str], subject: str, 
@@ -106,7 +147,7 @@ class Notifier:
             
             response = requests.post(
                 self.slack_webhook_url,
-                data=json.dumps(payload),
+                data=_encode_payload(payload),
                 headers={"Content-Type": "application/json"}
             )
             
@@ -121,6 +162,26 @@ class Notifier:
             logger.error(f"Failed to send Slack notification: {str(e)}")
             return False
     
+    def flush_slack(self) -> bool:
+        """
+        Send all queued Slack blocks, packing up to SLACK_MAX_BLOCKS per message.
+        
+        Returns:
+            True if every batch was sent successfully, False otherwise
+        """
+        if not self._slack_queue:
+            return True
+        
+        queued, self._slack_queue = self._slack_queue, []
+        success = True
+        
+        for start in range(0, len(queued), SLACK_MAX_BLOCKS):
+            batch = queued[start:start + SLACK_MAX_BLOCKS]
+            message = f"{len(batch)} Ireland Pay notification(s)"
+            success = self.send_slack_message(message, batch) and success
+        
+        return success
+    
     def notify_pipeline_success(self, month: str, stats: Dict[str, Any], 
                               report_files: Optional[List[str]] = None) -> None:
         """
@@ -159,21 +220,14 @@ class Notifier:
         """
         
         # Send email notification
-        if settings.EMAIL_RECIPIENTS:
-            recipients = settings.EMAIL_RECIPIENTS.split(',')
-            self.send_email(recipients, subject, email_body, report_files)
+        if self.recipients:
+            self.send_email(list(self.recipients), subject, email_body, report_files)
         
         # Slack notification
         slack_message = f"✅ Ireland Pay Analytics Pipeline for {month} completed successfully!"
         
         slack_blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"✅ Analytics Pipeline Success - {month}"
-                }
-            },
+            _header_block(f"✅ Analytics Pipeline Success - {month}"),
             {
                 "type": "section",
                 "fields": [
@@ -202,9 +256,10 @@ class Notifier:
             }
         ]
         
-        # Send Slack notification
+        # Send Slack notification, followed by any queued agent statement blocks
         if self.slack_webhook_url:
             self.send_slack_message(slack_message, slack_blocks)
+            self.flush_slack()
     
     def notify_pipeline_error(self, month: str, error_message: str, 
                             error_details: Optional[str] = None) -> None:
@@ -241,21 +296,14 @@ class Notifier:
         """
         
         # Send email notification
-        if settings.EMAIL_RECIPIENTS:
-            recipients = settings.EMAIL_RECIPIENTS.split(',')
-            self.send_email(recipients, subject, email_body)
+        if self.recipients:
+            self.send_email(list(self.recipients), subject, email_body)
         
         # Slack notification
         slack_message = f"⚠️ Ireland Pay Analytics Pipeline Error for {month}: {error_message}"
         
         slack_blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"⚠️ Analytics Pipeline Error - {month}"
-                }
-            },
+            _header_block(f"⚠️ Analytics Pipeline Error - {month}"),
             {
                 "type": "section",
                 "text": {
@@ -274,9 +322,10 @@ class Notifier:
                 }
             })
         
-        # Send Slack notification
+        # Send Slack notification, followed by any agent statement blocks queued before the failure
         if self.slack_webhook_url:
             self.send_slack_message(slack_message, slack_blocks)
+            self.flush_slack()
     
     def notify_agent_statement_ready(self, agent_name: str, month: str, 
                                    statement_path: str) -> None:
@@ -317,6 +366,15 @@ class Notifier:
         logger.info(f"Would send agent statement to {agent_name} if email was available")
         
         # For demo purposes, we can send to the admin email
-        if settings.EMAIL_RECIPIENTS:
-            recipients = settings.EMAIL_RECIPIENTS.split(',')
-            self.send_email(recipients, subject, email_body, [statement_path])
+        if self.recipients:
+            self.send_email(list(self.recipients), subject, email_body, [statement_path])
+        
+        # Queue a Slack block; queued blocks go out in one message via flush_slack
+        if self.slack_webhook_url:
+            self._slack_queue.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": _trim_block_text(f"*Agent statement ready:* {agent_name} ({month})")
+                }
+            })
@@ -1,34 +1,242 @@
 """
 PDF generator module for creating PDF reports and agent statements.
 """
+import gc
 import logging
 import os
-from typing import Dict, List, Any, Optional
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 import pandas as pd
 from datetime import datetime
-from fpdf import FPDF
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 
 from irelandpay_analytics.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Force a garbage collection pass after this many charts to reclaim figure state
+GC_EVERY_N_CHARTS = 50
+
+# Cell formatters; bound once so the format spec is parsed a single time per column
+_format_currency = "${:,.2f}".format
+_format_count = "{:,}".format
+_format_decimal = "{:.2f}".format
+
+
+# fpdf, matplotlib and seaborn are imported on first use so that callers which
+# never render a report (e.g. notification-only runs) don't pay their import cost.
+# The module-level names stay patchable; an accessor only imports while its name is None.
+FPDF = None
+plt = None
+sns = None
+
+
+def _fpdf_class():
+    """Import and return the FPDF class."""
+    global FPDF
+    if FPDF is None:
+        from fpdf import FPDF
+    return FPDF
+
+
+def _pyplot():
+    """Import, configure and return matplotlib.pyplot."""
+    global plt
+    if plt is None:
+        import matplotlib
+        import matplotlib.pyplot
+        
+        # Charts are closed explicitly, so silence the open-figure warning and let Agg
+        # simplify and chunk long historical series instead of rendering every vertex
+        matplotlib.rcParams['figure.max_open_warning'] = 0
+        matplotlib.rcParams['path.simplify'] = True
+        matplotlib.rcParams['agg.path.chunksize'] = 10000
+        plt = matplotlib.pyplot
+    return plt
+
+
+def _seaborn():
+    """Import and return seaborn."""
+    global sns
+    if sns is None:
+        import seaborn as sns
+    return sns
+
+
+# Second footer line shared by every report
+_FOOTER_LINE2 = "Ireland Pay Analytics"
+
+
+def _pdf_bytes(pdf: Any) -> bytes:
+    """Render a finished FPDF document to bytes without touching the disk."""
+    buf = pdf.output(dest='S')
+    # fpdf returns a latin-1 str, fpdf2 returns a bytearray
+    return buf.encode('latin-1') if isinstance(buf, str) else bytes(buf)
+
+
+def _atomic_write(filepath: Path, data: bytes) -> None:
+    """
+    Write bytes via a temporary file and rename, so readers never see a partial PDF.
+    
+    Args:
+        filepath: Destination path
+        data: File contents
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_footer(pdf: Any, footer_line: str) -> None:
+    """
+    Write the standard two-line report footer.
+    
+    Args:
+        pdf: PDF being rendered
+        footer_line: Pre-formatted "Generated on ..." line
+    """
+    pdf.ln(10)
+    pdf.set_font("Arial", "I", 8)
+    pdf.cell(0, 10, footer_line, ln=True)
+    pdf.cell(0, 10, _FOOTER_LINE2, ln=True)
+
+
+# Columns read by each report table, mapped to the value used when a column is absent
+_STATEMENT_MERCHANT_COLUMNS = {
+    'merchant_dba': 'Unknown', 'total_volume': 0, 'total_txns': 0, 'bps': 0, 'earnings': 0
+}
+_SUMMARY_AGENT_COLUMNS = {
+    'agent_name': 'Unknown', 'merchant_count': 0, 'total_volume': 0, 'total_earnings': 0
+}
+_SUMMARY_MERCHANT_COLUMNS = {
+    'merchant_dba': 'Unknown', 'total_volume': 0, 'total_txns': 0, 'net_profit': 0
+}
+
+# Summary dict keys read by each report, mapped to their defaults
+_AGENT_SUMMARY_DEFAULTS = {
+    'merchant_count': 0, 'total_volume': 0, 'total_earnings': 0, 'effective_bps': 0
+}
+_MERCHANT_SUMMARY_DEFAULTS = {
+    'total_volume': 0, 'total_txns': 0, 'avg_txn_size': 0, 'net_profit': 0, 'bps': 0,
+    'profit_margin': 0
+}
+_MONTHLY_SUMMARY_DEFAULTS = {
+    'merchant_count': 0, 'agent_count': 0, 'total_volume': 0, 'total_txns': 0, 'total_profit': 0,
+    'volume_change_pct': 0, 'profit_change_pct': 0, 'merchant_count_change': 0
+}
+
+
+def _validate_schema(df: pd.DataFrame, columns: Dict[str, Any], table: str) -> pd.DataFrame:
+    """
+    Check a table's columns once up front so rows can be read without per-cell guards.
+    
+    Args:
+        df: DataFrame holding the table rows
+        columns: Required columns mapped to the default used when one is missing
+        table: Table name used in the warning
+        
+    Returns:
+        The DataFrame, with any missing columns filled with their defaults
+    """
+    missing = [column for column in columns if column not in df.columns]
+    if not missing:
+        return df
+    
+    logger.warning(f"{table} data is missing columns {missing}; using defaults")
+    return df.assign(**{column: columns[column] for column in missing})
+
+
+def _truncate_name(name: str) -> str:
+    """Shorten a name so it fits in a table cell."""
+    return name if len(name) <= 25 else name[:22] + "..."
+
+
+def _format_column(df: pd.DataFrame, column: str, formatter: Callable[[Any], str]) -> List[str]:
+    """
+    Format a whole DataFrame column in one pass.
+    
+    Args:
+        df: DataFrame holding the table rows (validated with _validate_schema)
+        column: Column to format
+        formatter: Callable applied to each value
+        
+    Returns:
+        List of formatted strings, one per row
+    """
+    return df[column].map(formatter).tolist()
+
+
 class PDFGenerator:
     """Generates PDF reports and agent statements."""
     
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, generated_at: Optional[str] = None):
         """
         Initialize the PDF generator.
         
         Args:
             output_dir: Directory to save PDF files (defaults to settings.PROCESSED_DATA_DIR / "reports")
+            generated_at: Timestamp printed in report footers (defaults to the time the
+                generator was created, so every report in a batch shares one value)
         """
         self.output_dir = output_dir or (settings.PROCESSED_DATA_DIR / "reports")
+        self.generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._footer_line = f"Generated on {self.generated_at}"
+        self._charts_rendered = 0
+        # Disk writes run on a background thread so the next report renders meanwhile
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-writer")
+        self._pending_writes: List[Future] = []
         self.output_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Initialized PDFGenerator with output directory: {self.output_dir}")
     
+    def _save(self, pdf: Any, filepath: Path) -> None:
+        """
+        Render a PDF to memory and hand the disk write to the background writer.
+        
+        Args:
+            pdf: Finished FPDF document
+            filepath: Destination path
+        """
+        # Drop completed writes so a long batch doesn't accumulate futures
+        self._pending_writes = [f for f in self._pending_writes
+                                if not f.done() or f.exception() is not None]
+        self._pending_writes.append(self._writer.submit(_atomic_write, filepath, _pdf_bytes(pdf)))
+    
+    def close(self) -> None:
+        """
+        Wait for all queued PDF writes to finish and stop the writer thread.
+        
+        Call this at the end of a batch, before the report files are read or attached.
+        
+        Raises:
+            Exception: The first error raised by a background write, if any
+        """
+        self._writer.shutdown(wait=True)
+        pending, self._pending_writes = self._pending_writes, []
+        for future in pending:
+            future.result()
+        logger.info("All queued PDF reports written")
+    
+    def __enter__(self) -> "PDFGenerator":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the generator, so queued writes are joined however the batch ends."""
+        if exc_type is None:
+            self.close()
+            return
+        
+        # Don't let a failed background write replace the error already propagating
+        try:
+            self.close()
+        except Exception as write_error:
+            logger.error(f"Queued PDF write failed: {write_error}")
+    
     def create_agent_statement(self, agent_name: str, month: str, 
                               agent_data: Dict[str, Any],
                               merchant_data: pd.DataFrame) -> str:
@@ -47,7 +255,7 @@ class PDFGenerator:
         logger.info(f"Creating agent statement for {agent_name} for {month}")
         
         # Create a PDF object
-        pdf = FPDF()
+        pdf = _fpdf_class()()
         pdf.add_page()
         
         # Set up fonts
@@ -61,11 +269,13 @@ class PDFGenerator:
         pdf.set_font("Arial", "B", 12)
         pdf.cell(0, 10, "Agent Summary", ln=True)
         
+        stats = {**_AGENT_SUMMARY_DEFAULTS, **agent_data}
+        
         pdf.set_font("Arial", "", 10)
-        pdf.cell(0, 6, f"Total Merchants: {agent_data.get('merchant_count', 0)}", ln=True)
-        pdf.cell(0, 6, f"Total Volume: ${agent_data.get('total_volume', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"Total Earnings: ${agent_data.get('total_earnings', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"Effective BPS: {agent_data.get('effective_bps', 0):.2f}", ln=True)
+        pdf.cell(0, 6, f"Total Merchants: {stats['merchant_count']}", ln=True)
+        pdf.cell(0, 6, f"Total Volume: ${stats['total_volume']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"Total Earnings: ${stats['total_earnings']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"Effective BPS: {stats['effective_bps']:.2f}", ln=True)
         
         # Merchant table
         pdf.ln(10)
@@ -84,36 +294,31 @@ class PDFGenerator:
         pdf.set_font("Arial", "", 8)
         
         # Sort merchants by volume
+        merchant_data = _validate_schema(merchant_data, _STATEMENT_MERCHANT_COLUMNS, "Merchant")
         merchant_data = merchant_data.sort_values('total_volume', ascending=False)
         
-        for _, row in merchant_data.iterrows():
-            merchant_name = row.get('merchant_dba', 'Unknown')
-            if len(merchant_name) > 25:
-                merchant_name = merchant_name[:22] + "..."
-                
-            volume = row.get('total_volume', 0)
-            txns = row.get('total_txns', 0)
-            bps = row.get('bps', 0)
-            earnings = row.get('earnings', 0)
-            
-            pdf.cell(60, 6, merchant_name, border=1)
-            pdf.cell(30, 6, f"${volume:,.2f}", border=1)
-            pdf.cell(30, 6, f"{txns:,}", border=1)
-            pdf.cell(30, 6, f"{bps:.2f}", border=1)
-            pdf.cell(30, 6, f"${earnings:,.2f}", border=1, ln=True)
+        names = _format_column(merchant_data, 'merchant_dba', _truncate_name)
+        volumes = _format_column(merchant_data, 'total_volume', _format_currency)
+        txns = _format_column(merchant_data, 'total_txns', _format_count)
+        bps = _format_column(merchant_data, 'bps', _format_decimal)
+        earnings = _format_column(merchant_data, 'earnings', _format_currency)
+        
+        for name, volume, txn_count, row_bps, row_earnings in zip(names, volumes, txns, bps, earnings):
+            pdf.cell(60, 6, name, border=1)
+            pdf.cell(30, 6, volume, border=1)
+            pdf.cell(30, 6, txn_count, border=1)
+            pdf.cell(30, 6, row_bps, border=1)
+            pdf.cell(30, 6, row_earnings, border=1, ln=True)
         
         # Footer
-        pdf.ln(10)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(0, 10, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
-        pdf.cell(0, 10, "Ireland Pay Analytics", ln=True)
+        _write_footer(pdf, self._footer_line)
         
         # Save the PDF
         filename = f"{agent_name.replace(' ', '_')}_{month}_statement.pdf"
         filepath = self.output_dir / filename
-        pdf.output(str(filepath))
+        self._save(pdf, filepath)
         
-        logger.info(f"Agent statement saved to {filepath}")
+        logger.info(f"Agent statement queued for writing to {filepath}")
         return str(filepath)
     
     def create_merchant_report(self, mid: str, merchant_name: str, month: str,
@@ -135,7 +340,7 @@ class PDFGenerator:
         logger.info(f"Creating merchant report for {merchant_name} ({mid}) for {month}")
         
         # Create a PDF object
-        pdf = FPDF()
+        pdf = _fpdf_class()()
         pdf.add_page()
         
         # Set up fonts
@@ -149,14 +354,16 @@ class PDFGenerator:
         pdf.set_font("Arial", "B", 12)
         pdf.cell(0, 10, "Merchant Summary", ln=True)
         
+        stats = {**_MERCHANT_SUMMARY_DEFAULTS, **merchant_data}
+        
         pdf.set_font("Arial", "", 10)
         pdf.cell(0, 6, f"Merchant ID: {mid}", ln=True)
-        pdf.cell(0, 6, f"Total Volume: ${merchant_data.get('total_volume', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"Total Transactions: {merchant_data.get('total_txns', 0):,}", ln=True)
-        pdf.cell(0, 6, f"Average Transaction Size: ${merchant_data.get('avg_txn_size', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"Net Profit: ${merchant_data.get('net_profit', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"BPS: {merchant_data.get('bps', 0):.2f}", ln=True)
-        pdf.cell(0, 6, f"Profit Margin: {merchant_data.get('profit_margin', 0):.2f}%", ln=True)
+        pdf.cell(0, 6, f"Total Volume: ${stats['total_volume']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"Total Transactions: {stats['total_txns']:,}", ln=True)
+        pdf.cell(0, 6, f"Average Transaction Size: ${stats['avg_txn_size']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"Net Profit: ${stats['net_profit']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"BPS: {stats['bps']:.2f}", ln=True)
+        pdf.cell(0, 6, f"Profit Margin: {stats['profit_margin']:.2f}%", ln=True)
         
         # Historical chart if data is available
         if historical_data is not None and not historical_data.empty:
@@ -165,6 +372,8 @@ class PDFGenerator:
             pdf.cell(0, 10, "Historical Performance", ln=True)
             
             # Create a chart of historical volume
+            plt = _pyplot()
+            sns = _seaborn()
             plt.figure(figsize=(8, 4))
             sns.lineplot(data=historical_data, x='month', y='total_volume')
             plt.title('Monthly Volume')
@@ -174,7 +383,12 @@ class PDFGenerator:
             # Save the chart to a temporary file
             chart_path = self.output_dir / f"temp_{mid}_volume_chart.png"
             plt.savefig(chart_path)
-            plt.close()
+            plt.close('all')
+            
+            # Seaborn leaves axes-level state behind that close() alone doesn't reclaim
+            self._charts_rendered += 1
+            if self._charts_rendered % GC_EVERY_N_CHARTS == 0:
+                gc.collect()
             
             # Add the chart to the PDF
             pdf.image(str(chart_path), x=10, y=None, w=180)
@@ -183,17 +397,14 @@ class PDFGenerator:
             os.remove(chart_path)
         
         # Footer
-        pdf.ln(10)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(0, 10, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
-        pdf.cell(0, 10, "Ireland Pay Analytics", ln=True)
+        _write_footer(pdf, self._footer_line)
         
         # Save the PDF
         filename = f"{mid}_{month}_report.pdf"
         filepath = self.output_dir / filename
-        pdf.output(str(filepath))
+        self._save(pdf, filepath)
         
-        logger.info(f"Merchant report saved to {filepath}")
+        logger.info(f"Merchant report queued for writing to {filepath}")
         return str(filepath)
     
     def create_monthly_summary(self, month: str, summary_data: Dict[str, Any],
@@ -214,7 +425,7 @@ class PDFGenerator:
         logger.info(f"Creating monthly summary report for {month}")
         
         # Create a PDF object
-        pdf = FPDF()
+        pdf = _fpdf_class()()
         pdf.add_page()
         
         # Set up fonts
@@ -228,12 +439,14 @@ class PDFGenerator:
         pdf.set_font("Arial", "B", 12)
         pdf.cell(0, 10, "Overall Summary", ln=True)
         
+        stats = {**_MONTHLY_SUMMARY_DEFAULTS, **summary_data}
+        
         pdf.set_font("Arial", "", 10)
-        pdf.cell(0, 6, f"Total Merchants: {summary_data.get('merchant_count', 0):,}", ln=True)
-        pdf.cell(0, 6, f"Total Agents: {summary_data.get('agent_count', 0):,}", ln=True)
-        pdf.cell(0, 6, f"Total Volume: ${summary_data.get('total_volume', 0):,.2f}", ln=True)
-        pdf.cell(0, 6, f"Total Transactions: {summary_data.get('total_txns', 0):,}", ln=True)
-        pdf.cell(0, 6, f"Total Profit: ${summary_data.get('total_profit', 0):,.2f}", ln=True)
+        pdf.cell(0, 6, f"Total Merchants: {stats['merchant_count']:,}", ln=True)
+        pdf.cell(0, 6, f"Total Agents: {stats['agent_count']:,}", ln=True)
+        pdf.cell(0, 6, f"Total Volume: ${stats['total_volume']:,.2f}", ln=True)
+        pdf.cell(0, 6, f"Total Transactions: {stats['total_txns']:,}", ln=True)
+        pdf.cell(0, 6, f"Total Profit: ${stats['total_profit']:,.2f}", ln=True)
         
         # Month-over-month changes
         if 'volume_change_pct' in summary_data:
@@ -242,9 +455,9 @@ class PDFGenerator:
             pdf.cell(0, 8, "Month-over-Month Changes", ln=True)
             
             pdf.set_font("Arial", "", 10)
-            pdf.cell(0, 6, f"Volume Change: {summary_data.get('volume_change_pct', 0):.2f}%", ln=True)
-            pdf.cell(0, 6, f"Profit Change: {summary_data.get('profit_change_pct', 0):.2f}%", ln=True)
-            pdf.cell(0, 6, f"Merchant Count Change: {summary_data.get('merchant_count_change', 0):+,}", ln=True)
+            pdf.cell(0, 6, f"Volume Change: {stats['volume_change_pct']:.2f}%", ln=True)
+            pdf.cell(0, 6, f"Profit Change: {stats['profit_change_pct']:.2f}%", ln=True)
+            pdf.cell(0, 6, f"Merchant Count Change: {stats['merchant_count_change']:+,}", ln=True)
         
         # Top agents table
         pdf.ln(10)
@@ -262,21 +475,19 @@ class PDFGenerator:
         pdf.set_font("Arial", "", 8)
         
         # Sort agents by earnings
+        agent_data = _validate_schema(agent_data, _SUMMARY_AGENT_COLUMNS, "Agent")
         agent_data = agent_data.sort_values('total_earnings', ascending=False).head(10)
         
-        for _, row in agent_data.iterrows():
-            agent_name = row.get('agent_name', 'Unknown')
-            if len(agent_name) > 25:
-                agent_name = agent_name[:22] + "..."
-                
-            merchant_count = row.get('merchant_count', 0)
-            volume = row.get('total_volume', 0)
-            earnings = row.get('total_earnings', 0)
-            
-            pdf.cell(60, 6, agent_name, border=1)
-            pdf.cell(30, 6, f"{merchant_count:,}", border=1)
-            pdf.cell(40, 6, f"${volume:,.2f}", border=1)
-            pdf.cell(40, 6, f"${earnings:,.2f}", border=1, ln=True)
+        names = _format_column(agent_data, 'agent_name', _truncate_name)
+        merchant_counts = _format_column(agent_data, 'merchant_count', _format_count)
+        volumes = _format_column(agent_data, 'total_volume', _format_currency)
+        earnings = _format_column(agent_data, 'total_earnings', _format_currency)
+        
+        for name, merchant_count, volume, row_earnings in zip(names, merchant_counts, volumes, earnings):
+            pdf.cell(60, 6, name, border=1)
+            pdf.cell(30, 6, merchant_count, border=1)
+            pdf.cell(40, 6, volume, border=1)
+            pdf.cell(40, 6, row_earnings, border=1, ln=True)
         
         # Top merchants table
         pdf.ln(10)
@@ -294,32 +505,27 @@ class PDFGenerator:
         pdf.set_font("Arial", "", 8)
         
         # Sort merchants by volume
+        top_merchants = _validate_schema(top_merchants, _SUMMARY_MERCHANT_COLUMNS, "Top merchant")
         top_merchants = top_merchants.sort_values('total_volume', ascending=False).head(10)
         
-        for _, row in top_merchants.iterrows():
-            merchant_name = row.get('merchant_dba', 'Unknown')
-            if len(merchant_name) > 25:
-                merchant_name = merchant_name[:22] + "..."
-                
-            volume = row.get('total_volume', 0)
-            txns = row.get('total_txns', 0)
-            profit = row.get('net_profit', 0)
-            
-            pdf.cell(60, 6, merchant_name, border=1)
-            pdf.cell(40, 6, f"${volume:,.2f}", border=1)
-            pdf.cell(30, 6, f"{txns:,}", border=1)
-            pdf.cell(30, 6, f"${profit:,.2f}", border=1, ln=True)
+        names = _format_column(top_merchants, 'merchant_dba', _truncate_name)
+        volumes = _format_column(top_merchants, 'total_volume', _format_currency)
+        txns = _format_column(top_merchants, 'total_txns', _format_count)
+        profits = _format_column(top_merchants, 'net_profit', _format_currency)
+        
+        for name, volume, txn_count, profit in zip(names, volumes, txns, profits):
+            pdf.cell(60, 6, name, border=1)
+            pdf.cell(40, 6, volume, border=1)
+            pdf.cell(30, 6, txn_count, border=1)
+            pdf.cell(30, 6, profit, border=1, ln=True)
         
         # Footer
-        pdf.ln(10)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(0, 10, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
-        pdf.cell(0, 10, "Ireland Pay Analytics", ln=True)
+        _write_footer(pdf, self._footer_line)
         
         # Save the PDF
         filename = f"monthly_summary_{month}.pdf"
         filepath = self.output_dir / filename
-        pdf.output(str(filepath))
+        self._save(pdf, filepath)
         
-        logger.info(f"Monthly summary report saved to {filepath}")
+        logger.info(f"Monthly summary report queued for writing to {filepath}")
         return str(filepath)
@@ -2,5 +2,14 @@
 Ireland Pay CRM API Client Package
 """
 from .client import IrelandPayCRMClient
+from .async_client import AsyncIrelandPayCRMClient
+from .exceptions import IrelandPayCRMError, RetryableError, RateLimitedError, FatalError
 
-__all__ = ["IrelandPayCRMClient"] 
\ No newline at end of file
+__all__ = [
+    "IrelandPayCRMClient",
+    "AsyncIrelandPayCRMClient",
+    "IrelandPayCRMError",
+    "RetryableError",
+    "RateLimitedError",
+    "FatalError",
+]
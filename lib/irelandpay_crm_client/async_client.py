@@ -0,0 +1,270 @@
+"""
+Async Ireland Pay CRM API Client
+An asyncio counterpart of IrelandPayCRMClient for high-concurrency sync jobs.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from .exceptions import FatalError, RateLimitedError, RetryableError, parse_retry_after, undecodable_body_error
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncIrelandPayCRMClient:
+    """
+    Async client for the Ireland Pay CRM API.
+    
+    Covers the endpoints the sync orchestrator fans out over. One client holds a
+    single pooled httpx.AsyncClient (HTTP/2 when h2 is installed), so hundreds of
+    in-flight requests share a few connections without a thread per request.
+    Use it as an async context manager, or call aclose() when done.
+    """
+    
+    BASE_URL = "https://crm.ireland-pay.com/api/v1"
+    
+    # Connection limits shared by every in-flight request
+    MAX_CONNECTIONS = 64
+    MAX_KEEPALIVE_CONNECTIONS = 32
+    
+    # (connect, read) timeout in seconds, matching IrelandPayCRMClient
+    DEFAULT_TIMEOUT = (5, 30)
+    
+    # Largest page size the list endpoints accept, matching IrelandPayCRMClient
+    MAX_PER_PAGE = 1000
+    
+    # Statuses raised as RetryableError, matching IrelandPayCRMClient
+    RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+    RATE_LIMIT_STATUSES = (429, 503)
+    
+    # Bytes of an error response body kept on the raised exception
+    ERROR_BODY_LIMIT = 512
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 timeout: Optional[Union[float, tuple]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 max_connections: Optional[int] = None):
+        """
+        Initialize the async Ireland Pay CRM client.
+        
+        Args:
+            api_key: The API key for authentication
+            base_url: Optional custom base URL
+            timeout: Optional request timeout, in seconds or as a (connect, read)
+                tuple (defaults to DEFAULT_TIMEOUT)
+            transport: Optional custom httpx transport
+            max_connections: Optional connection limit, all of them kept alive
+                (defaults to MAX_CONNECTIONS with MAX_KEEPALIVE_CONNECTIONS kept
+                alive); size it to the number of requests kept in flight
+        """
+        self.api_key = api_key
+        if base_url:
+            self.BASE_URL = base_url
+        
+        timeout = timeout or self.DEFAULT_TIMEOUT
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        
+        self.client = httpx.AsyncClient(
+            headers={
+                "X-API-KEY": self.api_key,
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections or self.MAX_CONNECTIONS,
+                max_keepalive_connections=max_connections or self.MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=timeout,
+            http2=HTTP2_AVAILABLE and transport is None,
+            transport=transport
+        )
+        
+        self.logger = logging.getLogger("irelandpay_crm_client")
+    
+    async def __aenter__(self) -> "AsyncIrelandPayCRMClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+    
+    async def _make_request(self, method: str, endpoint: str, params: Dict = None,
+                            data: Dict = None) -> Dict:
+        """
+        Make a request to the Ireland Pay CRM API.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request body for POST/PUT/PATCH requests
+        
+        Returns:
+            API response as a dict
+        
+        Raises:
+            RetryableError: On transport failures, retryable statuses and truncated JSON bodies
+            FatalError: On any other error status or a body that isn't JSON
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        
+        try:
+            response = await self.client.request(method, url, params=params, json=data)
+            response.raise_for_status()
+            
+            if not response.content:
+                return {}
+            try:
+                return response.json()
+            except ValueError as e:
+                self.logger.error("API %s %s -> %s with an undecodable body", method, endpoint, response.status_code)
+                raise undecodable_body_error(response.content, response.status_code, self.ERROR_BODY_LIMIT) from e
+            
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            self.logger.error("API %s %s -> %s", method, endpoint, status)
+            
+            body = e.response.content[:self.ERROR_BODY_LIMIT]
+            if status in self.RATE_LIMIT_STATUSES:
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    raise RateLimitedError(str(e), retry_after, status_code=status, body=body) from e
+            if status in self.RETRY_STATUSES:
+                raise RetryableError(str(e), status_code=status, body=body) from e
+            raise FatalError(str(e), status_code=status, body=body) from e
+        except httpx.HTTPError as e:
+            self.logger.error("API %s %s -> %s", method, endpoint, type(e).__name__)
+            raise RetryableError(str(e)) from e
+    
+    async def paginate_all(self, endpoint: str, params: Dict = None) -> List[Dict]:
+        """
+        Fetch every page of a list endpoint, requesting pages 2..N concurrently.
+        
+        Like IrelandPayCRMClient.paginate_all: pages are requested at MAX_PER_PAGE
+        and the first page gives the page count from meta.last_page.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters (any "page" or "per_page" value is ignored)
+        
+        Returns:
+            Records from all pages, in page order
+        """
+        params = {**(params or {}), "page": 1, "per_page": self.MAX_PER_PAGE}
+        first = await self._make_request("GET", endpoint, params=params)
+        records = list(first.get("data") or [])
+        
+        meta = first.get("meta") or {}
+        last_page = int(meta.get("last_page") or 1)
+        pages = await asyncio.gather(*(
+            self._make_request("GET", endpoint, params={**params, "page": page})
+            for page in range(2, last_page + 1)
+        ))
+        for page in pages:
+            records.extend(page.get("data") or [])
+        
+        return records
+    
+    # Merchant API endpoints
+    
+    async def get_merchants(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
+        """
+        Get a list of merchants.
+        
+        Args:
+            page: Page number
+            per_page: Number of results per page
+            **filters: Additional filters to apply
+        
+        Returns:
+            List of merchants
+        """
+        params = {"page": page, "per_page": per_page, **filters}
+        return await self._make_request("GET", "/merchants", params=params)
+    
+    async def get_merchant(self, merchant_number: str) -> Dict:
+        """
+        Get detailed information about a specific merchant.
+        
+        Args:
+            merchant_number: The merchant ID
+        
+        Returns:
+            Merchant details
+        """
+        return await self._make_request("GET", f"/merchants/{merchant_number}")
+    
+    async def get_merchant_transactions(self, merchant_number: str, start_date: str = None,
+                                        end_date: str = None, page: int = 1,
+                                        per_page: int = 100) -> Dict:
+        """
+        Get a list of batches and transactions for a merchant.
+        
+        Args:
+            merchant_number: The merchant ID
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
+            page: Page number
+            per_page: Number of results per page
+        
+        Returns:
+            List of transactions
+        """
+        params = {"page": page, "per_page": per_page}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        return await self._make_request("GET", f"/merchants/{merchant_number}/transactions", params=params)
+    
+    # Residuals API endpoints
+    
+    async def get_residuals_summary(self, year: int, month: int) -> Dict:
+        """
+        Get residuals summary for a specific month.
+        
+        Args:
+            year: Year
+            month: Month
+        
+        Returns:
+            Residuals summary
+        """
+        return await self._make_request("GET", f"/residuals/reports/summary/{year}/{month}")
+    
+    async def get_volumes_summary(self, year: int, month: int) -> Dict:
+        """
+        Get every merchant's transaction count and sales volume for a month.
+        
+        Read from the per-processor residuals summary rows, like
+        IrelandPayCRMClient.get_volumes_summary; the processors' rows are
+        fetched concurrently.
+        
+        Args:
+            year: Year
+            month: Month
+        
+        Returns:
+            Merchant rows ("mid", "transactions", "sales_amount", ...) from all
+            processors under "data"
+        """
+        summaries = (await self.get_residuals_summary(year=year, month=month)).get("data") or []
+        
+        processor_ids = [summary.get("processor_id") for summary in summaries if isinstance(summary, dict)]
+        pages = await asyncio.gather(*(
+            self.paginate_all(f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}")
+            for processor_id in processor_ids if processor_id is not None
+        ))
+        return {"data": [row for rows in pages for row in rows]}
@@ -2,46 +2,387 @@
 Ireland Pay CRM API Client
 A custom client for interacting with the Ireland Pay CRM API.
 """
+import functools
+import io
 import os
 import json
+import string
+import sys
+import threading
+import time
 import requests
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+import urllib3
+from urllib3.util.retry import Retry
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import IO, Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
+from .exceptions import FatalError, RateLimitedError, RetryableError, parse_retry_after, undecodable_body_error
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _retry_jitter(jitter: float) -> Dict[str, float]:
+    """Retry keyword arguments adding backoff jitter where urllib3 supports it (2.0+)."""
+    if int(urllib3.__version__.split(".")[0]) >= 2:
+        return {"backoff_jitter": jitter}
+    return {}
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson already shares key strings across calls through its key cache
+        return orjson.loads(content)
+    return _intern_keys(json.loads(content))
+
+
+def _intern_keys(payload: Any) -> Any:
+    """
+    Intern the top-level keys of each record in a list response.
+    
+    The json module only shares repeated keys within one response body, so
+    every page of a large pull would otherwise hold its own copy of
+    "merchant_number", "dba_name" and so on. Interning makes all pages share
+    one string per key.
+    
+    Args:
+        payload: Parsed response, either a list of records or a dict whose
+            "data" entry is one
+    
+    Returns:
+        The payload, with records rebuilt around interned keys
+    """
+    records = payload.get("data") if isinstance(payload, dict) else payload
+    if isinstance(records, list):
+        intern = sys.intern
+        for i, record in enumerate(records):
+            if isinstance(record, dict):
+                records[i] = {intern(key): value for key, value in record.items()}
+    return payload
+
+
+# Query parameters of a first-page, default-size list request; shared so the
+# common case doesn't build a new dict per call
+_DEFAULT_LIST_PARAMS = MappingProxyType({"page": 1, "per_page": 100})
+
+# Endpoints that only fill in path parameters (and send a JSON body for writes).
+# Their client methods are generated from this table at import time; anything
+# with query parameters, pagination or streaming is written out in the class.
+# (method name, HTTP method, path template, summary, returns)
+_ENDPOINTS = (
+    # Merchant API endpoints
+    ("get_merchant", "GET", "/merchants/{merchant_number}",
+     "Get detailed information about a specific merchant.", "Merchant details"),
+    ("update_merchant", "PATCH", "/merchants/{merchant_number}",
+     "Update an existing merchant.", "Updated merchant details"),
+    
+    # Residuals API endpoints
+    ("get_residuals_summary", "GET", "/residuals/reports/summary/{year}/{month}",
+     "Get residuals summary data.", "Residuals summary data"),
+    ("get_residuals_summary_with_rows", "GET", "/residuals/reports/summary/rows/{processor_id}/{year}/{month}",
+     "Get residuals summary with merchant rows.", "Residuals summary with merchant rows"),
+    ("get_residuals_details", "GET", "/residuals/reports/details/{processor_id}/{year}/{month}",
+     "Get residuals details with merchant rows.", "Residuals details with merchant rows"),
+    ("get_residuals_lineitems", "GET", "/residuals/lineitems/{year}/{month}",
+     "Get residuals line items.", "Residuals line items"),
+    ("get_residuals_templates", "GET", "/residuals/templates",
+     "Get residuals templates.", "List of residuals templates"),
+    ("get_assigned_residuals_templates", "GET", "/residuals/templates/assigned/{year}/{month}",
+     "Get a list of users with assigned residuals templates.", "List of users with assigned templates"),
+    
+    # Lead API endpoints
+    ("get_lead", "GET", "/leads/{lead_id}",
+     "Get detailed information about a specific lead.", "Lead details"),
+    ("create_lead", "POST", "/leads",
+     "Create a new lead.", "Created lead details"),
+    ("update_lead", "PATCH", "/leads/{lead_id}",
+     "Update a lead.", "Updated lead details"),
+    ("get_lead_tab_fields", "GET", "/leads/{lead_id}/tabs/{tab_id}/fields",
+     "Get lead information from a specific tab.", "Lead tab fields"),
+    
+    # Helpdesk API endpoints
+    ("get_helpdesk_ticket", "GET", "/helpdesk/{ticket_id}",
+     "Get detailed ticket information.", "Ticket details"),
+    ("create_helpdesk_ticket", "POST", "/helpdesk",
+     "Create a new ticket.", "Created ticket details"),
+    ("update_helpdesk_ticket", "PATCH", "/helpdesk/{ticket_id}",
+     "Update a ticket.", "Updated ticket details"),
+    ("delete_helpdesk_ticket", "DELETE", "/helpdesk/{ticket_id}",
+     "Delete a ticket.", "Deletion result"),
+    ("add_ticket_comment", "POST", "/helpdesk/{ticket_id}/comment",
+     "Add a ticket comment.", "Created comment details"),
+    
+    # E-Signature API endpoints
+    ("generate_esignature_document", "POST", "/leads/{lead_id}/signatures/{application_id}/generate",
+     "Generate an e-signature document.", "Generated document details"),
+    ("send_esignature_document", "POST", "/leads/{lead_id}/signatures/{application_id}/send",
+     "Send an e-signature document.", "Document sending result"),
+    ("get_lead_signatures", "GET", "/leads/{lead_id}/signatures",
+     "Get a list of all lead e-signatures documents.", "List of e-signature documents"),
+    ("get_applications", "GET", "/leads/applications",
+     "Get a list of available applications.", "List of applications"),
+    
+    # Web Forms API endpoints
+    ("generate_webform", "POST", "/leads/{lead_id}/webforms/{webform_default_id}/generate",
+     "Generate a web form from lead.", "Generated web form details"),
+    ("send_webform", "POST", "/leads/{lead_id}/webforms/{webform_session_id}/send",
+     "Send a web form from lead.", "Web form sending result"),
+    ("get_lead_webforms", "GET", "/leads/{lead_id}/webforms",
+     "Get a list of all lead web forms.", "List of web forms"),
+)
+
+# Reference data that rarely changes; cached for STATIC_CACHE_TTL
+_STATIC_ENDPOINTS = frozenset({"get_residuals_templates", "get_applications"})
+
+# HTTP methods whose endpoints take a JSON request body
+_BODY_METHODS = frozenset({"POST", "PATCH"})
+
+_INT_ARGS = frozenset({"year", "month"})
+
+_ARG_DOCS = {
+    "merchant_number": "The merchant ID",
+    "processor_id": "Processor ID",
+    "year": "Year",
+    "month": "Month",
+    "lead_id": "The lead ID",
+    "tab_id": "The tab ID",
+    "ticket_id": "The ticket ID",
+    "application_id": "The application ID",
+    "webform_default_id": "The web form default ID",
+    "webform_session_id": "The web form session ID",
+    "data": "Request body",
+}
+
+
+def _build_endpoint(name: str, http_method: str, path: str, summary: str, returns: str) -> Callable:
+    """
+    Generate the client method for one _ENDPOINTS entry.
+    
+    The method is compiled from source so it has a real signature and calls
+    _make_request directly, with the path as an f-string over its parameters.
+    
+    Args:
+        name: Method name
+        http_method: HTTP method
+        path: Endpoint path template with {placeholders} for path parameters
+        summary: First line of the method docstring
+        returns: Description of the return value
+        
+    Returns:
+        The generated function
+    """
+    args = [field for _, field, _, _ in string.Formatter().parse(path) if field]
+    params = [f"{arg}: {'int' if arg in _INT_ARGS else 'str'}" for arg in args]
+    call = [repr(http_method), f"f{path!r}" if args else repr(path)]
+    if http_method in _BODY_METHODS:
+        args.append("data")
+        params.append("data: Dict")
+        call.append("data=data")
+    if name in _STATIC_ENDPOINTS:
+        call.append("cache_ttl=self.STATIC_CACHE_TTL")
+    
+    source = (
+        f"def {name}(self{''.join(', ' + param for param in params)}) -> Dict:\n"
+        f"    return self._make_request({', '.join(call)})\n"
+    )
+    namespace = {"Dict": Dict}
+    exec(source, namespace)
+    func = namespace[name]
+    
+    doc = [summary, ""]
+    if args:
+        doc += ["Args:"] + [f"    {arg}: {_ARG_DOCS[arg]}" for arg in args] + [""]
+    doc += ["Returns:", f"    {returns}"]
+    func.__doc__ = "\n".join(doc)
+    func.__module__ = __name__
+    return func
+
+
+def _declare_endpoints(cls: type) -> type:
+    """Class decorator attaching the generated _ENDPOINTS methods to the client."""
+    for spec in _ENDPOINTS:
+        func = _build_endpoint(*spec)
+        func.__qualname__ = f"{cls.__name__}.{func.__name__}"
+        setattr(cls, func.__name__, func)
+    return cls
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a per-entry TTL."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+
+@_declare_endpoints
 class IrelandPayCRMClient:
     """
     Client for interacting with the Ireland Pay CRM API.
     
     This client handles authentication and provides methods for all
     the endpoints we need to replace the Excel upload functionality.
+    Simple path-parameter endpoints are generated from _ENDPOINTS.
     """
     
     BASE_URL = "https://crm.ireland-pay.com/api/v1"
     
-    def __init__(self, api_key: str, base_url: Optional[str] = None):
+    # Connection pool sizing; large enough that concurrent sync workers
+    # reuse keep-alive connections instead of discarding them
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    
+    # Largest page size the list endpoints accept (per_page is one of 10, 25, 50,
+    # 100, 500, 1000); bulk fetches use it so small result sets take one request
+    MAX_PER_PAGE = 1000
+    
+    # Failed connections are retried inside the connection pool; everything else
+    # is left to the caller's retry logic, so retries don't multiply across layers
+    RETRY_TOTAL = 5
+    RETRY_BACKOFF_FACTOR = 0.3
+    # Random extra delay of up to this many seconds per retry, so clients that
+    # failed together don't retry in lockstep (needs urllib3 2)
+    RETRY_BACKOFF_JITTER = 0.3
+    # Statuses raised as RetryableError for the caller's retry logic
+    RETRY_STATUS_FORCELIST = (408, 429, 500, 502, 503, 504)
+    
+    # Statuses whose Retry-After header is passed on to the caller's retry logic
+    RATE_LIMIT_STATUSES = (429, 503)
+    
+    # Bytes of an error response body kept on the raised exception
+    ERROR_BODY_LIMIT = 512
+    
+    # Shortest timeout in seconds given to a request once a deadline has nearly passed
+    MIN_TIMEOUT = 0.5
+    
+    # (connect, read) timeout in seconds so a dropped connection can't stall a worker
+    DEFAULT_TIMEOUT = (5, 30)
+    
+    # Only reference data (_STATIC_ENDPOINTS) is cached by default, since a
+    # merchant or lead read must see the latest state; callers can opt other GETs
+    # in with cache_ttl. Raw bodies are cached and parsed on every hit, so callers
+    # that modify a response can't change what the next caller gets
+    CACHE_MAXSIZE = 4096
+    CACHE_TTL = 0
+    STATIC_CACHE_TTL = 3600
+    
+    # Bodies of GET responses that carried an ETag, kept so later runs can send
+    # If-None-Match and accept a bodiless 304 Not Modified
+    ETAG_CACHE_MAXSIZE = 1024
+    ETAG_CACHE_TTL = 24 * 3600
+    
+    # File downloads are streamed in fixed-size chunks rather than buffered whole
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    DOWNLOAD_TIMEOUT = (5, 60)
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 timeout: Optional[Union[float, tuple]] = None,
+                 on_response: Optional[Callable[[Optional[int], int, float], None]] = None,
+                 pool_maxsize: Optional[int] = None):
         """
         Initialize the Ireland Pay CRM client.
         
         Args:
             api_key: The API key for authentication
             base_url: Optional custom base URL
+            timeout: Optional request timeout, in seconds or as a (connect, read)
+                tuple (defaults to DEFAULT_TIMEOUT)
+            on_response: Optional callback invoked after every API request with the
+                response status (None if no response arrived), body size in bytes
+                and latency in milliseconds; cache hits are not reported
+            pool_maxsize: Optional number of keep-alive connections kept per host
+                (defaults to POOL_MAXSIZE); size it to the number of threads
+                sharing the client so none of them opens throwaway connections
         """
         self.api_key = api_key
+        self.on_response = on_response
         if base_url:
             self.BASE_URL = base_url
+        self._url_prefix = self.BASE_URL.rstrip("/")
+        self.timeout = timeout or self.DEFAULT_TIMEOUT
+        self._local = threading.local()
+        self._cache = _TTLCache(self.CACHE_MAXSIZE)
+        self._etag_cache = _TTLCache(self.ETAG_CACHE_MAXSIZE)
         
         self.session = requests.Session()
         self.session.headers.update({
             "X-API-KEY": self.api_key,
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            # Every encoding urllib3 can decode; br is included when brotli is installed
+            "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+            "Connection": "keep-alive"
         })
         
+        # Only connection errors are retried here, for any method since nothing was
+        # sent; read timeouts and error statuses surface after one attempt
+        retry = Retry(
+            total=self.RETRY_TOTAL,
+            connect=self.RETRY_TOTAL,
+            read=0,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            respect_retry_after_header=False,
+            raise_on_status=False,
+            **_retry_jitter(self.RETRY_BACKOFF_JITTER)
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or self.POOL_MAXSIZE,
+            max_retries=retry,
+            pool_block=False
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         self.logger = logging.getLogger("irelandpay_crm_client")
     
-    def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+    def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None,
+                      timeout: Optional[Union[float, tuple]] = None,
+                      cache_ttl: Optional[float] = None) -> Dict:
         """
         Make a request to the Ireland Pay CRM API.
         
@@ -50,79 +391,260 @@ class IrelandPayCRMClient:
             endpoint: API endpoint
             params: Query parameters
             data: Request body for POST/PUT/PATCH requests
+            timeout: Optional timeout override for this call; capped by any
+                deadline() active in this thread
+            cache_ttl: Seconds to cache a GET response (defaults to CACHE_TTL; 0 disables)
             
         Returns:
             API response as a dict
         """
-        url = f"{self.BASE_URL}{endpoint}"
-        
+        url = self._url_prefix + endpoint
+        timeout = timeout or self.timeout
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), self.MIN_TIMEOUT)
+            if isinstance(timeout, tuple):
+                timeout = tuple(min(part, remaining) for part in timeout)
+            else:
+                timeout = min(timeout, remaining)
+        
+        headers = None
+        etag_entry = None
+        if method == "GET" and data is None:
+            if cache_ttl is None:
+                cache_ttl = self.CACHE_TTL
+            cache_key = requests.Request("GET", url, params=params).prepare().url
+            if cache_ttl > 0:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    return _json_loads(cached) if cached else {}
+            
+            # Revalidate a previously seen body instead of downloading it again
+            etag_entry = self._etag_cache.get(cache_key)
+            if etag_entry is not None:
+                headers = {"If-None-Match": etag_entry[0]}
+        else:
+            # Writes may change anything we have cached
+            cache_key = None
+            cache_ttl = 0
+            self._cache.clear()
+        
+        started = time.perf_counter()
         try:
             response = self.session.request(
                 method=method,
                 url=url,
                 params=params,
-                json=data
+                data=_json_dumps(data) if data is not None else None,
+                headers=headers,
+                timeout=timeout
             )
+            if self.on_response is not None:
+                self.on_response(response.status_code, len(response.content),
+                                 (time.perf_counter() - started) * 1000)
             
             response.raise_for_status()
             
-            if response.content:
-                return response.json()
-            return {}
+            revalidated = response.status_code == 304 and etag_entry is not None
+            content = etag_entry[1] if revalidated else response.content
+            try:
+                result = _json_loads(content) if content else {}
+            except ValueError as e:
+                self.logger.error("API %s %s -> %s with an undecodable body", method, endpoint, response.status_code)
+                raise undecodable_body_error(content, response.status_code, self.ERROR_BODY_LIMIT) from e
+            
+            etag = response.headers.get("ETag")
+            if etag and cache_key is not None and not revalidated:
+                self._etag_cache.set(cache_key, (etag, content), self.ETAG_CACHE_TTL)
+            if cache_ttl > 0:
+                self._cache.set(cache_key, content, cache_ttl)
+            return result
             
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"API request failed: {str(e)}")
-            if hasattr(e, 'response') and e.response:
-                self.logger.error(f"Response status: {e.response.status_code}")
-                self.logger.error(f"Response body: {e.response.text}")
+            response = getattr(e, "response", None)
+            status = getattr(response, "status_code", None)
+            if response is None and self.on_response is not None:
+                self.on_response(None, 0, (time.perf_counter() - started) * 1000)
+            self.logger.error("API %s %s -> %s", method, endpoint, status or type(e).__name__)
             
-            # Re-raise the exception for the caller to handle
-            raise
+            body = response.content[:self.ERROR_BODY_LIMIT] if response is not None else None
+            
+            if status in self.RATE_LIMIT_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    raise RateLimitedError(str(e), retry_after, status_code=status, body=body) from e
+            
+            # No response means the connection failed or timed out, which is
+            # worth retrying; so are the statuses the adapter already retries
+            if status is None or status in self.RETRY_STATUS_FORCELIST:
+                raise RetryableError(str(e), status_code=status, body=body) from e
+            raise FatalError(str(e), status_code=status, body=body) from e
+    
+    @contextmanager
+    def deadline(self, at: float):
+        """
+        Cap the timeout of every request this thread makes inside the block.
+        
+        Each request gets at most the time left until `at`, so a caller with an
+        end-to-end budget never waits a full timeout past it. Nested deadlines
+        keep the earlier one.
+        
+        Args:
+            at: Deadline as a time.monotonic() value
+        """
+        previous = getattr(self._local, "deadline", None)
+        self._local.deadline = at if previous is None else min(previous, at)
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+    
+    def _under_current_deadline(self, func: Callable) -> Callable:
+        """
+        Wrap func to run under the calling thread's deadline on a pool worker.
+        
+        Deadlines are thread-local, so requests handed to a thread pool would
+        otherwise ignore the caller's budget.
+        
+        Args:
+            func: Function the pool workers will call
+        
+        Returns:
+            func itself if there is no deadline, otherwise a wrapper re-entering it
+        """
+        at = getattr(self._local, "deadline", None)
+        if at is None:
+            return func
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.deadline(at):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    @staticmethod
+    def _list_params(page: int, per_page: int, **filters) -> Mapping[str, Any]:
+        """
+        Build list query parameters, dropping filters that were not given.
+        
+        A first-page, default-size request with no filters gets the shared
+        read-only _DEFAULT_LIST_PARAMS instead of a new dict.
+        """
+        if filters:
+            filters = {key: value for key, value in filters.items() if value is not None}
+        if not filters and page == 1 and per_page == 100:
+            return _DEFAULT_LIST_PARAMS
+        return {"page": page, "per_page": per_page, **filters}
+    
+    def clear_cache(self) -> None:
+        """Drop all cached GET responses, including those kept for ETag revalidation."""
+        self._cache.clear()
+        self._etag_cache.clear()
+    
+    def _download(self, url: str, dest: Optional[IO[bytes]] = None) -> Optional[bytes]:
+        """
+        Stream a file download in chunks.
+        
+        Args:
+            url: Full download URL
+            dest: Optional writable binary file object to stream into
+        
+        Returns:
+            File content when no dest is given, otherwise None
+        """
+        buf = dest if dest is not None else io.BytesIO()
+        with self.session.get(url, stream=True, timeout=self.DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                buf.write(chunk)
+        return buf.getvalue() if dest is None else None
+    
+    def paginate_all(self, endpoint: str, params: Dict = None, max_workers: int = 8) -> List[Dict]:
+        """
+        Fetch every page of a list endpoint, requesting pages 2..N concurrently.
+        
+        Pages are requested at MAX_PER_PAGE, so most result sets arrive in one
+        request. The first page is fetched on its own to learn the page count from
+        meta.last_page; the remaining pages share the session's connection pool.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters (any "page" or "per_page" value is ignored)
+            max_workers: Maximum number of concurrent page requests
+        
+        Returns:
+            Records from all pages, in page order
+        """
+        params = {**(params or {}), "page": 1, "per_page": self.MAX_PER_PAGE}
+        first = self._make_request("GET", endpoint, params=params)
+        records = list(first.get("data") or [])
+        
+        meta = first.get("meta") or {}
+        last_page = int(meta.get("last_page") or 1)
+        if last_page <= 1:
+            return records
+        
+        fetch = self._under_current_deadline(self._make_request)
+        with ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1)) as pool:
+            futures = [
+                pool.submit(fetch, "GET", endpoint, {**params, "page": page})
+                for page in range(2, last_page + 1)
+            ]
+            for future in futures:
+                records.extend(future.result().get("data") or [])
+        
+        return records
     
     # Merchant API endpoints
     
-    def get_merchants(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
+    def get_merchants(self, page: int = 1, per_page: int = 100, fetch_all: bool = False,
+                      modified_since: Optional[str] = None, **filters) -> Dict:
         """
         Get a list of merchants.
         
         Args:
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
+            modified_since: Only return merchants modified at or after this ISO 8601
+                timestamp (optional)
             **filters: Additional filters to apply
             
         Returns:
             List of merchants
         """
-        params = {"page": page, "per_page": per_page, **filters}
+        if modified_since:
+            filters.update(date_filter="modified", start_date=modified_since)
+        params = self._list_params(page, per_page, **filters)
+        if fetch_all:
+            return {"data": self.paginate_all("/merchants", params)}
         return self._make_request("GET", "/merchants", params=params)
     
-    def get_merchant(self, merchant_number: str) -> Dict:
+    def get_merchants_bulk(self, merchant_numbers: List[str], max_workers: int = 8) -> Dict[str, Dict]:
         """
-        Get detailed information about a specific merchant.
+        Get detailed information about many merchants at once.
         
-        Args:
-            merchant_number: The merchant ID
-            
-        Returns:
-            Merchant details
-        """
-        return self._make_request("GET", f"/merchants/{merchant_number}")
-    
-    def update_merchant(self, merchant_number: str, data: Dict) -> Dict:
-        """
-        Update an existing merchant.
+        The API has no multi-ID lookup, so requests fan out over a thread pool
+        sharing the session's keep-alive connections. Duplicate IDs are fetched once.
         
         Args:
-            merchant_number: The merchant ID
-            data: Merchant data to update
-            
+            merchant_numbers: The merchant IDs
+            max_workers: Maximum number of concurrent requests
+        
         Returns:
-            Updated merchant details
+            Merchant details keyed by merchant ID
         """
-        return self._make_request("PATCH", f"/merchants/{merchant_number}", data=data)
+        unique_numbers = list(dict.fromkeys(merchant_numbers))
+        if not unique_numbers:
+            return {}
+        
+        fetch = self._under_current_deadline(self.get_merchant)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_numbers))) as pool:
+            return dict(zip(unique_numbers, pool.map(fetch, unique_numbers)))
     
     def get_merchant_transactions(self, merchant_number: str, start_date: str = None, 
-                                end_date: str = None, page: int = 1, per_page: int = 100) -> Dict:
+                                end_date: str = None, page: int = 1, per_page: int = 100,
+                                fetch_all: bool = False) -> Dict:
         """
         Get a list of batches and transactions for a merchant.
         
@@ -132,49 +654,67 @@ class IrelandPayCRMClient:
             end_date: End date filter (optional)
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
             
         Returns:
             List of transactions
         """
-        params = {"page": page, "per_page": per_page}
-        if start_date:
-            params["start_date"] = start_date
-        if end_date:
-            params["end_date"] = end_date
-            
+        params = self._list_params(page, per_page, start_date=start_date or None,
+                                   end_date=end_date or None)
+        if fetch_all:
+            return {"data": self.paginate_all(f"/merchants/{merchant_number}/transactions", params)}
         return self._make_request("GET", f"/merchants/{merchant_number}/transactions", params=params)
     
-    def get_merchant_chargebacks(self, merchant_number: str, page: int = 1, per_page: int = 100) -> Dict:
+    def get_merchant_chargebacks(self, merchant_number: str, start_date: str = None,
+                                 end_date: str = None, page: int = 1, per_page: int = 100,
+                                 fetch_all: bool = False, **filters) -> Dict:
         """
         Get a list of chargebacks for a merchant.
         
         Args:
             merchant_number: The merchant ID
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
+            **filters: Additional filters to apply
             
         Returns:
             List of chargebacks
         """
-        params = {"page": page, "per_page": per_page}
+        params = self._list_params(page, per_page, start_date=start_date, end_date=end_date,
+                                   **filters)
+        if fetch_all:
+            return {"data": self.paginate_all(f"/merchants/{merchant_number}/chargebacks", params)}
         return self._make_request("GET", f"/merchants/{merchant_number}/chargebacks", params=params)
     
-    def get_merchant_retrievals(self, merchant_number: str, page: int = 1, per_page: int = 100) -> Dict:
+    def get_merchant_retrievals(self, merchant_number: str, start_date: str = None,
+                                end_date: str = None, page: int = 1, per_page: int = 100,
+                                fetch_all: bool = False, **filters) -> Dict:
         """
         Get a list of retrievals for a merchant.
         
         Args:
             merchant_number: The merchant ID
+            start_date: Start date filter (optional)
+            end_date: End date filter (optional)
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
+            **filters: Additional filters to apply
             
         Returns:
             List of retrievals
         """
-        params = {"page": page, "per_page": per_page}
+        params = self._list_params(page, per_page, start_date=start_date, end_date=end_date,
+                                   **filters)
+        if fetch_all:
+            return {"data": self.paginate_all(f"/merchants/{merchant_number}/retrievals", params)}
         return self._make_request("GET", f"/merchants/{merchant_number}/retrievals", params=params)
     
-    def get_merchant_statements(self, merchant_number: str, page: int = 1, per_page: int = 100) -> Dict:
+    def get_merchant_statements(self, merchant_number: str, page: int = 1, per_page: int = 100,
+                                fetch_all: bool = False, **filters) -> Dict:
         """
         Get a list of statements for a merchant.
         
@@ -182,384 +722,188 @@ class IrelandPayCRMClient:
             merchant_number: The merchant ID
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
+            **filters: Additional filters to apply
             
         Returns:
             List of statements
         """
-        params = {"page": page, "per_page": per_page}
+        params = self._list_params(page, per_page, **filters)
+        if fetch_all:
+            return {"data": self.paginate_all(f"/merchants/{merchant_number}/statements", params)}
         return self._make_request("GET", f"/merchants/{merchant_number}/statements", params=params)
     
-    def download_statement(self, merchant_number: str, statement_id: str) -> bytes:
+    def download_statement(self, merchant_number: str, statement_id: str,
+                           dest: Optional[IO[bytes]] = None) -> Optional[bytes]:
         """
         Download a statement for a merchant.
         
         Args:
             merchant_number: The merchant ID
             statement_id: The statement ID
+            dest: Optional binary file object to stream the statement into
             
         Returns:
-            Statement file content
+            Statement file content, or None when written to dest
         """
-        url = f"{self.BASE_URL}/merchants/{merchant_number}/statements/{statement_id}"
+        url = f"{self._url_prefix}/merchants/{merchant_number}/statements/{statement_id}"
         
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.content
+            return self._download(url, dest)
             
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Statement download failed: {str(e)}")
+            self.logger.error("Statement download failed: %s", e)
             raise
     
-    # Residuals API endpoints
-    
-    def get_residuals_summary(self, year: int, month: int) -> Dict:
+    def download_statements(self, jobs: List[Tuple[str, str]], dest_dir: str,
+                            max_workers: int = 8) -> List[str]:
         """
-        Get residuals summary data.
+        Download many statements into a directory concurrently.
         
-        Args:
-            year: Year
-            month: Month
-            
-        Returns:
-            Residuals summary data
-        """
-        return self._make_request("GET", f"/residuals/reports/summary/{year}/{month}")
-    
-    def get_residuals_summary_with_rows(self, processor_id: str, year: int, month: int) -> Dict:
-        """
-        Get residuals summary with merchant rows.
+        Downloads fan out over a thread pool sharing the session's keep-alive
+        connections, each streamed straight to "<merchant_number>_<statement_id>"
+        in dest_dir. A failed download leaves no partial file behind.
         
         Args:
-            processor_id: Processor ID
-            year: Year
-            month: Month
+            jobs: (merchant_number, statement_id) pairs to download
+            dest_dir: Directory to write the statements to (created if missing)
+            max_workers: Maximum number of concurrent downloads
             
         Returns:
-            Residuals summary with merchant rows
+            Paths of the downloaded files, in the same order as jobs
         """
-        return self._make_request("GET", f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}")
-    
-    def get_residuals_details(self, processor_id: str, year: int, month: int) -> Dict:
-        """
-        Get residuals details with merchant rows.
+        if not jobs:
+            return []
         
-        Args:
-            processor_id: Processor ID
-            year: Year
-            month: Month
-            
-        Returns:
-            Residuals details with merchant rows
-        """
-        return self._make_request("GET", f"/residuals/reports/details/{processor_id}/{year}/{month}")
-    
-    def get_residuals_lineitems(self, year: int, month: int) -> Dict:
-        """
-        Get residuals line items.
+        os.makedirs(dest_dir, exist_ok=True)
         
-        Args:
-            year: Year
-            month: Month
-            
-        Returns:
-            Residuals line items
-        """
-        return self._make_request("GET", f"/residuals/lineitems/{year}/{month}")
-    
-    def get_residuals_templates(self) -> Dict:
-        """
-        Get residuals templates.
+        def download(job: Tuple[str, str]) -> str:
+            merchant_number, statement_id = job
+            path = os.path.join(dest_dir, f"{merchant_number}_{statement_id}")
+            try:
+                with open(path, "wb") as f:
+                    self.download_statement(merchant_number, statement_id, dest=f)
+            except Exception:
+                if os.path.exists(path):
+                    os.remove(path)
+                raise
+            return path
         
-        Returns:
-            List of residuals templates
-        """
-        return self._make_request("GET", "/residuals/templates")
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            return list(pool.map(download, jobs))
+    
+    # Residuals API endpoints
     
-    def get_assigned_residuals_templates(self, year: int, month: int) -> Dict:
+    def get_volumes_summary(self, year: int, month: int) -> Dict:
         """
-        Get a list of users with assigned residuals templates.
+        Get every merchant's transaction count and sales volume for a month.
+        
+        Read from the per-processor residuals summary rows, so a month's volumes
+        arrive in a few paged requests instead of one transaction listing per
+        merchant. The rows only exist once the month's residuals are loaded.
         
         Args:
             year: Year
             month: Month
-            
+        
         Returns:
-            List of users with assigned templates
+            Merchant rows ("mid", "transactions", "sales_amount", ...) from all
+            processors under "data"
         """
-        return self._make_request("GET", f"/residuals/templates/assigned/{year}/{month}")
+        summaries = self.get_residuals_summary(year=year, month=month).get("data") or []
+        
+        rows = []
+        for summary in summaries:
+            processor_id = summary.get("processor_id") if isinstance(summary, dict) else None
+            if processor_id is not None:
+                rows.extend(self.paginate_all(
+                    f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}"
+                ))
+        return {"data": rows}
     
     # Lead API endpoints
     
-    def get_leads(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
+    def get_leads(self, page: int = 1, per_page: int = 100, fetch_all: bool = False,
+                  **filters) -> Dict:
         """
         Get a list of leads.
         
         Args:
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
             **filters: Additional filters to apply
             
         Returns:
             List of leads
         """
-        params = {"page": page, "per_page": per_page, **filters}
+        params = self._list_params(page, per_page, **filters)
+        if fetch_all:
+            return {"data": self.paginate_all("/leads", params)}
         return self._make_request("GET", "/leads", params=params)
     
-    def get_lead(self, lead_id: str) -> Dict:
-        """
-        Get detailed information about a specific lead.
-        
-        Args:
-            lead_id: The lead ID
-            
-        Returns:
-            Lead details
-        """
-        return self._make_request("GET", f"/leads/{lead_id}")
-    
-    def create_lead(self, data: Dict) -> Dict:
-        """
-        Create a new lead.
-        
-        Args:
-            data: Lead data
-            
-        Returns:
-            Created lead details
-        """
-        return self._make_request("POST", "/leads", data=data)
-    
-    def update_lead(self, lead_id: str, data: Dict) -> Dict:
-        """
-        Update a lead.
-        
-        Args:
-            lead_id: The lead ID
-            data: Lead data to update
-            
-        Returns:
-            Updated lead details
-        """
-        return self._make_request("PATCH", f"/leads/{lead_id}", data=data)
-    
-    def get_lead_tab_fields(self, lead_id: str, tab_id: str) -> Dict:
-        """
-        Get lead information from a specific tab.
-        
-        Args:
-            lead_id: The lead ID
-            tab_id: The tab ID
-            
-        Returns:
-            Lead tab fields
-        """
-        return self._make_request("GET", f"/leads/{lead_id}/tabs/{tab_id}/fields")
-    
     # Helpdesk API endpoints
     
-    def get_helpdesk_tickets(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
+    def get_helpdesk_tickets(self, page: int = 1, per_page: int = 100, fetch_all: bool = False,
+                             **filters) -> Dict:
         """
         Get a list of helpdesk tickets.
         
         Args:
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
             **filters: Additional filters to apply
             
         Returns:
             List of helpdesk tickets
         """
-        params = {"page": page, "per_page": per_page, **filters}
+        params = self._list_params(page, per_page, **filters)
+        if fetch_all:
+            return {"data": self.paginate_all("/helpdesk", params)}
         return self._make_request("GET", "/helpdesk", params=params)
     
-    def get_helpdesk_ticket(self, ticket_id: str) -> Dict:
-        """
-        Get detailed ticket information.
-        
-        Args:
-            ticket_id: The ticket ID
-            
-        Returns:
-            Ticket details
-        """
-        return self._make_request("GET", f"/helpdesk/{ticket_id}")
-    
-    def create_helpdesk_ticket(self, data: Dict) -> Dict:
-        """
-        Create a new ticket.
-        
-        Args:
-            data: Ticket data
-            
-        Returns:
-            Created ticket details
-        """
-        return self._make_request("POST", "/helpdesk", data=data)
-    
-    def update_helpdesk_ticket(self, ticket_id: str, data: Dict) -> Dict:
-        """
-        Update a ticket.
-        
-        Args:
-            ticket_id: The ticket ID
-            data: Ticket data to update
-            
-        Returns:
-            Updated ticket details
-        """
-        return self._make_request("PATCH", f"/helpdesk/{ticket_id}", data=data)
-    
-    def delete_helpdesk_ticket(self, ticket_id: str) -> Dict:
-        """
-        Delete a ticket.
-        
-        Args:
-            ticket_id: The ticket ID
-            
-        Returns:
-            Deletion result
-        """
-        return self._make_request("DELETE", f"/helpdesk/{ticket_id}")
-    
-    def add_ticket_comment(self, ticket_id: str, data: Dict) -> Dict:
-        """
-        Add a ticket comment.
-        
-        Args:
-            ticket_id: The ticket ID
-            data: Comment data
-            
-        Returns:
-            Created comment details
-        """
-        return self._make_request("POST", f"/helpdesk/{ticket_id}/comment", data=data)
-    
     # E-Signature API endpoints
     
-    def generate_esignature_document(self, lead_id: str, application_id: str, data: Dict) -> Dict:
-        """
-        Generate an e-signature document.
-        
-        Args:
-            lead_id: The lead ID
-            application_id: The application ID
-            data: Document generation data
-            
-        Returns:
-            Generated document details
-        """
-        return self._make_request("POST", f"/leads/{lead_id}/signatures/{application_id}/generate", data=data)
-    
-    def send_esignature_document(self, lead_id: str, application_id: str, data: Dict) -> Dict:
-        """
-        Send an e-signature document.
-        
-        Args:
-            lead_id: The lead ID
-            application_id: The application ID
-            data: Document sending data
-            
-        Returns:
-            Document sending result
-        """
-        return self._make_request("POST", f"/leads/{lead_id}/signatures/{application_id}/send", data=data)
-    
-    def download_esignature_document(self, application_id: str) -> bytes:
+    def download_esignature_document(self, application_id: str,
+                                     dest: Optional[IO[bytes]] = None) -> Optional[bytes]:
         """
         Download an e-signature document.
         
         Args:
             application_id: The application ID
+            dest: Optional binary file object to stream the document into
             
         Returns:
-            Document file content
+            Document file content, or None when written to dest
         """
-        url = f"{self.BASE_URL}/leads/signatures/{application_id}/download"
+        url = f"{self._url_prefix}/leads/signatures/{application_id}/download"
         
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.content
+            return self._download(url, dest)
             
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"E-signature document download failed: {str(e)}")
+            self.logger.error("E-signature document download failed: %s", e)
             raise
     
-    def get_lead_signatures(self, lead_id: str) -> Dict:
-        """
-        Get a list of all lead e-signatures documents.
-        
-        Args:
-            lead_id: The lead ID
-            
-        Returns:
-            List of e-signature documents
-        """
-        return self._make_request("GET", f"/leads/{lead_id}/signatures")
-    
-    def get_applications(self) -> Dict:
-        """
-        Get a list of available applications.
-        
-        Returns:
-            List of applications
-        """
-        return self._make_request("GET", "/leads/applications")
-    
     # Web Forms API endpoints
     
-    def get_webforms(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
+    def get_webforms(self, page: int = 1, per_page: int = 100, fetch_all: bool = False,
+                     **filters) -> Dict:
         """
         Get a list of web forms.
         
         Args:
             page: Page number
             per_page: Number of results per page
+            fetch_all: Fetch every page concurrently and return them merged under "data"
             **filters: Additional filters to apply
             
         Returns:
             List of web forms
         """
-        params = {"page": page, "per_page": per_page, **filters}
+        params = self._list_params(page, per_page, **filters)
+        if fetch_all:
+            return {"data": self.paginate_all("/webforms", params)}
         return self._make_request("GET", "/webforms", params=params)
     
-    def generate_webform(self, lead_id: str, webform_default_id: str, data: Dict) -> Dict:
-        """
-        Generate a web form from lead.
-        
-        Args:
-            lead_id: The lead ID
-            webform_default_id: The web form default ID
-            data: Web form generation data
-            
-        Returns:
-            Generated web form details
-        """
-        return self._make_request("POST", f"/leads/{lead_id}/webforms/{webform_default_id}/generate", data=data)
-    
-    def send_webform(self, lead_id: str, webform_session_id: str, data: Dict) -> Dict:
-        """
-        Send a web form from lead.
-        
-        Args:
-            lead_id: The lead ID
-            webform_session_id: The web form session ID
-            data: Web form sending data
-            
-        Returns:
-            Web form sending result
-        """
-        return self._make_request("POST", f"/leads/{lead_id}/webforms/{webform_session_id}/send", data=data)
-    
-    def get_lead_webforms(self, lead_id: str) -> Dict:
-        """
-        Get a list of all lead web forms.
-        
-        Args:
-            lead_id: The lead ID
-            
-        Returns:
-            List of web forms
-        """
-        return self._make_request("GET", f"/leads/{lead_id}/webforms") 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Ireland Pay CRM API Errors
+Categorized exceptions raised by the Ireland Pay CRM client.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class IrelandPayCRMError(Exception):
+    """Base exception for Ireland Pay CRM errors.
+    
+    This serves as the parent class for more specific error types.
+    
+    Attributes:
+        status_code: HTTP status of the failed response, if one was received
+        body: First bytes of the response body, undecoded
+    """
+    
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 body: Optional[bytes] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+class RetryableError(IrelandPayCRMError):
+    """Exception for errors that should be retried.
+    
+    Use this for transient errors where a retry might succeed, such as:
+    - Network connectivity issues
+    - HTTP 5xx server errors
+    - Gateway timeouts
+    - Rate limiting (with appropriate backoff)
+    
+    The retry logic will automatically attempt to recover from these errors.
+    """
+    pass
+
+class RateLimitedError(RetryableError):
+    """Exception for responses that told us when to retry.
+    
+    Raised for HTTP 429 and 503 responses carrying a Retry-After header, so the
+    retry logic can wait exactly as long as the server asked.
+    
+    Attributes:
+        retry_after: Seconds to wait before the next attempt
+    """
+    
+    def __init__(self, message: str, retry_after: float, status_code: Optional[int] = None,
+                 body: Optional[bytes] = None):
+        super().__init__(message, status_code=status_code, body=body)
+        self.retry_after = retry_after
+
+class FatalError(IrelandPayCRMError):
+    """Exception for errors that should not be retried.
+    
+    Use this for errors where retrying would not help, such as:
+    - Authentication failures
+    - HTTP 4xx client errors (invalid parameters, etc.)
+    - Resource not found errors
+    - Permission issues
+    
+    The system will fail fast for these errors without wasting retry attempts.
+    """
+    pass
+
+
+def undecodable_body_error(content: bytes, status_code: int, limit: int) -> IrelandPayCRMError:
+    """
+    Build the error for a successful response whose body isn't valid JSON.
+    
+    A body that starts like JSON was most likely cut off in transit and is worth
+    retrying; anything else (an HTML login or maintenance page, plain text) won't
+    turn into JSON on a retry.
+    
+    Args:
+        content: Response body
+        status_code: HTTP status of the response
+        limit: Number of body bytes to keep on the error
+    
+    Returns:
+        RetryableError for a truncated JSON body, FatalError otherwise
+    """
+    body = content[:limit]
+    error = RetryableError if content.lstrip()[:1] in (b"{", b"[") else FatalError
+    return error(f"Response body is not valid JSON: {body[:100]!r}", status_code=status_code, body=body)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds from now.
+    
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+    
+    Returns:
+        Non-negative number of seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -13,20 +13,47 @@ Enhanced with:
 """
 import os
 import time
+import queue
+import atexit
+import asyncio
+import contextlib
+import contextvars
+import functools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, TypeVar, Callable
-import tenacity
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, RetryError
-from requests.exceptions import RequestException, Timeout, ConnectionError
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, TypeVar, Callable
+import httpx
+import pandas as pd
+from postgrest.exceptions import APIError
+from tenacity import stop_after_attempt, stop_after_delay, wait_random_exponential, retry_if_exception_type, RetryError, Retrying, AsyncRetrying
 from .supabase import createSupabaseServiceClient
+# Error types come from the client package, which raises them from its requests
+from .irelandpay_crm_client import IrelandPayCRMClient, AsyncIrelandPayCRMClient
+from .irelandpay_crm_client.exceptions import RetryableError, RateLimitedError, FatalError
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Set up logging
 logger = logging.getLogger('irelandpay_crm_sync')
 handler = logging.StreamHandler()
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+# Records are handed to a queue and written by a listener thread, so the
+# request/response path never blocks on stream I/O
+log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, handler)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger.setLevel(logging.INFO)
 
 # =========================================================================
@@ -42,12 +69,30 @@ logger.setLevel(logging.INFO)
 MAX_RETRIES = int(os.environ.get('IRELANDPAY_MAX_RETRIES', '3'))
 
 # Base delay in milliseconds for exponential backoff
-# - With default of 1000ms, retries will be delayed by approximately: 1s, 2s, 4s...
+# - With default of 1000ms, retries will be delayed by a random time of up to: 1s, 2s, 4s...
 # - Increase for less aggressive retries or rate-limited APIs
 # - Decrease for faster retries in development (but be cautious of rate limits)
 # Default: 1000 (1 second)
 BACKOFF_BASE_MS = int(os.environ.get('IRELANDPAY_BACKOFF_BASE_MS', '1000'))
 
+# Total time budget in seconds for one operation including all of its retries
+# - Retrying stops once this deadline passes, even if attempts remain
+# - Increase for long-running syncs against a slowly recovering API
+# Default: 120 seconds
+RETRY_DEADLINE_SECONDS = int(os.environ.get('IRELANDPAY_RETRY_DEADLINE_SECONDS', '120'))
+
+# Total time budget in seconds for one sync run (merchants, residuals or volumes)
+# - Once it passes, remaining operations fail fast instead of retrying
+# - Each API attempt's timeout is also cut to the time left in the budget
+# Default: 1800 seconds (30 minutes)
+SYNC_DEADLINE_SECONDS = int(os.environ.get('IRELANDPAY_SYNC_DEADLINE_SECONDS', '1800'))
+
+# Maximum number of error messages kept in one sync's results
+# - Later errors are still logged and counted in "errors_dropped"
+# - Keeps a failing large sync from building a huge results payload
+# Default: 1000 messages
+MAX_RESULT_ERRORS = int(os.environ.get('IRELANDPAY_MAX_RESULT_ERRORS', '1000'))
+
 # Timeout in seconds for HTTP requests
 # - Increase for APIs with known slow response times
 # - Decrease to fail faster when API is unresponsive
@@ -67,45 +112,234 @@ CIRCUIT_MAX_FAILURES = int(os.environ.get('IRELANDPAY_CIRCUIT_MAX_FAILURES', '5'
 # Default: 60 seconds (1 minute)
 CIRCUIT_RESET_SECONDS = int(os.environ.get('IRELANDPAY_CIRCUIT_RESET_SECONDS', '60'))
 
-# Define custom error types for better error handling
-class IrelandPayCRMError(Exception):
-    """Base exception for Ireland Pay CRM errors.
+# Ceiling in seconds for the circuit reset timeout
+# - Each failed half-open probe doubles the timeout, up to this value
+# - Keeps a long outage from being probed every CIRCUIT_RESET_SECONDS
+# Default: 900 seconds (15 minutes)
+CIRCUIT_RESET_MAX_SECONDS = int(os.environ.get('IRELANDPAY_CIRCUIT_RESET_MAX_SECONDS', '900'))
+
+# Redis server holding the circuit breaker state, e.g. redis://localhost:6379/0
+# - Set it when several worker processes sync at once, so they share one breaker
+#   and stop calling a failing API together (needs the redis package)
+# - Unset, each process keeps its own in-memory breaker
+# Default: unset
+REDIS_URL = os.environ.get('REDIS_URL')
+
+# Timeout in seconds for connecting to and talking with the circuit breaker's Redis
+# - Every breaker check waits on Redis, so a hung server must fail fast; the
+#   breaker then falls back to this process's own state until Redis answers again
+# Default: 0.5 seconds
+REDIS_TIMEOUT_SECONDS = float(os.environ.get('IRELANDPAY_REDIS_TIMEOUT_SECONDS', '0.5'))
+
+# Maximum number of concurrent API requests in the async sync paths
+# - Increase to sync large merchant portfolios faster if the API allows it
+# - Decrease if the API starts rate limiting
+# Default: 32 concurrent requests
+SYNC_CONCURRENCY = int(os.environ.get('IRELANDPAY_SYNC_CONCURRENCY', '32'))
+
+# Maximum number of rows sent to Supabase in one upsert request
+# - Increase to cut round-trips further when rows are small
+# - Decrease if requests start hitting payload size limits or statement timeouts
+# Default: 500 rows per request
+UPSERT_BATCH_SIZE = int(os.environ.get('IRELANDPAY_UPSERT_BATCH_SIZE', '500'))
+
+# Maximum number of merchants sent in one ingest_merchants RPC call
+# - The function merges its whole jsonb argument in one INSERT ... SELECT, so it
+#   takes far larger batches than a PostgREST upsert
+# - Merchant pages hold at most MAX_PER_PAGE rows, which caps the effective size
+# Default: 5000 rows per call
+INGEST_BATCH_SIZE = int(os.environ.get('IRELANDPAY_INGEST_BATCH_SIZE', '5000'))
+
+# Number of upsert batches sent to Supabase at once when a sync writes several
+# - Overlaps each request's round-trip with the database's work on the others
+# - Decrease if the database shows lock contention or connection pressure
+# Default: 4 concurrent batches
+WRITE_CONCURRENCY = max(1, int(os.environ.get('IRELANDPAY_WRITE_CONCURRENCY', '4')))
+
+# Number of merchant pages fetched ahead while earlier pages are being written
+# - Increase when page downloads are much slower than the database upserts
+# - Up to this many requests past the last page may be wasted at the end of a sync
+# Default: 4 pages
+PREFETCH_PAGES = max(1, int(os.environ.get('IRELANDPAY_PREFETCH_PAGES', '4')))
+
+# Maximum number of Ireland Pay CRM calls in flight at once across all sync threads
+# - Acts as a bulkhead: concurrent syncs in one process share this budget
+# - Decrease if the API starts rate limiting
+# Default: 16 concurrent calls
+MAX_INFLIGHT = int(os.environ.get('IRELANDPAY_MAX_INFLIGHT', '16'))
+
+# Interval in seconds between DEBUG-level request metrics snapshots during a sync
+# - Only used when the logger is at DEBUG level; INFO gets one summary per sync
+# Default: 30 seconds
+METRICS_LOG_SECONDS = int(os.environ.get('IRELANDPAY_METRICS_LOG_SECONDS', '30'))
+
+# Type variable for generic function return type
+T = TypeVar('T')
+
+# merchants table columns and the Ireland Pay CRM merchant fields they are read from
+MERCHANT_FIELDS = {
+    "mid": "mid",
+    "datasource": "datasource",
+    "merchant_dba": "name",
+    "opened": "opened",
+    "closed": "closed",
+    "status": "status",
+    "active": "active",
+    "group": "group",
+    "processor": "processor",
+    "sic_code": "sic_code",
+    "vim": "vim",
+    "created": "created",
+    "modified": "modified",
+}
+
+# Longest single wait between retries, in seconds, including server-requested waits
+RETRY_MAX_WAIT_SECONDS = 60
+
+_backoff_wait = wait_random_exponential(multiplier=BACKOFF_BASE_MS / 1000, max=RETRY_MAX_WAIT_SECONDS)
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as a rate-limited response asked, otherwise back off.
     
-    This serves as the parent class for more specific error types.
+    Backoff waits use full jitter (uniform in [0, exponential backoff]) so workers
+    that failed together don't all retry in lockstep.
     """
-    pass
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exception, RateLimitedError):
+        return min(exception.retry_after, RETRY_MAX_WAIT_SECONDS)
+    return _backoff_wait(retry_state)
 
-class RetryableError(IrelandPayCRMError):
-    """Exception for errors that should be retried.
-    
-    Use this for transient errors where a retry might succeed, such as:
-    - Network connectivity issues
-    - HTTP 5xx server errors
-    - Gateway timeouts
-    - Rate limiting (with appropriate backoff)
+
+def _log_retry(retry_state) -> None:
+    """Log the failure that is about to be retried."""
+    logger.warning("Retry %s after %s", retry_state.attempt_number, retry_state.outcome.exception())
+
+
+# Retry policy shared by the sync and async resilience wrappers
+RETRY_WAIT = _retry_wait
+RETRY_STOP = stop_after_attempt(MAX_RETRIES) | stop_after_delay(RETRY_DEADLINE_SECONDS)
+RETRY_IF = retry_if_exception_type(RetryableError)
+
+# Database error codes worth retrying: SQLSTATE classes for connection failures (08),
+# deadlocks and serialization failures (40), exhausted resources (53), statement
+# timeouts and shutdowns (57) and lock timeouts (55P03), plus PostgREST's own
+# connection and schema cache errors. Anything else is a problem with the rows.
+TRANSIENT_DB_ERROR_CODES = ("08", "40", "53", "57", "55P03", "PGRST000", "PGRST001", "PGRST002", "PGRST003")
+
+# Database error codes caused by individual rows: data exceptions (22) and
+# constraint violations (23). Only these are worth splitting a batch to isolate;
+# schema errors (42xxx, PGRST2xx) fail every row the same way.
+ROW_DB_ERROR_CODES = ("22", "23")
+
+# Errors from an ingest_* function that is missing (PGRST202) or doesn't match the
+# live tables (undefined column or function, no unique index for its ON CONFLICT);
+# the sync falls back to PostgREST upserts instead of failing every batch
+INGEST_RPC_UNUSABLE_CODES = ("PGRST202", "42703", "42883", "42P10")
+
+# Bulkhead shared by every threaded CRM call made by the sync
+_api_bulkhead = threading.BoundedSemaphore(MAX_INFLIGHT)
+
+# time.monotonic() deadline of the running sync, if any. A context variable rather
+# than manager state, so syncs running at once (e.g. the months of sync_range) keep
+# their own deadlines; worker threads are handed it explicitly
+_sync_deadline = contextvars.ContextVar("irelandpay_sync_deadline", default=None)
+
+@dataclass
+class SyncMetrics:
+    """Aggregated request metrics for one sync run.
     
-    The retry logic will automatically attempt to recover from these errors.
+    Updated from the CRM client's on_response callback, which may fire from
+    several threads at once, instead of logging every request.
     """
-    pass
-
-class FatalError(IrelandPayCRMError):
-    """Exception for errors that should not be retried.
+    successes: int = 0
+    failures: int = 0
+    bytes_in: int = 0
+    latency_ms: List[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
     
-    Use this for errors where retrying would not help, such as:
-    - Authentication failures
-    - HTTP 4xx client errors (invalid parameters, etc.)
-    - Resource not found errors
-    - Permission issues
+    def record(self, status: Optional[int], size: int, elapsed_ms: float) -> None:
+        """Record one API request.
+        
+        Args:
+            status: HTTP status of the response, or None if no response arrived
+            size: Response body size in bytes
+            elapsed_ms: Request latency in milliseconds
+        """
+        with self._lock:
+            if status is not None and status < 400:
+                self.successes += 1
+            else:
+                self.failures += 1
+            self.bytes_in += size
+            self.latency_ms.append(elapsed_ms)
     
-    The system will fail fast for these errors without wasting retry attempts.
-    """
-    pass
+    def summary(self) -> str:
+        """Format the metrics as a single log-friendly line."""
+        with self._lock:
+            latencies = sorted(self.latency_ms)
+            successes, failures, bytes_in = self.successes, self.failures, self.bytes_in
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            latency = f"p50={p50:.1f}ms p95={p95:.1f}ms max={latencies[-1]:.1f}ms"
+        else:
+            latency = "no requests"
+        return f"{successes} ok, {failures} failed, {bytes_in} bytes in, {latency}"
+
+def _with_sync_deadline(func):
+    """Run a sync method, sync or async, under its own SYNC_DEADLINE_SECONDS budget."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _sync_deadline.set(time.monotonic() + SYNC_DEADLINE_SECONDS)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _sync_deadline.reset(token)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _sync_deadline.set(time.monotonic() + SYNC_DEADLINE_SECONDS)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _sync_deadline.reset(token)
+    return wrapper
 
-# Import the client after error definitions to avoid circular imports
-from .irelandpay_crm_client import IrelandPayCRMClient
 
-# Type variable for generic function return type
-T = TypeVar('T')
+def _with_metrics(label: str):
+    """Collect request metrics for a sync method and log them once it finishes.
+    
+    A fresh SyncMetrics is installed on the manager for the duration of the call.
+    At DEBUG level a background thread also logs a snapshot every
+    METRICS_LOG_SECONDS while the sync is running.
+    
+    Args:
+        label: Name of the sync used in the log lines
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self.metrics = metrics = SyncMetrics()
+            stop = threading.Event()
+            reporter = None
+            if logger.isEnabledFor(logging.DEBUG):
+                def report():
+                    while not stop.wait(METRICS_LOG_SECONDS):
+                        logger.debug("%s in progress: %s", label, metrics.summary())
+                reporter = threading.Thread(target=report, name="sync-metrics", daemon=True)
+                reporter.start()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                stop.set()
+                if reporter is not None:
+                    reporter.join()
+                logger.info("%s complete: %s", label, metrics.summary())
+        return wrapper
+    return decorator
 
 # Simple circuit breaker implementation
 class CircuitBreaker:
@@ -116,22 +350,48 @@ class CircuitBreaker:
     
     1. Tracks consecutive failures
     2. Opens circuit (fast-fails) after a configurable threshold
-    3. Auto-resets after a configurable timeout period
+    3. Half-opens after a configurable timeout, letting a single probe call through:
+       success closes the circuit, failure reopens it for twice the timeout
+       (capped at CIRCUIT_RESET_MAX_SECONDS)
     4. Provides logging for all state changes
     
-    This is implemented as a singleton to maintain global state across API calls.
+    This is implemented as a thread-safe singleton to maintain global state across
+    API calls made from any sync thread.
     """
     
+    CLOSED = "closed"  # Calls flow normally
+    OPEN = "open"  # Calls fail fast
+    HALF_OPEN = "half_open"  # One probe call is allowed through
+    
     _instance = None  # Singleton instance
-    _failures = 0  # Number of consecutive failures
-    _is_open = False  # Circuit state (open = no calls allowed)
-    _last_failure_time = None  # Time of last failure for reset timing
+    _instance_lock = threading.Lock()
+    
+    # Whether checks and updates do network I/O (async callers run them on a thread)
+    BLOCKING = False
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0  # Number of consecutive failures
+        self._last_failure_time = None  # time.monotonic() of last failure, immune to clock changes
+        self._reset_backoff = CIRCUIT_RESET_SECONDS  # Current open-to-half-open timeout
     
     @classmethod
     def getInstance(cls):
         """Get singleton instance of CircuitBreaker"""
         if cls._instance is None:
-            cls._instance = CircuitBreaker()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    if REDIS_URL and redis is not None:
+                        cls._instance = RedisCircuitBreaker(redis.Redis.from_url(
+                            REDIS_URL,
+                            socket_timeout=REDIS_TIMEOUT_SECONDS,
+                            socket_connect_timeout=REDIS_TIMEOUT_SECONDS
+                        ))
+                    else:
+                        if REDIS_URL:
+                            logger.warning("REDIS_URL is set but redis is not installed, using a local circuit breaker")
+                        cls._instance = CircuitBreaker()
         return cls._instance
     
     def record_failure(self):
@@ -139,38 +399,69 @@ class CircuitBreaker:
         
         Call this method whenever an API call fails. Once the number of failures
         reaches CIRCUIT_MAX_FAILURES, the circuit will open and prevent further calls.
+        A failed half-open probe reopens the circuit immediately and doubles the
+        time until the next probe.
         """
-        self._failures += 1
-        self._last_failure_time = time.time()
-        
-        if self._failures >= CIRCUIT_MAX_FAILURES:
-            if not self._is_open:
-                self._is_open = True
-                logger.warning(f"Circuit breaker opened after {CIRCUIT_MAX_FAILURES} failures")
+        with self._lock:
+            self._failures += 1
+            self._last_failure_time = time.monotonic()
+            
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._reset_backoff = min(CIRCUIT_RESET_MAX_SECONDS, self._reset_backoff * 2)
+                logger.warning("Circuit breaker reopened after failed probe, next probe in %ss",
+                               self._reset_backoff)
+            elif self._state == self.CLOSED and self._failures >= CIRCUIT_MAX_FAILURES:
+                self._state = self.OPEN
+                logger.warning("Circuit breaker opened after %s failures", CIRCUIT_MAX_FAILURES)
     
     def record_success(self):
         """Reset failure count after a successful operation.
         
         Call this method after each successful API call to reset the failure counter.
-        This prevents the circuit from opening unnecessarily due to occasional failures.
+        This prevents the circuit from opening unnecessarily due to occasional failures,
+        and closes the circuit after a successful half-open probe.
         """
-        if self._failures > 0:
-            logger.info(f"Circuit breaker failure count reset after success")
+        # Common case: nothing to reset, so skip the lock
+        if self._state == self.CLOSED and not self._failures:
+            return
+        
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                logger.info("Circuit breaker closed after successful probe")
+            elif self._failures > 0:
+                logger.info("Circuit breaker failure count reset after success")
+            self._state = self.CLOSED
             self._failures = 0
+            self._reset_backoff = CIRCUIT_RESET_SECONDS
     
     def is_open(self):
-        """Check if circuit is open and should reset if timeout has passed."""
-        if not self._is_open:
-            return False
+        """Check whether calls should fail fast.
         
-        # Check if enough time has passed to attempt reset
-        if self._last_failure_time and (time.time() - self._last_failure_time) > CIRCUIT_RESET_SECONDS:
-            logger.info("Circuit breaker attempting reset after timeout")
-            self._is_open = False
-            self._failures = 0
+        Once the reset timeout has passed, the first caller is let through as the
+        half-open probe; everyone else keeps failing fast until the probe is recorded.
+        A probe that never reports back (e.g. a cancelled task) is replaced by a
+        new one after another timeout, so the circuit cannot stay half-open forever.
+        """
+        # Common case: a closed circuit is read without taking the lock or the time
+        if self._state == self.CLOSED:
             return False
         
-        return True
+        with self._lock:
+            if self._state == self.CLOSED:
+                return False
+            
+            # Check if enough time has passed to attempt reset
+            now = time.monotonic()
+            if (self._last_failure_time is not None
+                    and (now - self._last_failure_time) > self._reset_backoff):
+                logger.info("Circuit breaker half-open, probing after timeout")
+                self._state = self.HALF_OPEN
+                # Time the probe from here, so a lost probe is retried after a timeout
+                self._last_failure_time = now
+                return False
+            
+            return True
     
     @classmethod
     def execute(cls, func: Callable[..., T], *args, **kwargs) -> T:
@@ -202,12 +493,118 @@ class CircuitBreaker:
             result = func(*args, **kwargs)
             circuit.record_success()
             return result
-        except Exception as e:
-            # Don't count client errors (4xx) as circuit failures
-            if not isinstance(e, FatalError):
-                cls.record_failure()
+        except FatalError:
+            # A client error (4xx) still shows the service is responding
+            circuit.record_success()
+            raise
+        except Exception:
+            circuit.record_failure()
             raise
 
+
+class RedisCircuitBreaker(CircuitBreaker):
+    """Circuit breaker whose state lives in Redis, shared by every sync process.
+    
+    Follows the same closed/open/half-open rules as CircuitBreaker. Each check
+    and update is a Lua script, so reading and changing the state takes one
+    atomic round trip; times come from the Redis server clock. The failure count
+    expires after CIRCUIT_RESET_SECONDS without failures. While Redis is
+    unreachable, the breaker falls back to this process's own in-memory state.
+    """
+    
+    KEY_PREFIX = "irelandpay_crm:circuit"
+    BLOCKING = True
+    
+    # Returns 0 if calls may go ahead, 1 if they must fail fast, 2 for the half-open probe
+    _IS_OPEN = """
+    local state = redis.call('GET', KEYS[1])
+    if not state or state == 'closed' then return 0 end
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    if now < tonumber(redis.call('GET', KEYS[2]) or 0) then return 1 end
+    -- Let one caller probe; if it never reports back another probe follows a timeout later
+    redis.call('SET', KEYS[1], 'half_open')
+    redis.call('SET', KEYS[2], now + tonumber(redis.call('GET', KEYS[4]) or ARGV[1]))
+    return 2
+    """
+    
+    # Returns 1 if this failure opened or reopened the circuit
+    _RECORD_FAILURE = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('GET', KEYS[1])
+    local backoff = tonumber(redis.call('GET', KEYS[4]) or ARGV[2])
+    local failures = redis.call('INCR', KEYS[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[2])
+    if state == 'half_open' then
+        backoff = math.min(tonumber(ARGV[3]), backoff * 2)
+        redis.call('SET', KEYS[4], backoff)
+    elseif state == 'open' or failures < tonumber(ARGV[1]) then
+        return 0
+    end
+    redis.call('SET', KEYS[1], 'open')
+    redis.call('SET', KEYS[2], now + backoff)
+    return 1
+    """
+    
+    def __init__(self, client):
+        """Initialize the breaker on a Redis connection.
+        
+        Args:
+            client: redis.Redis connection
+        """
+        super().__init__()
+        self._redis = client
+        self._keys = [f"{self.KEY_PREFIX}:{name}" for name in ("state", "until", "failures", "backoff")]
+        self._is_open_script = client.register_script(self._IS_OPEN)
+        self._record_failure_script = client.register_script(self._RECORD_FAILURE)
+        # Set when this process has something to reset on success
+        self._dirty = False
+    
+    def record_failure(self):
+        """Count a failure in Redis, opening the circuit at CIRCUIT_MAX_FAILURES."""
+        self._dirty = True
+        try:
+            opened = self._record_failure_script(
+                keys=self._keys, args=[CIRCUIT_MAX_FAILURES, CIRCUIT_RESET_SECONDS, CIRCUIT_RESET_MAX_SECONDS]
+            )
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker failure not recorded in Redis, counting it locally: %s", e)
+            super().record_failure()
+            return
+        if opened:
+            logger.warning("Circuit breaker opened for all sync processes")
+    
+    def record_success(self):
+        """Close the shared circuit and reset its failure count."""
+        # Failures counted locally while Redis was unreachable
+        super().record_success()
+        
+        # Only a process that saw a failure or ran the probe has state to reset
+        if not self._dirty:
+            return
+        
+        self._dirty = False
+        try:
+            self._redis.delete(*self._keys)
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker success not recorded in Redis: %s", e)
+    
+    def is_open(self):
+        """Check whether calls should fail fast, taking the half-open probe when due."""
+        try:
+            result = self._is_open_script(keys=self._keys, args=[CIRCUIT_RESET_SECONDS])
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker state unavailable from Redis, using local state: %s", e)
+            return super().is_open()
+        
+        if result == 2:
+            logger.info("Circuit breaker half-open, probing after timeout")
+            self._dirty = True
+            return False
+        return result == 1
+
+
 class IrelandPayCRMSyncManager:
     """Manages synchronization between Ireland Pay CRM and the application database.
     
@@ -233,11 +630,22 @@ class IrelandPayCRMSyncManager:
         api_key = os.environ.get('IRELANDPAY_CRM_API_KEY')
         if not api_key:
             raise ValueError("IRELANDPAY_CRM_API_KEY environment variable not set")
-        self.irelandpay_client = IrelandPayCRMClient(api_key)
+        self.metrics = SyncMetrics()
+        # Bulk ingest functions the database turned out not to have, or not to match
+        self.missing_ingest_rpcs = set()
+        # Every merchant ID, once a full merchants sync has seen them all
+        self._merchant_mids = None
+        # One pooled keep-alive session serves every sync thread and every retry
+        self.irelandpay_client = IrelandPayCRMClient(
+            api_key,
+            timeout=(5, TIMEOUT_SECONDS),
+            on_response=lambda *response_info: self.metrics.record(*response_info),
+            pool_maxsize=max(IrelandPayCRMClient.POOL_MAXSIZE, SYNC_CONCURRENCY)
+        )
         self.supabase = createSupabaseServiceClient()
         logger.info("Ireland Pay CRM Sync Manager initialized")
     
-    def _execute_with_resilience(self, operation_func, *args, **kwargs):
+    def _execute_with_resilience(self, operation_func, *args, deadline: Optional[float] = None, **kwargs):
         """Execute an operation with retry and circuit breaker patterns.
         
         This method wraps operations (API calls, database operations) with resilience
@@ -247,49 +655,138 @@ class IrelandPayCRMSyncManager:
         2. Uses tenacity library for exponential backoff retries
         3. Categorizes errors into retryable and fatal
         4. Updates circuit breaker state based on successes and failures
+        5. Stops retrying at the deadline and caps API timeouts to the time left
         
         Args:
             operation_func: The function to execute
             *args: Positional arguments to pass to operation_func
+            deadline: time.monotonic() value by which the operation must finish,
+                retries included (defaults to the running sync's deadline)
             **kwargs: Keyword arguments to pass to operation_func
             
         Returns:
             The result of operation_func if successful, or an error dict if all retries fail
         """
+        deadline = deadline or _sync_deadline.get()
+        stop = RETRY_STOP
+        if deadline is not None:
+            stop = stop | stop_after_delay(max(0.0, deadline - time.monotonic()))
         
-        @retry(
-            stop=stop_after_attempt(MAX_RETRIES),
-            wait=wait_exponential(multiplier=BACKOFF_BASE_MS / 1000, min=1, max=60),
-            retry=retry_if_exception_type(RetryableError),
-            before_sleep=lambda retry_state: logger.warning(
-                f"Retry {retry_state.attempt_number} after {retry_state.outcome.exception()}"
-            )
-        )
-        def resilient_operation():
-            return CircuitBreaker.execute(operation_func, *args, **kwargs)
+        try:
+            for attempt in Retrying(stop=stop, wait=RETRY_WAIT, retry=RETRY_IF, before_sleep=_log_retry):
+                with attempt:
+                    if deadline is None:
+                        return CircuitBreaker.execute(operation_func, *args, **kwargs)
+                    if time.monotonic() >= deadline:
+                        raise FatalError("Sync deadline exceeded")
+                    with self.irelandpay_client.deadline(deadline):
+                        return CircuitBreaker.execute(operation_func, *args, **kwargs)
+        except RetryError as e:
+            logger.error("Operation failed after %s retries: %s", MAX_RETRIES, e)
+            return {
+                "success": False,
+                "error": f"Operation failed after {MAX_RETRIES} retries",
+                "details": str(e)
+            }
+        except FatalError as e:
+            logger.error("Operation failed with non-retryable error: %s", e)
+            return {
+                "success": False,
+                "error": "Non-retryable error during operation",
+                "details": str(e)
+            }
+        except Exception as e:
+            logger.error("Operation failed with unexpected error: %s", e)
+            return {
+                "success": False,
+                "error": "Unexpected error during operation",
+                "details": str(e)
+            }
+    
+    async def _execute_async_with_resilience(self, operation_func, *args, deadline: Optional[float] = None,
+                                             **kwargs):
+        """Async counterpart of _execute_with_resilience for coroutine operations.
+        
+        Applies the same retry policy and circuit breaker as the synchronous
+        wrapper, but awaits operation_func so many operations can be in flight
+        on one event loop.
+        
+        Args:
+            operation_func: The coroutine function to execute
+            *args: Positional arguments to pass to operation_func
+            deadline: time.monotonic() value by which the operation must finish,
+                retries included (defaults to the running sync's deadline)
+            **kwargs: Keyword arguments to pass to operation_func
+            
+        Returns:
+            The result of operation_func if successful, or an error dict if all retries fail
+        """
+        circuit = CircuitBreaker.getInstance()
+        deadline = deadline or _sync_deadline.get()
+        stop = RETRY_STOP
+        if deadline is not None:
+            stop = stop | stop_after_delay(max(0.0, deadline - time.monotonic()))
+        
+        async def call_circuit(method):
+            # A Redis-backed breaker waits on the network, which must not stall the event loop
+            if circuit.BLOCKING:
+                return await asyncio.to_thread(method)
+            return method()
         
         try:
-            return resilient_operation()
+            async for attempt in AsyncRetrying(stop=stop, wait=RETRY_WAIT, retry=RETRY_IF, before_sleep=_log_retry):
+                with attempt:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise FatalError("Sync deadline exceeded")
+                    if await call_circuit(circuit.is_open):
+                        raise RetryableError("Circuit breaker is open - service temporarily unavailable")
+                    
+                    try:
+                        timeout = None if deadline is None else deadline - time.monotonic()
+                        result = await asyncio.wait_for(operation_func(*args, **kwargs), timeout)
+                    except FatalError:
+                        # A client error (4xx) still shows the service is responding
+                        await call_circuit(circuit.record_success)
+                        raise
+                    except Exception:
+                        await call_circuit(circuit.record_failure)
+                        raise
+                    
+                    await call_circuit(circuit.record_success)
+                    return result
         except RetryError as e:
-            logger.error(f"Operation failed after {MAX_RETRIES} retries: {e}")
+            logger.error("Operation failed after %s retries: %s", MAX_RETRIES, e)
             return {
                 "success": False,
                 "error": f"Operation failed after {MAX_RETRIES} retries",
                 "details": str(e)
             }
+        except FatalError as e:
+            logger.error("Operation failed with non-retryable error: %s", e)
+            return {
+                "success": False,
+                "error": "Non-retryable error during operation",
+                "details": str(e)
+            }
         except Exception as e:
-            logger.error(f"Operation failed with unexpected error: {e}")
+            logger.error("Operation failed with unexpected error: %s", e)
             return {
                 "success": False,
                 "error": "Unexpected error during operation",
                 "details": str(e)
             }
     
+    @_with_metrics("Merchants sync")
+    @_with_sync_deadline
     def sync_merchants(self, force: bool = False) -> Dict[str, Any]:
         """Sync merchants data from Ireland Pay CRM API to Supabase.
         
+        Only merchants modified since the newest `modified` date seen by the last
+        clean sync are fetched. The cursor is kept in the sync_cursors table and
+        advances only when every merchant was fetched and written.
+        
         Args:
-            force: If True, force a full sync even if recent data exists
+            force: If True, fetch every merchant regardless of the sync cursor
             
         Returns:
             Dictionary containing sync results and statistics
@@ -298,80 +795,122 @@ class IrelandPayCRMSyncManager:
         
         results = {
             "total_merchants": 0,
-            "merchants_added": 0,
-            "merchants_updated": 0,
+            "merchants_upserted": 0,
             "merchants_failed": 0,
             "errors": [],
+            "errors_dropped": 0,
             "start_time": datetime.now().isoformat(),
             "end_time": None
         }
         
         try:
-            # Get all merchants from Ireland Pay CRM
+            # Get merchants changed since the last sync from Ireland Pay CRM,
+            # or all of them on a forced or first sync
             page = 1
-            per_page = 100
+            per_page = IrelandPayCRMClient.MAX_PER_PAGE
+            synced_at = datetime.now().isoformat()
+            modified_since = None if force else self._get_sync_cursor("merchants")
+            latest_modified = None
+            synced_mids = []
+            if modified_since:
+                logger.info("Fetching merchants modified since %s", modified_since)
             
-            while True:
-                logger.info(f"Fetching merchants page {page}")
-                
-                # Use resilient execution for API call
-                api_result = self._execute_with_resilience(
-                    self.irelandpay_client.get_merchants,
-                    page=page,
-                    per_page=per_page
-                )
-                
-                if not api_result.get("success", True):
-                    results["errors"].append(f"Failed to fetch merchants page {page}: {api_result.get('error')}")
-                    break
+            # Prefetch threads don't see this thread's context, so take the deadline along
+            deadline = _sync_deadline.get()
+            
+            def fetch_page(page: int) -> Dict:
+                logger.debug("Fetching merchants page %s", page)
+                with _api_bulkhead:
+                    # Use resilient execution for API call
+                    return self._execute_with_resilience(
+                        self.irelandpay_client.get_merchants,
+                        page=page,
+                        deadline=deadline,
+                        per_page=per_page,
+                        modified_since=modified_since
+                    )
+            
+            # Up to PREFETCH_PAGES pages are downloaded in the background while the
+            # current one is transformed and written; pages are consumed in order
+            with ThreadPoolExecutor(max_workers=PREFETCH_PAGES, thread_name_prefix="merchants-prefetch") as prefetcher:
+                pending = deque()
+                next_to_fetch = page
                 
-                merchants_data = api_result.get("data", [])
-                if not merchants_data:
-                    break
+                def fill_window():
+                    nonlocal next_to_fetch
+                    while len(pending) < PREFETCH_PAGES:
+                        pending.append(prefetcher.submit(fetch_page, next_to_fetch))
+                        next_to_fetch += 1
                 
-                # Process each merchant
-                for merchant in merchants_data:
+                fill_window()
+                while True:
+                    api_result = pending.popleft().result()
+                    
+                    if not api_result.get("success", True):
+                        self._record_error(results, f"Failed to fetch merchants page {page}: {api_result.get('error')}")
+                        break
+                    
+                    merchants_data = api_result.get("data", [])
+                    if not merchants_data:
+                        break
+                    
+                    # Check if we have more pages
+                    has_more = len(merchants_data) >= per_page
+                    if has_more:
+                        fill_window()
+                    
+                    page_modified = pd.to_datetime(
+                        [merchant.get("modified") for merchant in merchants_data], utc=True, format="ISO8601", errors="coerce"
+                    ).max()
+                    if pd.notna(page_modified) and (latest_modified is None or page_modified > latest_modified):
+                        latest_modified = page_modified
+                    
+                    # Transform the page to match our schema
                     try:
-                        # Transform merchant data to match our schema
-                        transformed_merchant = self._transform_merchant_data(merchant)
-                        
-                        # Upsert to database
-                        db_result = self._execute_with_resilience(
-                            self._upsert_merchant,
-                            transformed_merchant
-                        )
-                        
-                        if db_result.get("success", True):
-                            if db_result.get("action") == "inserted":
-                                results["merchants_added"] += 1
-                            else:
-                                results["merchants_updated"] += 1
-                        else:
-                            results["merchants_failed"] += 1
-                            results["errors"].append(f"Failed to upsert merchant {merchant.get('mid')}: {db_result.get('error')}")
-                        
-                        results["total_merchants"] += 1
-                        
+                        rows = self._transform_merchant_page(merchants_data, synced_at)
                     except Exception as e:
-                        results["merchants_failed"] += 1
-                        results["errors"].append(f"Error processing merchant {merchant.get('mid', 'unknown')}: {str(e)}")
-                        logger.error(f"Error processing merchant: {e}")
-                
-                # Check if we have more pages
-                if len(merchants_data) < per_page:
-                    break
+                        rows = []
+                        results["merchants_failed"] += len(merchants_data)
+                        self._record_error(results, f"Error processing merchants page {page}: {str(e)}")
+                        logger.error("Error processing merchants page: %s", e)
+                    
+                    # Upsert the whole page to the database
+                    rows = self._unique_merchant_rows(rows, results)
+                    self._store_rows(self._upsert_merchants, rows, results, "merchants", "merchant",
+                                     batch_size=INGEST_BATCH_SIZE)
+                    synced_mids.extend(row["mid"] for row in rows if row.get("mid"))
+                    
+                    if not has_more:
+                        break
+                    
+                    page += 1
                 
-                page += 1
+                # Drop requests queued past the last page
+                for future in pending:
+                    future.cancel()
+            
+            # A later sync must see anything that failed this time
+            clean = not results["errors"] and not results["merchants_failed"]
+            if latest_modified is not None and clean:
+                self._set_sync_cursor("merchants", latest_modified.isoformat())
+            
+            # Remember the merchant IDs so volume syncs in this run needn't list them again
+            if modified_since is None and clean:
+                self._merchant_mids = list(dict.fromkeys(synced_mids))
+            elif self._merchant_mids is not None:
+                self._merchant_mids = list(dict.fromkeys(self._merchant_mids + synced_mids))
             
             results["end_time"] = datetime.now().isoformat()
-            logger.info(f"Merchants sync completed: {results['merchants_added']} added, {results['merchants_updated']} updated, {results['merchants_failed']} failed")
+            logger.info("Merchants sync completed: %s upserted, %s failed", results['merchants_upserted'], results['merchants_failed'])
             
         except Exception as e:
-            results["errors"].append(f"Sync failed: {str(e)}")
-            logger.error(f"Merchants sync failed: {e}")
+            self._record_error(results, f"Sync failed: {str(e)}")
+            logger.error("Merchants sync failed: %s", e)
         
         return results
     
+    @_with_metrics("Residuals sync")
+    @_with_sync_deadline
     def sync_residuals(self, year: int, month: int, force: bool = False) -> Dict[str, Any]:
         """Sync residuals data from Ireland Pay CRM API to Supabase.
         
@@ -383,16 +922,16 @@ class IrelandPayCRMSyncManager:
         Returns:
             Dictionary containing sync results and statistics
         """
-        logger.info(f"Starting residuals sync for {year}-{month:02d} from Ireland Pay CRM")
+        logger.info("Starting residuals sync for %s-%02d from Ireland Pay CRM", year, month)
         
         results = {
             "year": year,
             "month": month,
             "total_residuals": 0,
-            "residuals_added": 0,
-            "residuals_updated": 0,
+            "residuals_upserted": 0,
             "residuals_failed": 0,
             "errors": [],
+            "errors_dropped": 0,
             "start_time": datetime.now().isoformat(),
             "end_time": None
         }
@@ -406,50 +945,82 @@ class IrelandPayCRMSyncManager:
             )
             
             if not api_result.get("success", True):
-                results["errors"].append(f"Failed to fetch residuals summary: {api_result.get('error')}")
+                self._record_error(results, f"Failed to fetch residuals summary: {api_result.get('error')}")
                 return results
             
-            residuals_data = api_result.get("data", {})
+            # Transform residuals data to match our schema
+            rows = self._residual_rows(api_result.get("data", {}), year, month, results)
             
-            # Process residuals data
-            for merchant_id, residual_info in residuals_data.items():
-                try:
-                    # Transform residual data to match our schema
-                    transformed_residual = self._transform_residual_data(
-                        merchant_id, residual_info, year, month
-                    )
-                    
-                    # Upsert to database
-                    db_result = self._execute_with_resilience(
-                        self._upsert_residual,
-                        transformed_residual
-                    )
-                    
-                    if db_result.get("success", True):
-                        if db_result.get("action") == "inserted":
-                            results["residuals_added"] += 1
-                        else:
-                            results["residuals_updated"] += 1
-                    else:
-                        results["residuals_failed"] += 1
-                        results["errors"].append(f"Failed to upsert residual for merchant {merchant_id}: {db_result.get('error')}")
-                    
-                    results["total_residuals"] += 1
-                    
-                except Exception as e:
-                    results["residuals_failed"] += 1
-                    results["errors"].append(f"Error processing residual for merchant {merchant_id}: {str(e)}")
-                    logger.error(f"Error processing residual: {e}")
+            # Upsert to database in batches
+            self._store_rows(self._upsert_residuals, rows, results, "residuals", "residual for merchant")
+            
+            results["end_time"] = datetime.now().isoformat()
+            logger.info("Residuals sync completed: %s upserted, %s failed", results['residuals_upserted'], results['residuals_failed'])
+            
+        except Exception as e:
+            self._record_error(results, f"Sync failed: {str(e)}")
+            logger.error("Residuals sync failed: %s", e)
+        
+        return results
+    
+    @_with_sync_deadline
+    async def sync_residuals_async(self, year: int, month: int,
+                                   client: Optional[AsyncIrelandPayCRMClient] = None) -> Dict[str, Any]:
+        """Sync residuals like sync_residuals, without blocking the event loop.
+        
+        The summary is fetched through an AsyncIrelandPayCRMClient and the
+        batched database upserts run in a worker thread.
+        
+        Args:
+            year: Year to sync
+            month: Month to sync
+            client: Optional client to share with other concurrent syncs
+            
+        Returns:
+            Dictionary containing sync results and statistics
+        """
+        logger.info("Starting async residuals sync for %s-%02d from Ireland Pay CRM", year, month)
+        
+        results = {
+            "year": year,
+            "month": month,
+            "total_residuals": 0,
+            "residuals_upserted": 0,
+            "residuals_failed": 0,
+            "errors": [],
+            "errors_dropped": 0,
+            "start_time": datetime.now().isoformat(),
+            "end_time": None
+        }
+        
+        try:
+            async with self._async_client(client) as client:
+                api_result = await self._execute_async_with_resilience(
+                    client.get_residuals_summary,
+                    year=year,
+                    month=month
+                )
+            
+            if not api_result.get("success", True):
+                self._record_error(results, f"Failed to fetch residuals summary: {api_result.get('error')}")
+                return results
+            
+            rows = self._residual_rows(api_result.get("data", {}), year, month, results)
+            await asyncio.to_thread(
+                self._store_rows, self._upsert_residuals, rows, results, "residuals", "residual for merchant"
+            )
             
             results["end_time"] = datetime.now().isoformat()
-            logger.info(f"Residuals sync completed: {results['residuals_added']} added, {results['residuals_updated']} updated, {results['residuals_failed']} failed")
+            logger.info("Async residuals sync completed: %s upserted, %s failed", results['residuals_upserted'], results['residuals_failed'])
             
         except Exception as e:
-            results["errors"].append(f"Sync failed: {str(e)}")
-            logger.error(f"Residuals sync failed: {e}")
+            self._record_error(results, f"Sync failed: {str(e)}")
+            logger.error("Async residuals sync failed: %s", e)
         
         return results
     
+    @_with_metrics("Volumes sync")
+    @_with_sync_deadline
     def sync_volumes(self, year: int, month: int, force: bool = False) -> Dict[str, Any]:
         """Sync transaction volumes data from Ireland Pay CRM API to Supabase.
         
@@ -461,148 +1032,483 @@ class IrelandPayCRMSyncManager:
         Returns:
             Dictionary containing sync results and statistics
         """
-        logger.info(f"Starting volumes sync for {year}-{month:02d} from Ireland Pay CRM")
+        logger.info("Starting volumes sync for %s-%02d from Ireland Pay CRM", year, month)
         
         results = {
             "year": year,
             "month": month,
             "total_volumes": 0,
-            "volumes_added": 0,
-            "volumes_updated": 0,
+            "volumes_upserted": 0,
             "volumes_failed": 0,
             "errors": [],
+            "errors_dropped": 0,
             "start_time": datetime.now().isoformat(),
             "end_time": None
         }
         
         try:
-            # Get all merchants first
+            # Monthly totals come pre-aggregated from the residuals report
+            summary_result = self._execute_with_resilience(
+                self.irelandpay_client.get_volumes_summary,
+                year=year,
+                month=month
+            )
+            
+            if not summary_result.get("success", True):
+                self._record_error(results, f"Failed to fetch volumes summary: {summary_result.get('error')}")
+                return results
+            
+            rows = self._transform_volume_summary(summary_result.get("data", []), year, month)
+            
+            # Residuals aren't loaded until the month closes, so sum transactions instead
+            if not rows:
+                logger.info("No residuals rows for %s-%02d, aggregating merchant transactions", year, month)
+                rows = self._collect_transaction_volumes(year, month, results)
+                if rows is None:
+                    return results
+            
+            # Upsert to database in batches
+            self._store_rows(self._upsert_volumes, rows, results, "volumes", "volume for merchant")
+        
+            results["end_time"] = datetime.now().isoformat()
+            logger.info("Volumes sync completed: %s upserted, %s failed", results['volumes_upserted'], results['volumes_failed'])
+            
+        except Exception as e:
+            self._record_error(results, f"Sync failed: {str(e)}")
+            logger.error("Volumes sync failed: %s", e)
+        
+        return results
+    
+    def _collect_transaction_volumes(self, year: int, month: int,
+                                     results: Dict[str, Any]) -> Optional[List[Dict]]:
+        """Build monthly volume rows by summing each merchant's transactions.
+        
+        Used for months without residuals rows. Transactions are fetched
+        concurrently, one listing per merchant.
+        
+        Args:
+            year: Year to sync
+            month: Month to sync
+            results: Sync results to record failures in
+        
+        Returns:
+            Volume rows, or None if the merchant list could not be fetched
+        """
+        # Get all merchants first, from this run or the database when possible
+        merchant_ids = self._known_merchant_ids()
+        if not merchant_ids:
             merchants_result = self._execute_with_resilience(
                 self.irelandpay_client.get_merchants,
                 page=1,
-                per_page=1000  # Get all merchants for volume sync
+                per_page=IrelandPayCRMClient.MAX_PER_PAGE  # Get all merchants for volume sync
             )
             
             if not merchants_result.get("success", True):
-                results["errors"].append(f"Failed to fetch merchants for volume sync: {merchants_result.get('error')}")
-                return results
-            
-            merchants_data = merchants_result.get("data", [])
+                self._record_error(results, f"Failed to fetch merchants for volume sync: {merchants_result.get('error')}")
+                return None
             
-            # Calculate date range for the month
-            start_date = f"{year}-{month:02d}-01"
-            if month == 12:
-                end_date = f"{year + 1}-01-01"
-            else:
-                end_date = f"{year}-{month + 1:02d}-01"
+            merchant_ids = [merchant["mid"] for merchant in merchants_result.get("data", []) if merchant.get("mid")]
+        
+        # Calculate date range for the month
+        start_date, end_date = self._month_date_range(year, month)
+        synced_at = datetime.now().isoformat()
+        deadline = _sync_deadline.get()
+        
+        def fetch_transactions(merchant_id: str) -> Dict:
+            with _api_bulkhead:
+                return self._execute_with_resilience(
+                    self.irelandpay_client.get_merchant_transactions,
+                    merchant_number=merchant_id,
+                    deadline=deadline,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+        
+        # Fetch each merchant's transactions for the month concurrently
+        rows = []
+        with ThreadPoolExecutor(max_workers=SYNC_CONCURRENCY, thread_name_prefix="volumes-sync") as pool:
+            futures = {pool.submit(fetch_transactions, merchant_id): merchant_id for merchant_id in merchant_ids}
             
-            # Process each merchant's transaction volume
-            for merchant in merchants_data:
+            for future in as_completed(futures):
+                merchant_id = futures[future]
                 try:
-                    merchant_id = merchant.get("mid")
-                    if not merchant_id:
-                        continue
-                    
-                    # Get merchant transactions for the month
-                    transactions_result = self._execute_with_resilience(
-                        self.irelandpay_client.get_merchant_transactions,
-                        merchant_number=merchant_id,
-                        start_date=start_date,
-                        end_date=end_date
-                    )
+                    transactions_result = future.result()
                     
                     if not transactions_result.get("success", True):
                         results["volumes_failed"] += 1
-                        results["errors"].append(f"Failed to fetch transactions for merchant {merchant_id}: {transactions_result.get('error')}")
+                        self._record_error(results, f"Failed to fetch transactions for merchant {merchant_id}: {transactions_result.get('error')}")
                         continue
                     
-                    transactions_data = transactions_result.get("data", [])
-                    
-                    # Calculate total volume for the month
-                    total_volume = 0
-                    total_transactions = 0
-                    
-                    for transaction in transactions_data:
-                        volume = transaction.get("amount", 0)
-                        if volume:
-                            total_volume += float(volume)
-                            total_transactions += 1
-                    
-                    # Transform volume data to match our schema
-                    transformed_volume = {
-                        "mid": merchant_id,
-                        "month": f"{year}-{month:02d}-01",
-                        "total_txns": total_transactions,
-                        "total_volume": total_volume,
-                        "source": "irelandpay_crm_api",
-                        "synced_at": datetime.now().isoformat()
-                    }
-                    
-                    # Upsert to database
-                    db_result = self._execute_with_resilience(
-                        self._upsert_volume,
-                        transformed_volume
-                    )
-                    
-                    if db_result.get("success", True):
-                        if db_result.get("action") == "inserted":
-                            results["volumes_added"] += 1
-                        else:
-                            results["volumes_updated"] += 1
-                    else:
-                        results["volumes_failed"] += 1
-                        results["errors"].append(f"Failed to upsert volume for merchant {merchant_id}: {db_result.get('error')}")
-                    
-                    results["total_volumes"] += 1
-                    
+                    # Calculate total volume for the month and transform to our schema
+                    rows.append(self._transform_volume_data(
+                        merchant_id, transactions_result.get("data", []), start_date, synced_at
+                    ))
+                
                 except Exception as e:
                     results["volumes_failed"] += 1
-                    results["errors"].append(f"Error processing volume for merchant {merchant.get('mid', 'unknown')}: {str(e)}")
-                    logger.error(f"Error processing volume: {e}")
+                    self._record_error(results, f"Error processing volume for merchant {merchant_id}: {str(e)}")
+                    logger.error("Error processing volume: %s", e)
+        
+        return rows
+    
+    @_with_sync_deadline
+    async def sync_volumes_async(self, year: int, month: int,
+                                 concurrency: int = SYNC_CONCURRENCY,
+                                 client: Optional[AsyncIrelandPayCRMClient] = None) -> Dict[str, Any]:
+        """Sync transaction volumes without blocking the event loop.
+        
+        Like sync_volumes, monthly totals are read from the residuals summary
+        first; months without residuals rows are aggregated from each merchant's
+        transactions, with up to `concurrency` requests in flight through an
+        AsyncIrelandPayCRMClient. The batched database upserts run in a worker thread so the blocking
+        Supabase client never stalls the event loop.
+        
+        Args:
+            year: Year to sync
+            month: Month to sync
+            concurrency: Maximum number of concurrent transaction fetches
+            client: Optional client to share with other concurrent syncs
             
+        Returns:
+            Dictionary containing sync results and statistics
+        """
+        logger.info("Starting async volumes sync for %s-%02d from Ireland Pay CRM", year, month)
+        
+        results = {
+            "year": year,
+            "month": month,
+            "total_volumes": 0,
+            "volumes_upserted": 0,
+            "volumes_failed": 0,
+            "errors": [],
+            "errors_dropped": 0,
+            "start_time": datetime.now().isoformat(),
+            "end_time": None
+        }
+        
+        try:
+            async with self._async_client(client, max_connections=concurrency) as client:
+                # Monthly totals come pre-aggregated from the residuals report
+                summary_result = await self._execute_async_with_resilience(
+                    client.get_volumes_summary,
+                    year=year,
+                    month=month
+                )
+                
+                if not summary_result.get("success", True):
+                    self._record_error(results, f"Failed to fetch volumes summary: {summary_result.get('error')}")
+                    return results
+                
+                rows = self._transform_volume_summary(summary_result.get("data", []), year, month)
+                
+                # Residuals aren't loaded until the month closes, so sum transactions instead
+                if not rows:
+                    logger.info("No residuals rows for %s-%02d, aggregating merchant transactions", year, month)
+                    rows = await self._collect_transaction_volumes_async(client, year, month, concurrency, results)
+                    if rows is None:
+                        return results
+                
+                await asyncio.to_thread(
+                    self._store_rows, self._upsert_volumes, rows, results, "volumes", "volume for merchant"
+                )
+        
             results["end_time"] = datetime.now().isoformat()
-            logger.info(f"Volumes sync completed: {results['volumes_added']} added, {results['volumes_updated']} updated, {results['volumes_failed']} failed")
+            logger.info("Async volumes sync completed: %s upserted, %s failed", results['volumes_upserted'], results['volumes_failed'])
             
         except Exception as e:
-            results["errors"].append(f"Sync failed: {str(e)}")
-            logger.error(f"Volumes sync failed: {e}")
+            self._record_error(results, f"Sync failed: {str(e)}")
+            logger.error("Async volumes sync failed: %s", e)
         
         return results
     
-    def _transform_merchant_data(self, merchant: Dict) -> Dict:
-        """Transform merchant data from Ireland Pay CRM format to our database schema.
+    async def _collect_transaction_volumes_async(self, client: AsyncIrelandPayCRMClient, year: int, month: int,
+                                                 concurrency: int, results: Dict[str, Any]) -> Optional[List[Dict]]:
+        """Build monthly volume rows from each merchant's transactions, concurrently.
+        
+        Async counterpart of _collect_transaction_volumes.
+        
+        Args:
+            client: Client to fetch transactions through
+            year: Year to sync
+            month: Month to sync
+            concurrency: Maximum number of concurrent transaction fetches
+            results: Sync results to record failures in
+        
+        Returns:
+            Volume rows, or None if the merchant list could not be fetched
+        """
+        merchant_ids = await asyncio.to_thread(self._known_merchant_ids)
+        if not merchant_ids:
+            merchants_result = await self._execute_async_with_resilience(
+                client.get_merchants,
+                page=1,
+                per_page=IrelandPayCRMClient.MAX_PER_PAGE  # Get all merchants for volume sync
+            )
+            
+            if not merchants_result.get("success", True):
+                self._record_error(results, f"Failed to fetch merchants for volume sync: {merchants_result.get('error')}")
+                return None
+            
+            merchant_ids = [m["mid"] for m in merchants_result.get("data", []) if m.get("mid")]
+        
+        start_date, end_date = self._month_date_range(year, month)
+        synced_at = datetime.now().isoformat()
+        semaphore = asyncio.Semaphore(concurrency)
+        rows = []
+        
+        async def worker(merchant_id: str) -> None:
+            async with semaphore:
+                transactions_result = await self._execute_async_with_resilience(
+                    client.get_merchant_transactions,
+                    merchant_number=merchant_id,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+            
+            if not transactions_result.get("success", True):
+                results["volumes_failed"] += 1
+                self._record_error(results, f"Failed to fetch transactions for merchant {merchant_id}: {transactions_result.get('error')}")
+                return
+            
+            rows.append(self._transform_volume_data(
+                merchant_id, transactions_result.get("data", []), start_date, synced_at
+            ))
+        
+        outcomes = await asyncio.gather(
+            *(worker(merchant_id) for merchant_id in merchant_ids),
+            return_exceptions=True
+        )
+        
+        for merchant_id, outcome in zip(merchant_ids, outcomes):
+            if isinstance(outcome, Exception):
+                results["volumes_failed"] += 1
+                self._record_error(results, f"Error processing volume for merchant {merchant_id}: {str(outcome)}")
+                logger.error("Error processing volume: %s", outcome)
+        
+        return rows
+    
+    async def sync_range(self, start_year: int, start_month: int, end_year: int, end_month: int,
+                         concurrency: int = SYNC_CONCURRENCY, month_concurrency: int = 4) -> Dict[str, Any]:
+        """Sync residuals and volumes for every month in a range concurrently.
+        
+        Each month's residuals and volumes syncs run side by side, and up to
+        `month_concurrency` months are in progress at once. All of them share one
+        AsyncIrelandPayCRMClient, whose connection limit bounds the API calls in
+        flight, and the same circuit breaker and retry policy.
         
         Args:
-            merchant: Raw merchant data from Ireland Pay CRM API
+            start_year: Year of the first month
+            start_month: First month
+            end_year: Year of the last month
+            end_month: Last month (inclusive)
+            concurrency: Maximum number of concurrent API requests
+            month_concurrency: Maximum number of months synced at once
             
         Returns:
-            Transformed merchant data
+            Dictionary with the residuals and volumes results of each month, in order
         """
+        months = []
+        year, month = start_year, start_month
+        while (year, month) <= (end_year, end_month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        logger.info("Starting range sync of %s months from Ireland Pay CRM", len(months))
+        start_time = datetime.now().isoformat()
+        month_slots = asyncio.Semaphore(month_concurrency)
+        
+        async with self._async_client(max_connections=concurrency) as client:
+            async def sync_month(year: int, month: int) -> Dict[str, Any]:
+                async with month_slots:
+                    residuals, volumes = await asyncio.gather(
+                        self.sync_residuals_async(year, month, client=client),
+                        self.sync_volumes_async(year, month, concurrency=concurrency, client=client)
+                    )
+                return {"year": year, "month": month, "residuals": residuals, "volumes": volumes}
+            
+            month_results = await asyncio.gather(*(sync_month(year, month) for year, month in months))
+        
+        errors = [error for result in month_results
+                  for error in result["residuals"]["errors"] + result["volumes"]["errors"]]
+        errors_dropped = sum(result["residuals"]["errors_dropped"] + result["volumes"]["errors_dropped"]
+                             for result in month_results)
+        logger.info("Range sync completed: %s months, %s errors", len(months), len(errors) + errors_dropped)
         return {
-            "mid": merchant.get("mid"),
-            "datasource": merchant.get("datasource", "irelandpay_crm"),
-            "merchant_dba": merchant.get("name"),
-            "opened": merchant.get("opened"),
-            "closed": merchant.get("closed"),
-            "status": merchant.get("status"),
-            "active": merchant.get("active"),
-            "group": merchant.get("group"),
-            "processor": merchant.get("processor"),
-            "sic_code": merchant.get("sic_code"),
-            "vim": merchant.get("vim"),
-            "created": merchant.get("created"),
-            "modified": merchant.get("modified"),
-            "synced_at": datetime.now().isoformat()
+            "months": month_results,
+            "errors": errors,
+            "errors_dropped": errors_dropped,
+            "start_time": start_time,
+            "end_time": datetime.now().isoformat()
         }
     
-    def _transform_residual_data(self, merchant_id: str, residual_info: Dict, year: int, month: int) -> Dict:
-        """Transform residual data from Ireland Pay CRM format to our database schema.
+    @contextlib.asynccontextmanager
+    async def _async_client(self, client: Optional[AsyncIrelandPayCRMClient] = None,
+                            max_connections: int = SYNC_CONCURRENCY):
+        """Yield `client`, or a new AsyncIrelandPayCRMClient that is closed on exit.
+        
+        Args:
+            client: Client shared by the caller, if any
+            max_connections: Connection limit for a new client
+        """
+        if client is not None:
+            yield client
+            return
+        
+        async with AsyncIrelandPayCRMClient(
+            self.irelandpay_client.api_key, timeout=(5, TIMEOUT_SECONDS),
+            max_connections=max_connections
+        ) as client:
+            yield client
+    
+    @staticmethod
+    def _record_error(results: Dict[str, Any], message: str) -> None:
+        """Add an error message to sync results, up to MAX_RESULT_ERRORS.
+        
+        Messages past the cap are logged and counted in "errors_dropped".
+        
+        Args:
+            results: Sync results to record the error in
+            message: Error message
+        """
+        if len(results["errors"]) < MAX_RESULT_ERRORS:
+            results["errors"].append(message)
+        else:
+            results["errors_dropped"] += 1
+            logger.warning("Sync error not kept in results: %s", message)
+    
+    @staticmethod
+    def _month_date_range(year: int, month: int) -> tuple:
+        """Return the (start_date, end_date) strings bounding a month, end exclusive."""
+        start_date = f"{year}-{month:02d}-01"
+        if month == 12:
+            end_date = f"{year + 1}-01-01"
+        else:
+            end_date = f"{year}-{month + 1:02d}-01"
+        return start_date, end_date
+    
+    def _transform_volume_data(self, merchant_id: str, transactions: List[Dict],
+                               month_start: str, synced_at: str) -> Dict:
+        """Aggregate a merchant's transactions into a monthly volume record.
         
         Args:
             merchant_id: Merchant ID
-            residual_info: Raw residual data from Ireland Pay CRM API
+            transactions: Raw transactions from Ireland Pay CRM API
+            month_start: First day of the month, as YYYY-MM-01
+            synced_at: Sync timestamp shared by every row of the run
+            
+        Returns:
+            Transformed volume data
+        """
+        # Transactions without an amount are not counted
+        amounts = [float(amount) for transaction in transactions if (amount := transaction.get("amount", 0))]
+        total_volume = sum(amounts)
+        total_transactions = len(amounts)
+        
+        return {
+            "mid": merchant_id,
+            "month": month_start,
+            "total_txns": total_transactions,
+            "total_volume": total_volume,
+            "source": "irelandpay_crm_api",
+            "synced_at": synced_at
+        }
+    
+    def _transform_volume_summary(self, merchant_rows: List[Dict], year: int, month: int) -> List[Dict]:
+        """Turn residuals summary rows into monthly volume records.
+        
+        A merchant settled through several processors has one row per processor;
+        those rows are added together.
+        
+        Args:
+            merchant_rows: Merchant rows from get_volumes_summary
             year: Year
             month: Month
+        
+        Returns:
+            Transformed volume data, one record per merchant
+        """
+        frame = pd.DataFrame(merchant_rows, columns=["mid", "transactions", "sales_amount"], dtype=object)
+        frame = frame[frame["mid"].notna()]
+        if frame.empty:
+            return []
+        
+        volumes = (
+            frame.assign(
+                mid=frame["mid"].map(str),
+                total_txns=pd.to_numeric(frame["transactions"]).fillna(0).astype("int64"),
+                total_volume=pd.to_numeric(frame["sales_amount"]).fillna(0).astype("float64")
+            )
+            .groupby("mid", sort=False)[["total_txns", "total_volume"]]
+            .sum()
+            .reset_index()
+        )
+        volumes.insert(1, "month", f"{year}-{month:02d}-01")
+        volumes["source"] = "irelandpay_crm_api"
+        volumes["synced_at"] = datetime.now().isoformat()
+        return volumes.to_dict("records")
+    
+    def _transform_merchant_page(self, merchants: List[Dict], synced_at: str) -> List[Dict]:
+        """Transform a page of merchants from Ireland Pay CRM format to our database schema.
+        
+        The page is converted as one DataFrame, so the column selection and
+        renaming run once per page instead of once per merchant. Values keep
+        their JSON types; missing fields become None.
+        
+        Args:
+            merchants: Raw merchant data from Ireland Pay CRM API
+            synced_at: Sync timestamp shared by every row of the run
+            
+        Returns:
+            Transformed merchant data
+        """
+        frame = pd.DataFrame(merchants, columns=list(MERCHANT_FIELDS.values()), dtype=object)
+        frame.columns = list(MERCHANT_FIELDS)
+        frame["datasource"] = frame["datasource"].fillna("irelandpay_crm")
+        frame = frame.where(frame.notna(), None)
+        frame["synced_at"] = synced_at
+        return frame.to_dict("records")
+    
+    def _unique_merchant_rows(self, rows: List[Dict], results: Dict[str, Any]) -> List[Dict]:
+        """Drop the merchant rows that would fail a whole batch upsert.
+        
+        Rows without a mid are dropped, and only the last row of a merchant
+        listed more than once is kept, since Postgres can't update the same row
+        twice in one INSERT ... ON CONFLICT. Each dropped row is recorded as a
+        failed merchant.
+        
+        Args:
+            rows: Transformed merchant rows
+            results: Sync results to record the dropped rows in
+            
+        Returns:
+            Rows with a unique mid, each at the position of its last copy
+        """
+        unique = {}
+        dropped = []
+        for row in rows:
+            mid = row.get("mid")
+            if mid is None or mid == "":
+                dropped.append(f"Merchant without a mid skipped: {row.get('merchant_dba') or 'unknown'}")
+                continue
+            if unique.pop(str(mid), None) is not None:
+                dropped.append(f"Merchant {mid} listed more than once, only the last copy was synced")
+            unique[str(mid)] = row
+        
+        results["total_merchants"] += len(dropped)
+        results["merchants_failed"] += len(dropped)
+        for error in dropped:
+            self._record_error(results, error)
+        return list(unique.values())
+    
+    def _transform_residual_data(self, merchant_id: str, residual_info: Dict,
+                                 payout_month: str, synced_at: str) -> Dict:
+        """Transform residual data from Ireland Pay CRM format to our database schema.
+        
+        Args:
+            merchant_id: Merchant ID
+            residual_info: Raw residual data from Ireland Pay CRM API
+            payout_month: First day of the payout month, as YYYY-MM-01
+            synced_at: Sync timestamp shared by every row of the run
             
         Returns:
             Transformed residual data
@@ -610,7 +1516,7 @@ class IrelandPayCRMSyncManager:
         return {
             "mid": merchant_id,
             "merchant_dba": residual_info.get("merchant_name"),
-            "payout_month": f"{year}-{month:02d}-01",
+            "payout_month": payout_month,
             "transactions": residual_info.get("transactions", 0),
             "sales_amount": residual_info.get("sales_amount", 0),
             "income": residual_info.get("income", 0),
@@ -620,83 +1526,248 @@ class IrelandPayCRMSyncManager:
             "commission_pct": residual_info.get("commission_pct", 0),
             "agent_net": residual_info.get("agent_net", 0),
             "source": "irelandpay_crm_api",
-            "synced_at": datetime.now().isoformat()
+            "synced_at": synced_at
         }
     
-    def _upsert_merchant(self, merchant_data: Dict) -> Dict:
-        """Upsert merchant data to the database.
+    def _residual_rows(self, residuals_data: Dict[str, Dict], year: int, month: int,
+                       results: Dict[str, Any]) -> List[Dict]:
+        """Transform a residuals summary into rows, recording any that fail.
         
         Args:
-            merchant_data: Merchant data to upsert
-            
+            residuals_data: Residual info keyed by merchant ID
+            year: Year
+            month: Month
+            results: Sync results to record failures in
+        
+        Returns:
+            Transformed residual rows
+        """
+        payout_month = f"{year}-{month:02d}-01"
+        synced_at = datetime.now().isoformat()
+        rows = []
+        for merchant_id, residual_info in residuals_data.items():
+            try:
+                rows.append(self._transform_residual_data(
+                    merchant_id, residual_info, payout_month, synced_at
+                ))
+            except Exception as e:
+                results["residuals_failed"] += 1
+                self._record_error(results, f"Error processing residual for merchant {merchant_id}: {str(e)}")
+                logger.error("Error processing residual: %s", e)
+        return rows
+    
+    def _known_merchant_ids(self) -> Optional[List[str]]:
+        """Return every merchant ID without calling the CRM API.
+        
+        Uses the IDs seen by a full merchants sync earlier in this run, or else
+        pages through the mid column of the merchants table.
+        
         Returns:
-            Dictionary with success status and action taken
+            Merchant IDs, or None if they aren't known and can't be read
         """
+        if self._merchant_mids is not None:
+            return self._merchant_mids
+        
+        mids = []
+        offset = 0
+        page_size = IrelandPayCRMClient.MAX_PER_PAGE
         try:
-            # Check if merchant exists
-            existing = self.supabase.table("merchants").select("*").eq("mid", merchant_data["mid"]).execute()
-            
-            if existing.data:
-                # Update existing merchant
-                result = self.supabase.table("merchants").update(merchant_data).eq("mid", merchant_data["mid"]).execute()
-                return {"success": True, "action": "updated"}
-            else:
-                # Insert new merchant
-                result = self.supabase.table("merchants").insert(merchant_data).execute()
-                return {"success": True, "action": "inserted"}
-                
+            while True:
+                response = (self.supabase.table("merchants").select("mid").order("mid")
+                            .range(offset, offset + page_size - 1).execute())
+                mids.extend(row["mid"] for row in response.data if row.get("mid"))
+                if len(response.data) < page_size:
+                    break
+                offset += page_size
         except Exception as e:
-            logger.error(f"Database error upserting merchant: {e}")
-            return {"success": False, "error": str(e)}
+            logger.warning("Could not read merchant IDs from the database: %s", e)
+            return None
+        
+        return mids or None
     
-    def _upsert_residual(self, residual_data: Dict) -> Dict:
-        """Upsert residual data to the database.
+    def _get_sync_cursor(self, entity: str) -> Optional[str]:
+        """Read the last synced `modified` timestamp for an entity.
         
         Args:
-            residual_data: Residual data to upsert
-            
+            entity: Cursor name, e.g. "merchants"
+        
         Returns:
-            Dictionary with success status and action taken
+            ISO 8601 timestamp, or None if there is no cursor or it can't be read
         """
         try:
-            # Check if residual exists
-            existing = self.supabase.table("residual_payouts").select("*").eq("mid", residual_data["mid"]).eq("payout_month", residual_data["payout_month"]).execute()
-            
-            if existing.data:
-                # Update existing residual
-                result = self.supabase.table("residual_payouts").update(residual_data).eq("mid", residual_data["mid"]).eq("payout_month", residual_data["payout_month"]).execute()
-                return {"success": True, "action": "updated"}
-            else:
-                # Insert new residual
-                result = self.supabase.table("residual_payouts").insert(residual_data).execute()
-                return {"success": True, "action": "inserted"}
-                
+            response = self.supabase.table("sync_cursors").select("last_modified").eq("entity", entity).execute()
+        except Exception as e:
+            logger.warning("Could not read %s sync cursor, running a full sync: %s", entity, e)
+            return None
+        
+        return response.data[0]["last_modified"] if response.data else None
+    
+    def _set_sync_cursor(self, entity: str, last_modified: str) -> None:
+        """Store the newest synced `modified` timestamp for an entity.
+        
+        Failures are logged and ignored; the next sync then re-fetches from the
+        previous cursor.
+        
+        Args:
+            entity: Cursor name, e.g. "merchants"
+            last_modified: ISO 8601 timestamp
+        """
+        try:
+            self.supabase.table("sync_cursors").upsert(
+                {"entity": entity, "last_modified": last_modified, "updated_at": datetime.now(timezone.utc).isoformat()},
+                on_conflict="entity", returning="minimal"
+            ).execute()
         except Exception as e:
-            logger.error(f"Database error upserting residual: {e}")
-            return {"success": False, "error": str(e)}
+            logger.warning("Could not update %s sync cursor: %s", entity, e)
     
-    def _upsert_volume(self, volume_data: Dict) -> Dict:
-        """Upsert volume data to the database.
+    def _store_rows(self, upsert_func: Callable[[List[Dict]], Dict], rows: List[Dict],
+                    results: Dict[str, Any], kind: str, label: str,
+                    batch_size: int = UPSERT_BATCH_SIZE) -> None:
+        """Upsert rows in batches and tally the outcome.
+        
+        Up to WRITE_CONCURRENCY batches are in flight at once; outcomes are
+        tallied in batch order.
         
         Args:
-            volume_data: Volume data to upsert
+            upsert_func: One of the _upsert_* batch helpers
+            rows: Transformed rows to write
+            results: Sync results to update ("total_<kind>", "<kind>_upserted",
+                "<kind>_failed" and "errors")
+            kind: Results key stem, e.g. "merchants"
+            label: Row description used in error messages, e.g. "merchant"
+            batch_size: Maximum rows per upsert_func call
+        """
+        batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+        if len(batches) > 1 and WRITE_CONCURRENCY > 1:
+            with ThreadPoolExecutor(max_workers=min(WRITE_CONCURRENCY, len(batches)),
+                                    thread_name_prefix="db-write") as writer:
+                write = functools.partial(self._execute_with_resilience, upsert_func, deadline=_sync_deadline.get())
+                db_results = list(writer.map(write, batches))
+        else:
+            db_results = [self._execute_with_resilience(upsert_func, batch) for batch in batches]
+        
+        for batch, db_result in zip(batches, db_results):
+            results[f"total_{kind}"] += len(batch)
+            if not db_result.get("success", True):
+                # Rejected as a whole, so one error covers the batch
+                results[f"{kind}_failed"] += len(batch)
+                self._record_error(results, f"Failed to upsert a batch of {len(batch)} {kind}: {db_result.get('error')}")
+                continue
             
+            failed = db_result["failed"]
+            results[f"{kind}_upserted"] += len(batch) - len(failed)
+            results[f"{kind}_failed"] += len(failed)
+            for row, error in failed:
+                self._record_error(results, f"Failed to upsert {label} {row.get('mid')}: {error}")
+    
+    def _upsert_batch(self, table: str, rows: List[Dict], on_conflict: str,
+                      ingest_rpc: Optional[str] = None) -> Dict:
+        """Upsert rows with a single request, isolating any rows that fail.
+        
+        The rows go out as one PostgREST upsert (INSERT ... ON CONFLICT DO UPDATE).
+        If the database rejects the data of a row, the batch is split in half and
+        each half is retried, so a bad row costs a few extra requests instead of
+        failing every other row with it. Any other database error (e.g. a missing
+        column or unique index) fails the whole batch at once, and transient
+        failures are raised for _execute_with_resilience to retry the batch.
+        
+        Args:
+            table: Table to write to
+            rows: Rows to upsert
+            on_conflict: Comma-separated unique columns identifying a row
+            ingest_rpc: Optional database function taking the rows as one jsonb
+                argument and merging them itself; used instead of the PostgREST
+                upsert while the database provides it
+        
         Returns:
-            Dictionary with success status and action taken
+            Dictionary with success status and a list of (row, error) pairs for
+            the rows that could not be written, or with success False and the
+            error when the batch was rejected as a whole
+        
+        Raises:
+            RetryableError: If the request failed in transit or the database
+                reported a transient error
         """
+        if not rows:
+            return {"success": True, "failed": []}
+        
+        use_rpc = ingest_rpc is not None and ingest_rpc not in self.missing_ingest_rpcs
         try:
-            # Check if volume exists
-            existing = self.supabase.table("merchant_metrics").select("*").eq("mid", volume_data["mid"]).eq("month", volume_data["month"]).execute()
-            
-            if existing.data:
-                # Update existing volume
-                result = self.supabase.table("merchant_metrics").update(volume_data).eq("mid", volume_data["mid"]).eq("month", volume_data["month"]).execute()
-                return {"success": True, "action": "updated"}
+            if use_rpc:
+                self.supabase.rpc(ingest_rpc, {"rows": rows}).execute()
             else:
-                # Insert new volume
-                result = self.supabase.table("merchant_metrics").insert(volume_data).execute()
-                return {"success": True, "action": "inserted"}
-                
-        except Exception as e:
-            logger.error(f"Database error upserting volume: {e}")
-            return {"success": False, "error": str(e)} 
\ No newline at end of file
+                self.supabase.table(table).upsert(
+                    rows, on_conflict=on_conflict, returning="minimal"
+                ).execute()
+            return {"success": True, "failed": []}
+        
+        except httpx.TransportError as e:
+            raise RetryableError(f"Database request to {table} failed: {e}") from e
+        except APIError as e:
+            if use_rpc and e.code in INGEST_RPC_UNUSABLE_CODES:
+                # The function doesn't exist (migration not applied yet) or is out of date
+                if ingest_rpc not in self.missing_ingest_rpcs:
+                    self.missing_ingest_rpcs.add(ingest_rpc)
+                    logger.warning("%s is unusable (%s), falling back to PostgREST upserts", ingest_rpc, e.code)
+                return self._upsert_batch(table, rows, on_conflict)
+            if (e.code or "").startswith(TRANSIENT_DB_ERROR_CODES):
+                raise RetryableError(f"Transient database error on {table}: {e.message}") from e
+            if not (e.code or "").startswith(ROW_DB_ERROR_CODES):
+                # No row can fix a schema error, so don't bisect down to every single row
+                logger.error("Database error upserting %s rows into %s: %s", len(rows), table, e)
+                return {"success": False, "error": str(e)}
+            
+            if len(rows) == 1:
+                logger.error("Database error upserting into %s: %s", table, e)
+                return {"success": True, "failed": [(rows[0], str(e))]}
+            
+            middle = len(rows) // 2
+            failed = []
+            for half in (rows[:middle], rows[middle:]):
+                result = self._upsert_batch(table, half, on_conflict, ingest_rpc)
+                if result["success"]:
+                    failed.extend(result["failed"])
+                else:
+                    failed.extend((row, result["error"]) for row in half)
+            return {"success": True, "failed": failed}
+    
+    def _upsert_merchants(self, merchants: List[Dict]) -> Dict:
+        """Upsert a batch of merchants to the database.
+        
+        Uses the ingest_merchants database function when it is installed.
+        
+        Args:
+            merchants: Merchant rows to upsert
+        
+        Returns:
+            Dictionary with success status and the rows that failed
+        """
+        return self._upsert_batch("merchants", merchants, "mid", ingest_rpc="ingest_merchants")
+    
+    def _upsert_residuals(self, residuals: List[Dict]) -> Dict:
+        """Upsert a batch of residuals to the database.
+        
+        Uses the ingest_residual_payouts database function when it is installed.
+        
+        Args:
+            residuals: Residual rows to upsert
+        
+        Returns:
+            Dictionary with success status and the rows that failed
+        """
+        return self._upsert_batch("residual_payouts", residuals, "mid,payout_month",
+                                  ingest_rpc="ingest_residual_payouts")
+    
+    def _upsert_volumes(self, volumes: List[Dict]) -> Dict:
+        """Upsert a batch of volumes to the database.
+        
+        Uses the ingest_merchant_metrics database function when it is installed.
+        
+        Args:
+            volumes: Volume rows to upsert
+        
+        Returns:
+            Dictionary with success status and the rows that failed
+        """
+        return self._upsert_batch("merchant_metrics", volumes, "mid,month",
+                                  ingest_rpc="ingest_merchant_metrics") 
\ No newline at end of file
@@ -2,5 +2,7 @@
 IRIS CRM API Client Package
 """
 from .client import IrelandPayCRMClient
+from .circuit_breaker import CircuitBreaker, CircuitBreakerError
+from .rate_limiter import AsyncTokenBucket
 
-__all__ = ["IrelandPayCRMClient"]
+__all__ = ["IrelandPayCRMClient", "AsyncTokenBucket", "CircuitBreaker", "CircuitBreakerError"]
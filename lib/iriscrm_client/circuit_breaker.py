@@ -0,0 +1,93 @@
+"""
+Circuit breaker that fails IRIS CRM requests fast during an outage.
+"""
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger("iriscrm_client")
+
+
+class CircuitBreakerError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for API requests.
+    
+    After `fail_max` consecutive failures the circuit opens and requests fail
+    immediately with CircuitBreakerError. Once `reset_timeout` seconds have
+    passed, one request is let through as a probe: success closes the circuit,
+    failure reopens it for another timeout. If the probe never reports back,
+    another one is let through after a further timeout.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    
+    def __init__(self, fail_max: int = 10, reset_timeout: float = 60):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            fail_max: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+    
+    @property
+    def current_state(self) -> str:
+        """The breaker state: "closed", "open" or "half-open"."""
+        return self._state
+    
+    def before_call(self) -> None:
+        """
+        Check that a request may be sent.
+        
+        Raises:
+            CircuitBreakerError: If the circuit is open, or a probe is already in flight
+        """
+        # Common case: a closed circuit is read without taking the lock
+        if self._state == self.CLOSED:
+            return
+        
+        with self._lock:
+            # A half-open probe that never reported back is replaced after another timeout
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                logger.info("Circuit breaker half-open, probing the API")
+                self._state = self.HALF_OPEN
+                self._opened_at = now
+                return
+            if self._state != self.CLOSED:
+                raise CircuitBreakerError("Circuit breaker is open - IRIS CRM API temporarily unavailable")
+    
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        if self._state == self.CLOSED and not self._failures:
+            return
+        
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                logger.info("Circuit breaker closed after successful probe")
+            self._state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit once `fail_max` is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.fail_max:
+                if self._state != self.OPEN:
+                    logger.warning("Circuit breaker opened after %s failures", self._failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
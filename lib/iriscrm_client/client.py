@@ -2,46 +2,395 @@
 IRIS CRM API Client
 A custom client for interacting with the IRIS CRM API.
 """
-import os
 import json
+import string
+import time
+import asyncio
+import sqlite3
+import threading
 import requests
 import logging
+import httpx
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+import urllib3
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Union
 
+from .circuit_breaker import CircuitBreaker, CircuitBreakerError
+from .models import MERCHANT_ROWS_DECODER
+from .rate_limiter import AsyncTokenBucket
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _retry_jitter(jitter: float) -> Dict[str, float]:
+    """Retry keyword arguments adding backoff jitter where urllib3 supports it (2.0+)."""
+    if int(urllib3.__version__.split(".")[0]) >= 2:
+        return {"backoff_jitter": jitter}
+    return {}
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _is_empty(response: Union[requests.Response, httpx.Response]) -> bool:
+    """Whether a response has no body, judged from its headers where possible."""
+    if response.status_code == 204 or response.headers.get("Content-Length") == "0":
+        return True
+    return not response.content
+
+
+class _ResponseCache:
+    """SQLite-backed store of GET response bodies with their ETag and freshness."""
+    
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, etag TEXT, body BLOB NOT NULL, fresh_until REAL NOT NULL)"
+            )
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (etag, body, fresh_until) for key, or None if not stored."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, body, fresh_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+    
+    def set(self, key: str, etag: Optional[str], body: bytes, fresh_until: float) -> None:
+        """Store a response body, replacing any earlier entry for key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, fresh_until) VALUES (?, ?, ?, ?)",
+                (key, etag, body, fresh_until)
+            )
+
+
+# Simple GET endpoints whose only parameters are path parameters:
+# (method name, path template, docstring summary, return description)
+_ENDPOINTS = (
+    # Merchant API endpoints
+    ("get_merchant", "/merchants/{merchant_number}",
+     "Get detailed information about a specific merchant.", "Merchant details"),
+    ("get_merchant_deposits", "/merchants/{merchant_number}/deposits/{year}/{month}/{day}",
+     "Get deposit data for a merchant on a specific date.", "Deposit data"),
+    ("get_merchant_statements", "/merchants/{merchant_number}/statements",
+     "Get statements for a merchant.", "List of statements"),
+    ("get_statement", "/merchants/{merchant_number}/statements/{statement_id}",
+     "Get a specific statement for a merchant.", "Statement details"),
+    
+    # Residuals API endpoints
+    ("get_residuals_summary", "/residuals/reports/summary/{year}/{month}",
+     "Get residuals summary data.", "Residuals summary data"),
+    ("get_residuals_summary_rows", "/residuals/reports/summary/rows/{processor_id}/{year}/{month}",
+     "Get residuals summary with merchant rows.", "Residuals summary with merchant rows"),
+    ("get_residuals_details", "/residuals/reports/details/{processor_id}/{year}/{month}",
+     "Get detailed residuals data.", "Detailed residuals data"),
+    ("get_residuals_lineitems", "/residuals/lineitems/{year}/{month}",
+     "Get residuals line items.", "Residuals line items"),
+    ("get_residuals_templates", "/residuals/templates/",
+     "Get residuals templates.", "Residuals templates"),
+    ("get_residuals_templates_assigned", "/residuals/templates/assigned/{year}/{month}",
+     "Get users with assigned residuals templates.", "Users with assigned residuals templates"),
+)
+
+_INT_ARGS = frozenset({"year", "month", "day"})
+
+_ARG_DOCS = {
+    "merchant_number": "The merchant ID",
+    "statement_id": "The statement ID",
+    "processor_id": "The processor ID",
+    "year": "Year (YYYY)",
+    "month": "Month (MM)",
+    "day": "Day (DD)",
+}
+
+
+def _build_endpoint(name: str, path: str, summary: str, returns: str) -> Callable:
+    """
+    Generate the client method for one _ENDPOINTS entry.
+    
+    The method is compiled from source so it has a real signature and calls
+    _make_request directly, with the path as an f-string over its parameters.
+    Monthly residuals endpoints also pass the closed-month cache freshness.
+    
+    Args:
+        name: Method name
+        path: Endpoint path template with {placeholders} for path parameters
+        summary: First line of the method docstring
+        returns: Description of the return value
+        
+    Returns:
+        The generated function
+    """
+    args = [field for _, field, _, _ in string.Formatter().parse(path) if field]
+    params = [f"{arg}: {'int' if arg in _INT_ARGS else 'str'}" for arg in args]
+    call = ["'GET'", f"f{path!r}" if args else repr(path)]
+    if path.startswith("/residuals/") and "year" in args and "month" in args:
+        call.append("max_age=self._residuals_max_age(year, month)")
+    
+    source = (
+        f"def {name}(self{''.join(', ' + param for param in params)}) -> Dict:\n"
+        f"    return self._make_request({', '.join(call)})\n"
+    )
+    namespace = {"Dict": Dict}
+    exec(source, namespace)
+    func = namespace[name]
+    
+    doc = [summary, ""]
+    if args:
+        doc += ["Args:"] + [f"    {arg}: {_ARG_DOCS[arg]}" for arg in args] + [""]
+    doc += ["Returns:", f"    {returns}"]
+    func.__doc__ = "\n".join(doc)
+    func.__module__ = __name__
+    return func
+
+
+def _declare_endpoints(cls: type) -> type:
+    """Class decorator attaching the generated _ENDPOINTS methods to the client."""
+    for spec in _ENDPOINTS:
+        func = _build_endpoint(*spec)
+        func.__qualname__ = f"{cls.__name__}.{func.__name__}"
+        setattr(cls, func.__name__, func)
+    return cls
+
+
+@_declare_endpoints
 class IrelandPayCRMClient:
     """
     Client for interacting with the IRIS CRM API.
     
     This client handles authentication and provides methods for all
     the endpoints we need to replace the Excel upload functionality.
+    Endpoints taking only path parameters are generated from _ENDPOINTS.
     """
     
     BASE_URL = "https://crm.ireland-pay.com/api/v1"
     
-    def __init__(self, api_key: str, base_url: Optional[str] = None):
+    # Keep-alive connection pool for synchronous requests
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 32
+    
+    # Transport-level retries for idempotent GETs, honouring Retry-After
+    RETRY_TOTAL = 5
+    RETRY_BACKOFF_FACTOR = 0.5
+    # Random extra delay of up to this many seconds per retry, so clients that
+    # failed together don't retry in lockstep (needs urllib3 2)
+    RETRY_BACKOFF_JITTER = 0.5
+    RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+    
+    # Connection limits for the async client, all of them kept alive
+    MAX_CONNECTIONS = 64
+    
+    # Async request timeout: 10 seconds overall, 5 seconds to connect
+    ASYNC_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+    
+    # Documented default API rate limit; X-RateLimit-Limit overrides it
+    RATE_LIMIT_PER_MINUTE = 500
+    
+    # Times an async request is re-sent after a 429, waiting out Retry-After
+    RATE_LIMIT_RETRIES = 3
+    
+    # Consecutive failed requests (connection errors or 5xx after retries)
+    # before requests fail fast, and seconds until the API is probed again
+    CIRCUIT_FAIL_MAX = 10
+    CIRCUIT_RESET_TIMEOUT = 60
+    
+    # Without orjson, async response bodies at least this large are decoded in a
+    # worker process so the event loop keeps other requests moving. orjson parses
+    # faster than the parent could unpickle the worker's result, so with it
+    # installed, and for smaller bodies, decoding stays inline
+    DECODE_OFFLOAD_BYTES = 1_000_000
+    DECODE_WORKERS = 2
+    
+    # Residuals of a closed month don't change, so cached copies are served
+    # without asking the API for this long
+    CLOSED_MONTH_MAX_AGE = 30 * 24 * 3600
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 cache_path: Optional[str] = None):
         """
         Initialize the IRIS CRM client.
         
         Args:
             api_key: The API key for authentication
             base_url: Optional custom base URL
+            transport: Optional custom httpx transport for the async client
+            cache_path: Optional SQLite file caching GET responses across runs;
+                cached bodies are revalidated with If-None-Match, so unchanged
+                data comes back as a bodiless 304
         """
         self.api_key = api_key
         if base_url:
             self.BASE_URL = base_url
         
         self.session = requests.Session()
-        self.session.headers.update({
+        # Built once and shared by both transports; to change the API key,
+        # create a new client rather than mutating these
+        self.headers = {
             "X-API-KEY": self.api_key,
             "Content-Type": "application/json",
             "Accept": "application/json"
+        }
+        self.session.headers.update(self.headers)
+        self.session.headers.update({
+            # Every encoding urllib3 can decode; br is included when brotli is installed
+            "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+            "Connection": "keep-alive"
         })
         
+        # One pooled adapter keeps sockets warm across calls instead of
+        # re-handshaking TLS, and retries failed GETs inside urllib3; the last
+        # failed response is still raised by raise_for_status
+        retry = Retry(
+            total=self.RETRY_TOTAL,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUS_FORCELIST,
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            **_retry_jitter(self.RETRY_BACKOFF_JITTER)
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         self.logger = logging.getLogger("iriscrm_client")
+        
+        self._cache = _ResponseCache(cache_path) if cache_path else None
+        
+        # Fails synchronous requests fast while the API is down; its state is
+        # available as breaker.current_state
+        self.breaker = CircuitBreaker(self.CIRCUIT_FAIL_MAX, self.CIRCUIT_RESET_TIMEOUT)
+        
+        # Created on first async request so sync-only callers never open it
+        self._transport = transport
+        self._aclient = None
+        self._decode_pool = None
+        
+        # Paces async requests below the API's rate limit
+        self.limiter = AsyncTokenBucket(rate=self.RATE_LIMIT_PER_MINUTE / 60)
+    
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        """
+        Pooled async HTTP client (HTTP/2 when h2 is installed).
+        
+        Concurrent requests are multiplexed over a few keep-alive connections.
+        Use it from a single event loop and call aclose() when done.
+        """
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.ASYNC_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_CONNECTIONS
+                ),
+                transport=self._transport
+            )
+        return self._aclient
+    
+    async def aclose(self) -> None:
+        """Close the async client's connections and decode workers, if opened."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
+    
+    async def _adecode(self, content: bytes) -> Any:
+        """
+        Parse an async response body, in a worker process when it is large and
+        orjson isn't installed.
+        
+        Args:
+            content: Response body
+            
+        Returns:
+            Parsed JSON
+        """
+        if orjson is not None or len(content) < self.DECODE_OFFLOAD_BYTES:
+            return _json_loads(content)
+        
+        if self._decode_pool is None:
+            self._decode_pool = ProcessPoolExecutor(max_workers=self.DECODE_WORKERS)
+        return await asyncio.get_running_loop().run_in_executor(self._decode_pool, _json_loads, content)
+    
+    async def _aget(self, endpoint: str, params: Dict = None) -> Dict:
+        """
+        Make a GET request to the IRIS CRM API without blocking the event loop.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Returns:
+            API response as a dict
+        """
+        try:
+            # The first attempt, then up to RATE_LIMIT_RETRIES re-sends after a 429
+            for _ in range(self.RATE_LIMIT_RETRIES + 1):
+                await self.limiter.acquire()
+                response = await self.aclient.get(endpoint, params=params)
+                self._observe_rate_limit(response)
+                if response.status_code != 429:
+                    break
+            response.raise_for_status()
+            
+            if _is_empty(response):
+                return {}
+            return await self._adecode(response.content)
+            
+        except httpx.HTTPError as e:
+            self.logger.error("API request failed: %s", e)
+            if isinstance(e, httpx.HTTPStatusError) and self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error("Response status: %s", e.response.status_code)
+                self.logger.error("Response body: %s", e.response.text)
+            
+            # Re-raise the exception for the caller to handle
+            raise
     
-    def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+    def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None,
+                      max_age: float = 0, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
         """
         Make a request to the IRIS CRM API.
         
@@ -50,35 +399,153 @@ class IrelandPayCRMClient:
             endpoint: API endpoint
             params: Query parameters
             data: Request body for POST/PUT/PATCH requests
+            max_age: Seconds a cached GET response is served without
+                revalidating it (only used with a response cache); a stale
+                copy is still served while the circuit breaker is open
+            decode: Optional parser for the response body, e.g. a typed msgspec
+                decoder (defaults to parsing generic JSON)
             
         Returns:
-            API response as a dict
+            API response as a dict, or as decoded by `decode`
         """
         url = f"{self.BASE_URL}{endpoint}"
+        decode = decode or _json_loads
+        
+        cache_key = None
+        cached = None
+        headers = None
+        if self._cache is not None and method == "GET":
+            cache_key = requests.Request("GET", url, params=params).prepare().url
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                etag, body, fresh_until = cached
+                if time.time() < fresh_until:
+                    return decode(body)
+                if etag:
+                    headers = {"If-None-Match": etag}
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data
-            )
+            try:
+                self.breaker.before_call()
+            except CircuitBreakerError:
+                # Soft circuit breaker: while the API is down, a stale copy beats an error
+                if cached is None:
+                    raise
+                self.logger.warning("Circuit open, serving stale cached response for %s", endpoint)
+                return decode(cached[1])
+            
+            try:
+                # The session already sends Content-Type: application/json
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    data=_json_dumps(data) if data is not None else None,
+                    headers=headers
+                )
+            except requests.exceptions.RequestException:
+                self.breaker.record_failure()
+                raise
+            
+            # Client errors still show the API is up
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            
+            if response.status_code == 304 and cached is not None:
+                self._cache.set(cache_key, cached[0], cached[1], time.time() + max_age)
+                return decode(cached[1])
             
             response.raise_for_status()
+            self.logger.debug("%s %s -> %s (Content-Encoding: %s)", method, endpoint,
+                              response.status_code, response.headers.get("Content-Encoding"))
+            
+            if _is_empty(response):
+                return {}
+            
+            etag = response.headers.get("ETag")
+            if cache_key is not None and (etag or max_age > 0):
+                self._cache.set(cache_key, etag, response.content, time.time() + max_age)
+            
+            return decode(response.content)
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error("API request failed: %s", e)
+            # A failed Response is falsy, so compare with None
+            if getattr(e, 'response', None) is not None and self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error("Response status: %s", e.response.status_code)
+                self.logger.error("Response body: %s", e.response.text)
             
-            if response.content:
-                return response.json()
-            return {}
+            # Re-raise the exception for the caller to handle
+            raise
+    
+    def _iter_rows(self, endpoint: str, params: Dict = None) -> Iterator[Dict]:
+        """
+        Stream the rows of a large list response one at a time.
+        
+        With ijson installed, the "data" array is parsed incrementally off the
+        socket, so memory stays at one row regardless of the payload size.
+        Without it, the body is parsed whole and its rows yielded.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
             
+        Yields:
+            Rows from the response's "data" array
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        
+        try:
+            with self.session.get(url, params=params, stream=True) as response:
+                response.raise_for_status()
+                
+                if ijson is None:
+                    payload = _json_loads(response.content) if response.content else {}
+                    yield from payload.get("data") or []
+                    return
+                
+                # Let urllib3 undo any gzip/deflate encoding before parsing
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "data.item", use_float=True)
+                
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"API request failed: {str(e)}")
-            if hasattr(e, 'response') and e.response:
-                self.logger.error(f"Response status: {e.response.status_code}")
-                self.logger.error(f"Response body: {e.response.text}")
+            self.logger.error("API request failed: %s", e)
+            if getattr(e, 'response', None) is not None:
+                self.logger.error("Response status: %s", e.response.status_code)
             
             # Re-raise the exception for the caller to handle
             raise
     
+    def _observe_rate_limit(self, response: httpx.Response) -> None:
+        """
+        Tune the async rate limiter from a response's rate-limit headers.
+        
+        X-RateLimit-Limit (requests per minute) sets the pace and
+        X-RateLimit-Remaining caps the burst still allowed; a 429 pauses all
+        requests for its Retry-After period (a full minute if absent).
+        
+        Args:
+            response: Response to an async request
+        """
+        headers = response.headers
+        try:
+            if "X-RateLimit-Limit" in headers:
+                self.limiter.set_rate(int(headers["X-RateLimit-Limit"]) / 60)
+            if "X-RateLimit-Remaining" in headers:
+                self.limiter.limit_tokens(int(headers["X-RateLimit-Remaining"]))
+        except ValueError:
+            self.logger.warning("Ignoring malformed rate limit headers")
+        
+        if response.status_code == 429:
+            try:
+                retry_after = float(headers.get("Retry-After", 60))
+            except ValueError:
+                retry_after = 60.0
+            self.logger.warning("Rate limited, pausing requests for %ss", retry_after)
+            self.limiter.pause(retry_after)
+    
     # Merchant API endpoints
     
     def get_merchants(self, page: int = 1, per_page: int = 100, **filters) -> Dict:
@@ -96,17 +563,43 @@ class IrelandPayCRMClient:
         params = {"page": page, "per_page": per_page, **filters}
         return self._make_request("GET", "/merchants", params=params)
     
-    def get_merchant(self, merchant_number: str) -> Dict:
+    async def get_merchants_bulk(self, pages: Iterable[int], per_page: int = 100,
+                                 **filters) -> List[Dict]:
         """
-        Get detailed information about a specific merchant.
+        Get several pages of merchants concurrently.
         
         Args:
-            merchant_number: The merchant ID
+            pages: Page numbers to fetch
+            per_page: Number of results per page
+            **filters: Additional filters to apply
+            
+        Returns:
+            One merchants response per page, in the order requested
+        """
+        return await asyncio.gather(*[
+            self._aget("/merchants", {"page": page, "per_page": per_page, **filters})
+            for page in pages
+        ])
+    
+    async def get_merchants_all(self, per_page: int = 100, **filters) -> List[Dict]:
+        """
+        Get every merchant, fetching the pages after the first concurrently.
+        
+        The first page reports the page count (meta.last_page); the remaining
+        pages are then requested together, paced by the rate limiter.
+        
+        Args:
+            per_page: Number of results per page
+            **filters: Additional filters to apply
             
         Returns:
-            Merchant details
+            All merchants, in page order
         """
-        return self._make_request("GET", f"/merchants/{merchant_number}")
+        first = await self._aget("/merchants", {"page": 1, "per_page": per_page, **filters})
+        last_page = int((first.get("meta") or {}).get("last_page") or 1)
+        
+        rest = await self.get_merchants_bulk(range(2, last_page + 1), per_page=per_page, **filters)
+        return [merchant for response in [first, *rest] for merchant in response.get("data") or []]
     
     def get_merchant_transactions(self, merchant_number: str, start_date: str = None, 
                                   end_date: str = None, page: int = 1, per_page: int = 100) -> Dict:
@@ -131,67 +624,19 @@ class IrelandPayCRMClient:
             
         return self._make_request("GET", f"/merchants/{merchant_number}/transactions", params=params)
     
-    def get_merchant_deposits(self, merchant_number: str, year: int, month: int, day: int) -> Dict:
-        """
-        Get deposit data for a merchant on a specific date.
-        
-        Args:
-            merchant_number: The merchant ID
-            year: Year (YYYY)
-            month: Month (MM)
-            day: Day (DD)
-            
-        Returns:
-            Deposit data
-        """
-        return self._make_request(
-            "GET", 
-            f"/merchants/{merchant_number}/deposits/{year}/{month}/{day}"
-        )
-    
-    def get_merchant_statements(self, merchant_number: str) -> Dict:
-        """
-        Get statements for a merchant.
-        
-        Args:
-            merchant_number: The merchant ID
-            
-        Returns:
-            List of statements
-        """
-        return self._make_request("GET", f"/merchants/{merchant_number}/statements")
-    
-    def get_statement(self, merchant_number: str, statement_id: str) -> Dict:
-        """
-        Get a specific statement for a merchant.
-        
-        Args:
-            merchant_number: The merchant ID
-            statement_id: The statement ID
-            
-        Returns:
-            Statement details
-        """
-        return self._make_request("GET", f"/merchants/{merchant_number}/statements/{statement_id}")
-    
     # Residuals API endpoints
     
-    def get_residuals_summary(self, year: int, month: int) -> Dict:
-        """
-        Get residuals summary data.
-        
-        Args:
-            year: Year (YYYY)
-            month: Month (MM)
-            
-        Returns:
-            Residuals summary data
-        """
-        return self._make_request("GET", f"/residuals/reports/summary/{year}/{month}")
+    def _residuals_max_age(self, year: int, month: int) -> float:
+        """Cache freshness for a month's residuals: long once the month has closed."""
+        today = datetime.now()
+        return self.CLOSED_MONTH_MAX_AGE if (year, month) < (today.year, today.month) else 0
     
-    def get_residuals_summary_rows(self, processor_id: str, year: int, month: int) -> Dict:
+    def get_residuals_summary_rows_typed(self, processor_id: str, year: int, month: int):
         """
-        Get residuals summary with merchant rows.
+        Get residuals summary merchant rows as typed structs.
+        
+        The body is decoded by msgspec straight into MerchantRow structs,
+        skipping undeclared fields, instead of building a dict per row.
         
         Args:
             processor_id: The processor ID
@@ -199,61 +644,53 @@ class IrelandPayCRMClient:
             month: Month (MM)
             
         Returns:
-            Residuals summary with merchant rows
+            A MerchantRowsPage
+            
+        Raises:
+            RuntimeError: If msgspec is not installed
         """
+        if MERCHANT_ROWS_DECODER is None:
+            raise RuntimeError("msgspec is required for typed responses")
+        
         return self._make_request(
             "GET", 
-            f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}"
+            f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}",
+            max_age=self._residuals_max_age(year, month),
+            decode=MERCHANT_ROWS_DECODER.decode
         )
     
-    def get_residuals_details(self, processor_id: str, year: int, month: int) -> Dict:
+    def iter_residuals_summary_rows(self, processor_id: str, year: int, month: int,
+                                    **params) -> Iterator[Dict]:
         """
-        Get detailed residuals data.
+        Stream residuals summary merchant rows without buffering the response.
         
         Args:
             processor_id: The processor ID
             year: Year (YYYY)
             month: Month (MM)
+            **params: Additional query parameters (page, per_page, ...)
             
-        Returns:
-            Detailed residuals data
+        Yields:
+            Merchant rows
         """
-        return self._make_request(
-            "GET", 
-            f"/residuals/reports/details/{processor_id}/{year}/{month}"
+        return self._iter_rows(
+            f"/residuals/reports/summary/rows/{processor_id}/{year}/{month}", params=params
         )
     
-    def get_residuals_lineitems(self, year: int, month: int) -> Dict:
-        """
-        Get residuals line items.
-        
-        Args:
-            year: Year (YYYY)
-            month: Month (MM)
-            
-        Returns:
-            Residuals line items
-        """
-        return self._make_request("GET", f"/residuals/lineitems/{year}/{month}")
-    
-    def get_residuals_templates(self) -> Dict:
-        """
-        Get residuals templates.
-        
-        Returns:
-            Residuals templates
-        """
-        return self._make_request("GET", "/residuals/templates/")
-    
-    def get_residuals_templates_assigned(self, year: int, month: int) -> Dict:
+    def iter_residuals_details(self, processor_id: str, year: int, month: int,
+                               **params) -> Iterator[Dict]:
         """
-        Get users with assigned residuals templates.
+        Stream detailed residuals rows without buffering the response.
         
         Args:
+            processor_id: The processor ID
             year: Year (YYYY)
             month: Month (MM)
+            **params: Additional query parameters (page, per_page, ...)
             
-        Returns:
-            Users with assigned residuals templates
+        Yields:
+            Residuals detail rows
         """
-        return self._make_request("GET", f"/residuals/templates/assigned/{year}/{month}")
+        return self._iter_rows(
+            f"/residuals/reports/details/{processor_id}/{year}/{month}", params=params
+        )
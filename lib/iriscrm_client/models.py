@@ -0,0 +1,44 @@
+"""
+Typed IRIS CRM response schemas
+Decoded straight from JSON with msgspec when it is installed.
+"""
+from typing import List, Optional, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+if msgspec is not None:
+    class Meta(msgspec.Struct):
+        """Pagination details of a list response."""
+        
+        current_page: int = 1
+        last_page: Union[int, str] = 1
+        per_page: int = 0
+        total: int = 0
+    
+    class MerchantRow(msgspec.Struct):
+        """One merchant's residuals summary for a processor and month."""
+        
+        mid: Union[int, str]
+        merchant: Optional[str] = None
+        transactions: int = 0
+        sales_amount: float = 0.0
+        income: float = 0.0
+        expense: float = 0.0
+        net: float = 0.0
+        bps: float = 0.0
+        agent_net: float = 0.0
+    
+    class MerchantRowsPage(msgspec.Struct):
+        """A page of residuals summary merchant rows."""
+        
+        data: List[MerchantRow] = msgspec.field(default_factory=list)
+        meta: Optional[Meta] = None
+    
+    # Built once; fields not declared above are skipped without being decoded
+    MERCHANT_ROWS_DECODER = msgspec.json.Decoder(MerchantRowsPage)
+else:
+    MERCHANT_ROWS_DECODER = None
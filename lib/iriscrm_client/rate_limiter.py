@@ -0,0 +1,86 @@
+"""
+Async token bucket used to pace IRIS CRM API requests.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter for asyncio callers.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one, waiting when the bucket is empty. The client tunes the
+    bucket from the API's rate-limit headers, so requests are paced below the
+    server's limit instead of running into 429 responses.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the largest burst allowed
+                (defaults to one second's worth of tokens, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill (none accrue while paused)."""
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the refill rate.
+        
+        Args:
+            rate: Tokens added per second
+        """
+        if rate > 0:
+            self._refill(time.monotonic())
+            self.rate = rate
+    
+    def limit_tokens(self, remaining: int) -> None:
+        """
+        Cap the available tokens to the requests the server says are left.
+        
+        Args:
+            remaining: Requests left in the server's current window
+        """
+        self._tokens = min(self._tokens, max(0, remaining))
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every request for `seconds`, e.g. after a Retry-After response.
+        
+        Args:
+            seconds: Time to wait before the next request
+        """
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+        self._tokens = 0
+        self._updated = self._resume_at
@@ -17,9 +17,11 @@ import sys
 import json
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 from supabase import create_client, Client
 
 # Configure logging
@@ -29,6 +31,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Merchant IDs per IN (...) lookup, keeping the request URL short enough for PostgREST
+LOOKUP_BATCH_SIZE = 500
+
+# Rows per upsert request, so one month of residuals or volumes isn't sent as a single huge body
+UPSERT_BATCH_SIZE = 500
+
+# Merchant pages requested at once; the API allows 500 requests a minute
+PAGE_FETCH_CONCURRENCY = int(os.environ.get('IRELANDPAY_PAGE_FETCH_CONCURRENCY', '8'))
+
+# Merchants whose transactions are requested at once by the volume sync
+VOLUME_FETCH_CONCURRENCY = int(os.environ.get('IRELANDPAY_VOLUME_FETCH_CONCURRENCY', '16'))
+
 class IrelandPayCRMSync:
     """Ireland Pay CRM synchronization manager."""
     
@@ -51,6 +65,20 @@ class IrelandPayCRMSync:
             'Accept': 'application/json'
         }
         
+        # One keep-alive session for every API call; the pool is sized for the
+        # concurrent page and transaction fetches so connections are reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=max(PAGE_FETCH_CONCURRENCY, VOLUME_FETCH_CONCURRENCY))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers)
+        
+        # Merchant ID -> database UUID, filled as merchants are written or looked up
+        self._merchant_uuids: Dict[str, str] = {}
+        # Every merchant ID, once a full merchants sync has seen them all
+        self._merchant_ids: Optional[List[str]] = None
+        
         logger.info("Ireland Pay CRM Sync initialized")
     
     def sync_merchants(self, force: bool = False) -> Dict[str, Any]:
@@ -75,63 +103,60 @@ class IrelandPayCRMSync:
         }
         
         try:
-            # Get all merchants from Ireland Pay CRM
-            page = 1
+            # Get all merchants from Ireland Pay CRM; one timestamp for the whole sync
             per_page = 100
+            synced_at = datetime.now().isoformat()
+            synced_ids = []
             
-            while True:
-                logger.info(f"Fetching merchants page {page}")
-                
-                # Make API request
-                response = requests.get(
-                    f"{self.base_url}/merchants",
-                    headers=self.headers,
-                    params={'page': page, 'per_page': per_page},
-                    timeout=30
-                )
-                
-                if response.status_code != 200:
+            for page, response, data in self._fetch_merchant_pages(per_page):
+                if data is None:
                     error_msg = f"Failed to fetch merchants page {page}: {response.status_code} - {response.text}"
                     results["errors"].append(error_msg)
                     logger.error(error_msg)
                     break
                 
-                data = response.json()
                 merchants_data = data.get('data', [])
                 
                 if not merchants_data:
                     break
                 
-                # Process each merchant
+                # Transform each merchant on the page to match our schema
+                transformed_merchants = []
                 for merchant in merchants_data:
                     try:
-                        # Transform merchant data to match our schema
-                        transformed_merchant = self._transform_merchant_data(merchant)
-                        
-                        # Upsert to database
-                        db_result = self._upsert_merchant(transformed_merchant)
-                        
-                        if db_result["success"]:
-                            if db_result["action"] == "inserted":
-                                results["merchants_added"] += 1
-                            else:
-                                results["merchants_updated"] += 1
-                        else:
-                            results["merchants_failed"] += 1
-                            results["errors"].append(f"Failed to upsert merchant {merchant.get('mid')}: {db_result['error']}")
-                        
-                        results["total_merchants"] += 1
-                        
+                        transformed_merchants.append(self._transform_merchant_data(merchant, synced_at))
                     except Exception as e:
                         results["merchants_failed"] += 1
+                        results["total_merchants"] += 1
                         results["errors"].append(f"Error processing merchant {merchant.get('mid', 'unknown')}: {str(e)}")
                         logger.error(f"Error processing merchant: {e}")
                 
+                # Upsert the whole page at once
+                db_result = self._upsert_merchants(transformed_merchants)
+                
+                # Rows left out of the upsert are failures of their own, whatever became of the rest
+                for error in db_result["dropped"]:
+                    results["errors"].append(error)
+                    logger.warning(error)
+                
+                if db_result["success"]:
+                    results["merchants_added"] += db_result["inserted"]
+                    results["merchants_updated"] += db_result["updated"]
+                    results["merchants_failed"] += len(db_result["dropped"])
+                    synced_ids.extend(m["merchant_id"] for m in transformed_merchants if m.get("merchant_id"))
+                else:
+                    results["merchants_failed"] += len(transformed_merchants)
+                    results["errors"].append(f"Failed to upsert merchants page {page}: {db_result['error']}")
+                
+                results["total_merchants"] += len(transformed_merchants)
+                
                 # Check if we have more pages
                 if len(merchants_data) < per_page:
                     break
-                
-                page += 1
+            
+            # Remember the full merchant list so a volume sync in this run needn't fetch it again
+            if not results["errors"] and not results["merchants_failed"]:
+                self._merchant_ids = list(dict.fromkeys(str(merchant_id) for merchant_id in synced_ids))
             
             results["end_time"] = datetime.now().isoformat()
             logger.info(f"Merchants sync completed: {results['merchants_added']} added, {results['merchants_updated']} updated, {results['merchants_failed']} failed")
@@ -142,6 +167,73 @@ class IrelandPayCRMSync:
         
         return results
     
+    def _fetch_merchants_page(self, page: int, per_page: int) -> requests.Response:
+        """Request one page of merchants from Ireland Pay CRM.
+        
+        Args:
+            page: Page number
+            per_page: Merchants per page
+            
+        Returns:
+            The API response
+        """
+        logger.info(f"Fetching merchants page {page}")
+        return self.session.get(
+            f"{self.base_url}/merchants",
+            params={'page': page, 'per_page': per_page},
+            timeout=30
+        )
+    
+    def _fetch_merchant_pages(self, per_page: int) -> Iterator[Tuple[int, requests.Response, Optional[Dict]]]:
+        """Yield every page of merchants in order, fetching pages concurrently.
+        
+        Page 1 gives the page count (meta.last_page); the remaining pages are then
+        requested PAGE_FETCH_CONCURRENCY at a time while earlier pages are processed.
+        Without a page count, pages are fetched one by one until a short page, each
+        requested while the page before it is being processed.
+        
+        Args:
+            per_page: Merchants per page
+            
+        Yields:
+            Tuples of (page, response, parsed body), the body None for a failed request
+        """
+        def fetch(page: int) -> Tuple[int, requests.Response, Optional[Dict]]:
+            response = self._fetch_merchants_page(page, per_page)
+            return page, response, response.json() if response.status_code == 200 else None
+        
+        def has_next(data: Optional[Dict]) -> bool:
+            return data is not None and len(data.get('data', [])) >= per_page
+        
+        first = fetch(1)
+        data = first[2]
+        if data is None:
+            yield first
+            return
+        
+        last_page = (data.get('meta') or {}).get('last_page')
+        if not last_page:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                page, response = first[:2]
+                while True:
+                    # Request the next page before handing this one over for processing
+                    next_page = pool.submit(fetch, page + 1) if has_next(data) else None
+                    yield page, response, data
+                    if next_page is None:
+                        return
+                    page, response, data = next_page.result()
+        
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_CONCURRENCY) as pool:
+            futures = [pool.submit(fetch, page) for page in range(2, int(last_page) + 1)]
+            try:
+                yield first
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Drop requests still queued when the caller stops early
+                for future in futures:
+                    future.cancel()
+    
     def sync_residuals(self, year: int, month: int, force: bool = False) -> Dict[str, Any]:
         """Sync residuals data from Ireland Pay CRM API to Supabase.
         
@@ -169,9 +261,8 @@ class IrelandPayCRMSync:
         
         try:
             # Get residuals summary from Ireland Pay CRM
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/residuals/reports/summary/{year}/{month}",
-                headers=self.headers,
                 timeout=30
             )
             
@@ -184,44 +275,44 @@ class IrelandPayCRMSync:
             data = response.json()
             residuals_data = data.get('data', {})
             
-            # Process residuals data
+            # Get the merchant UUIDs from the database in one lookup
+            merchant_uuids = self._get_merchant_uuids(list(residuals_data.keys()))
+            
+            # Process residuals data; one timestamp for the whole sync
+            synced_at = datetime.now().isoformat()
+            residual_rows = []
             for merchant_id, residual_info in residuals_data.items():
                 try:
-                    # Get the merchant UUID from the database
-                    merchant_result = self.supabase.table("merchants").select("id").eq("merchant_id", merchant_id).execute()
+                    merchant_uuid = merchant_uuids.get(str(merchant_id))
                     
-                    if not merchant_result.data:
+                    if not merchant_uuid:
                         logger.warning(f"Merchant {merchant_id} not found in database, skipping residual")
                         results["residuals_failed"] += 1
                         results["errors"].append(f"Merchant {merchant_id} not found in database")
                         continue
                     
-                    merchant_uuid = merchant_result.data[0]["id"]
-                    
                     # Transform residual data to match our schema
-                    transformed_residual = self._transform_residual_data(
-                        merchant_uuid, residual_info, year, month
-                    )
-                    
-                    # Upsert to database
-                    db_result = self._upsert_residual(transformed_residual)
-                    
-                    if db_result["success"]:
-                        if db_result["action"] == "inserted":
-                            results["residuals_added"] += 1
-                        else:
-                            results["residuals_updated"] += 1
-                    else:
-                        results["residuals_failed"] += 1
-                        results["errors"].append(f"Failed to upsert residual for merchant {merchant_id}: {db_result['error']}")
-                    
-                    results["total_residuals"] += 1
+                    residual_rows.append(self._transform_residual_data(
+                        merchant_uuid, residual_info, year, month, synced_at
+                    ))
                     
                 except Exception as e:
                     results["residuals_failed"] += 1
                     results["errors"].append(f"Error processing residual for merchant {merchant_id}: {str(e)}")
                     logger.error(f"Error processing residual: {e}")
             
+            # Upsert the whole month to the database at once
+            db_result = self._upsert_monthly_rows("residuals", residual_rows)
+            
+            # Batches written before or after a failed one still count
+            results["residuals_added"] += db_result["inserted"]
+            results["residuals_updated"] += db_result["updated"]
+            if not db_result["success"]:
+                results["residuals_failed"] += len(db_result["failed_rows"])
+                results["errors"].append(f"Failed to upsert {len(db_result['failed_rows'])} residuals: {db_result['error']}")
+            
+            results["total_residuals"] += len(residual_rows)
+            
             results["end_time"] = datetime.now().isoformat()
             logger.info(f"Residuals sync completed: {results['residuals_added']} added, {results['residuals_updated']} updated, {results['residuals_failed']} failed")
             
@@ -257,22 +348,24 @@ class IrelandPayCRMSync:
         }
         
         try:
-            # Get all merchants first
-            response = requests.get(
-                f"{self.base_url}/merchants",
-                headers=self.headers,
-                params={'per_page': 1000},  # Get all merchants for volume sync
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"Failed to fetch merchants for volume sync: {response.status_code} - {response.text}"
-                results["errors"].append(error_msg)
-                logger.error(error_msg)
-                return results
-            
-            data = response.json()
-            merchants_data = data.get('data', [])
+            # Get all merchants first, reusing the list from a full merchants sync in this run
+            if self._merchant_ids is not None:
+                merchants_data = [{"mid": merchant_id} for merchant_id in self._merchant_ids]
+            else:
+                response = self.session.get(
+                    f"{self.base_url}/merchants",
+                    params={'per_page': 1000},  # Get all merchants for volume sync
+                    timeout=30
+                )
+                
+                if response.status_code != 200:
+                    error_msg = f"Failed to fetch merchants for volume sync: {response.status_code} - {response.text}"
+                    results["errors"].append(error_msg)
+                    logger.error(error_msg)
+                    return results
+                
+                data = response.json()
+                merchants_data = data.get('data', [])
             
             # Calculate date range for the month
             start_date = f"{year}-{month:02d}-01"
@@ -281,20 +374,44 @@ class IrelandPayCRMSync:
             else:
                 end_date = f"{year}-{month + 1:02d}-01"
             
-            # Process each merchant's transaction volume
+            # Get the merchant UUIDs from the database in one lookup
+            merchant_uuids = self._get_merchant_uuids(
+                [merchant.get("mid") for merchant in merchants_data if merchant.get("mid")]
+            )
+            
+            def fetch_transactions(merchant_id: str) -> requests.Response:
+                return self.session.get(
+                    f"{self.base_url}/merchants/{merchant_id}/transactions",
+                    params={'start_date': start_date, 'end_date': end_date},
+                    timeout=30
+                )
+            
+            # Get merchant transactions for the month, VOLUME_FETCH_CONCURRENCY merchants at a time
+            pool = ThreadPoolExecutor(max_workers=VOLUME_FETCH_CONCURRENCY)
+            fetches = []
             for merchant in merchants_data:
+                merchant_id = merchant.get("mid")
+                if not merchant_id:
+                    continue
+                
+                merchant_uuid = merchant_uuids.get(str(merchant_id))
+                
+                if not merchant_uuid:
+                    logger.warning(f"Merchant {merchant_id} not found in database, skipping volume")
+                    results["volumes_failed"] += 1
+                    results["errors"].append(f"Merchant {merchant_id} not found in database")
+                    continue
+                
+                fetches.append((merchant_id, merchant_uuid, pool.submit(fetch_transactions, merchant_id)))
+            pool.shutdown(wait=False)
+            
+            # Process each merchant's transaction volume; one timestamp for the whole sync
+            processing_month = f"{year}-{month:02d}-01"
+            synced_at = datetime.now().isoformat()
+            volume_rows = []
+            for merchant_id, merchant_uuid, fetch in fetches:
                 try:
-                    merchant_id = merchant.get("mid")
-                    if not merchant_id:
-                        continue
-                    
-                    # Get merchant transactions for the month
-                    response = requests.get(
-                        f"{self.base_url}/merchants/{merchant_id}/transactions",
-                        headers=self.headers,
-                        params={'start_date': start_date, 'end_date': end_date},
-                        timeout=30
-                    )
+                    response = fetch.result()
                     
                     if response.status_code != 200:
                         results["volumes_failed"] += 1
@@ -304,57 +421,39 @@ class IrelandPayCRMSync:
                     data = response.json()
                     transactions_data = data.get('data', [])
                     
-                    # Calculate total volume for the month
-                    total_volume = 0
-                    total_transactions = 0
-                    
-                    for transaction in transactions_data:
-                        volume = transaction.get("amount", 0)
-                        if volume:
-                            total_volume += float(volume)
-                            total_transactions += 1
-                    
-                    # Get the merchant UUID from the database
-                    merchant_result = self.supabase.table("merchants").select("id").eq("merchant_id", merchant_id).execute()
-                    
-                    if not merchant_result.data:
-                        logger.warning(f"Merchant {merchant_id} not found in database, skipping volume")
-                        results["volumes_failed"] += 1
-                        results["errors"].append(f"Merchant {merchant_id} not found in database")
-                        continue
-                    
-                    merchant_uuid = merchant_result.data[0]["id"]
+                    # Calculate total volume for the month; transactions without an amount are not counted
+                    amounts = [float(amount) for transaction in transactions_data if (amount := transaction.get("amount", 0))]
+                    total_volume = sum(amounts)
+                    total_transactions = len(amounts)
                     
                     # Transform volume data to match our schema
-                    transformed_volume = {
+                    volume_rows.append({
                         "merchant_id": merchant_uuid,
-                        "processing_month": f"{year}-{month:02d}-01",
+                        "processing_month": processing_month,
                         "gross_volume": total_volume,
                         "transaction_count": total_transactions,
                         "avg_ticket": total_volume / total_transactions if total_transactions > 0 else 0,
-                        "created_at": datetime.now().isoformat(),
-                        "updated_at": datetime.now().isoformat()
-                    }
-                    
-                    # Upsert to database
-                    db_result = self._upsert_volume(transformed_volume)
-                    
-                    if db_result["success"]:
-                        if db_result["action"] == "inserted":
-                            results["volumes_added"] += 1
-                        else:
-                            results["volumes_updated"] += 1
-                    else:
-                        results["volumes_failed"] += 1
-                        results["errors"].append(f"Failed to upsert volume for merchant {merchant_id}: {db_result['error']}")
-                    
-                    results["total_volumes"] += 1
+                        "created_at": synced_at,
+                        "updated_at": synced_at
+                    })
                     
                 except Exception as e:
                     results["volumes_failed"] += 1
-                    results["errors"].append(f"Error processing volume for merchant {merchant.get('mid', 'unknown')}: {str(e)}")
+                    results["errors"].append(f"Error processing volume for merchant {merchant_id}: {str(e)}")
                     logger.error(f"Error processing volume: {e}")
             
+            # Upsert the whole month to the database at once
+            db_result = self._upsert_monthly_rows("merchant_processing_volumes", volume_rows)
+            
+            # Batches written before or after a failed one still count
+            results["volumes_added"] += db_result["inserted"]
+            results["volumes_updated"] += db_result["updated"]
+            if not db_result["success"]:
+                results["volumes_failed"] += len(db_result["failed_rows"])
+                results["errors"].append(f"Failed to upsert {len(db_result['failed_rows'])} volumes: {db_result['error']}")
+            
+            results["total_volumes"] += len(volume_rows)
+            
             results["end_time"] = datetime.now().isoformat()
             logger.info(f"Volumes sync completed: {results['volumes_added']} added, {results['volumes_updated']} updated, {results['volumes_failed']} failed")
             
@@ -364,24 +463,27 @@ class IrelandPayCRMSync:
         
         return results
     
-    def _transform_merchant_data(self, merchant: Dict) -> Dict:
+    def _transform_merchant_data(self, merchant: Dict, synced_at: Optional[str] = None) -> Dict:
         """Transform merchant data from Ireland Pay CRM format to our database schema.
         
         Args:
             merchant: Raw merchant data from Ireland Pay CRM API
+            synced_at: ISO timestamp for created_at/updated_at (defaults to now)
             
         Returns:
             Transformed merchant data
         """
+        synced_at = synced_at or datetime.now().isoformat()
         return {
             "merchant_id": merchant.get("mid"),  # Map mid to merchant_id
             "dba_name": merchant.get("name"),    # Map name to dba_name
             "processor": merchant.get("processor"),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": synced_at,
+            "updated_at": synced_at
         }
     
-    def _transform_residual_data(self, merchant_id: str, residual_info: Dict, year: int, month: int) -> Dict:
+    def _transform_residual_data(self, merchant_id: str, residual_info: Dict, year: int, month: int,
+                                 synced_at: Optional[str] = None) -> Dict:
         """Transform residual data from Ireland Pay CRM format to our database schema.
         
         Args:
@@ -389,10 +491,12 @@ class IrelandPayCRMSync:
             residual_info: Raw residual data from Ireland Pay CRM API
             year: Year
             month: Month
+            synced_at: ISO timestamp for created_at/updated_at (defaults to now)
             
         Returns:
             Transformed residual data
         """
+        synced_at = synced_at or datetime.now().isoformat()
         return {
             "merchant_id": merchant_id,  # This will need to be the UUID from merchants table
             "processing_month": f"{year}-{month:02d}-01",
@@ -402,87 +506,127 @@ class IrelandPayCRMSync:
             "office_bps": residual_info.get("bps", 0),
             "agent_bps": residual_info.get("agent_net", 0),
             "processor_residual": residual_info.get("sales_amount", 0),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": synced_at,
+            "updated_at": synced_at
         }
     
-    def _upsert_merchant(self, merchant_data: Dict) -> Dict:
-        """Upsert merchant data to the database.
+    def _upsert_merchants(self, merchants: List[Dict]) -> Dict:
+        """Upsert a page of merchants to the database.
+        
+        Existing merchants are looked up with one IN query for the whole page,
+        then every row is written with a single upsert on merchant_id. Rows
+        without a merchant ID are dropped, and only the last row of a merchant
+        listed more than once is kept, since either would fail the whole upsert.
         
         Args:
-            merchant_data: Merchant data to upsert
-            
+            merchants: Transformed merchant data to upsert
+        
         Returns:
-            Dictionary with success status and action taken
+            Dictionary with success status, the inserted/updated counts and an
+            error message for each row dropped before the upsert
         """
+        unique = {}
+        dropped = []
+        for merchant in merchants:
+            merchant_id = merchant.get("merchant_id")
+            if not merchant_id:
+                dropped.append(f"Merchant without an ID skipped: {merchant.get('dba_name') or 'unknown'}")
+                continue
+            if merchant_id in unique:
+                dropped.append(f"Merchant {merchant_id} listed more than once, only the last copy was synced")
+            unique[merchant_id] = merchant
+        merchants = list(unique.values())
+        
+        if not merchants:
+            return {"success": True, "inserted": 0, "updated": 0, "dropped": dropped}
+        
         try:
-            # Check if merchant exists
-            existing = self.supabase.table("merchants").select("*").eq("merchant_id", merchant_data["merchant_id"]).execute()
+            merchant_ids = list(unique)
+            existing = self.supabase.table("merchants").select("merchant_id").in_("merchant_id", merchant_ids).execute()
+            existing_ids = {row["merchant_id"] for row in existing.data or []}
             
-            if existing.data:
-                # Update existing merchant
-                result = self.supabase.table("merchants").update(merchant_data).eq("merchant_id", merchant_data["merchant_id"]).execute()
-                return {"success": True, "action": "updated"}
-            else:
-                # Insert new merchant
-                result = self.supabase.table("merchants").insert(merchant_data).execute()
-                return {"success": True, "action": "inserted"}
-                
+            upserted = self.supabase.table("merchants").upsert(merchants, on_conflict="merchant_id").execute()
+            
+            # The upsert returns the written rows, so their UUIDs are known without a lookup
+            for row in upserted.data or []:
+                self._merchant_uuids[str(row["merchant_id"])] = row["id"]
+            
+            updated = sum(1 for merchant_id in merchant_ids if merchant_id in existing_ids)
+            return {"success": True, "inserted": len(merchants) - updated, "updated": updated, "dropped": dropped}
+        
         except Exception as e:
-            logger.error(f"Database error upserting merchant: {e}")
-            return {"success": False, "error": str(e)}
+            logger.error(f"Database error upserting merchants: {e}")
+            return {"success": False, "error": str(e), "dropped": dropped}
     
-    def _upsert_residual(self, residual_data: Dict) -> Dict:
-        """Upsert residual data to the database.
+    def _get_merchant_uuids(self, merchant_ids: List[str]) -> Dict[str, str]:
+        """Look up the database UUIDs of many merchants at once.
         
         Args:
-            residual_data: Residual data to upsert
+            merchant_ids: Ireland Pay CRM merchant IDs (mid)
             
         Returns:
-            Dictionary with success status and action taken
+            Dictionary mapping each merchant ID found to its UUID
         """
-        try:
-            # Check if residual exists
-            existing = self.supabase.table("residuals").select("*").eq("merchant_id", residual_data["merchant_id"]).eq("processing_month", residual_data["processing_month"]).execute()
-            
-            if existing.data:
-                # Update existing residual
-                result = self.supabase.table("residuals").update(residual_data).eq("merchant_id", residual_data["merchant_id"]).eq("processing_month", residual_data["processing_month"]).execute()
-                return {"success": True, "action": "updated"}
-            else:
-                # Insert new residual
-                result = self.supabase.table("residuals").insert(residual_data).execute()
-                return {"success": True, "action": "inserted"}
-                
-        except Exception as e:
-            logger.error(f"Database error upserting residual: {e}")
-            return {"success": False, "error": str(e)}
+        merchant_ids = [str(merchant_id) for merchant_id in merchant_ids]
+        
+        # UUIDs never change, so IDs resolved earlier in this run aren't looked up again
+        missing = [merchant_id for merchant_id in merchant_ids if merchant_id not in self._merchant_uuids]
+        
+        # Chunked so the IN list stays within PostgREST's URL length limit
+        for i in range(0, len(missing), LOOKUP_BATCH_SIZE):
+            chunk = missing[i:i + LOOKUP_BATCH_SIZE]
+            result = self.supabase.table("merchants").select("id, merchant_id").in_("merchant_id", chunk).execute()
+            for row in result.data or []:
+                self._merchant_uuids[str(row["merchant_id"])] = row["id"]
+        
+        return {merchant_id: self._merchant_uuids[merchant_id]
+                for merchant_id in merchant_ids if merchant_id in self._merchant_uuids}
     
-    def _upsert_volume(self, volume_data: Dict) -> Dict:
-        """Upsert volume data to the database.
+    def _upsert_monthly_rows(self, table: str, rows: List[Dict]) -> Dict:
+        """Bulk upsert one month of per-merchant rows to the database.
+        
+        Rows are written in batches of UPSERT_BATCH_SIZE: each batch is counted
+        against the rows already stored for the month with one IN query, then
+        written with a single upsert on (merchant_id, processing_month). A batch
+        that fails doesn't stop the ones after it.
         
         Args:
-            volume_data: Volume data to upsert
+            table: Table to upsert into (residuals or merchant_processing_volumes)
+            rows: Rows to upsert, all for the same processing month
             
         Returns:
-            Dictionary with success status and action taken
+            Dictionary with success status, the inserted/updated counts of the
+            batches written, and the rows of the batches that failed under
+            "failed_rows" (with their errors under "error")
         """
-        try:
-            # Check if volume exists
-            existing = self.supabase.table("merchant_processing_volumes").select("*").eq("merchant_id", volume_data["merchant_id"]).eq("processing_month", volume_data["processing_month"]).execute()
+        inserted = 0
+        updated = 0
+        failed_rows = []
+        errors = []
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[i:i + UPSERT_BATCH_SIZE]
+            merchant_uuids = [row["merchant_id"] for row in batch]
             
-            if existing.data:
-                # Update existing volume
-                result = self.supabase.table("merchant_processing_volumes").update(volume_data).eq("merchant_id", volume_data["merchant_id"]).eq("processing_month", volume_data["processing_month"]).execute()
-                return {"success": True, "action": "updated"}
-            else:
-                # Insert new volume
-                result = self.supabase.table("merchant_processing_volumes").insert(volume_data).execute()
-                return {"success": True, "action": "inserted"}
+            try:
+                existing = self.supabase.table(table).select("merchant_id").eq("processing_month", batch[0]["processing_month"]).in_("merchant_id", merchant_uuids).execute()
+                existing_ids = {row["merchant_id"] for row in existing.data or []}
                 
-        except Exception as e:
-            logger.error(f"Database error upserting volume: {e}")
-            return {"success": False, "error": str(e)}
+                self.supabase.table(table).upsert(batch, on_conflict="merchant_id,processing_month").execute()
+            
+            except Exception as e:
+                logger.error(f"Database error upserting {table}: {e}")
+                failed_rows.extend(batch)
+                errors.append(str(e))
+                continue
+            
+            batch_updated = sum(1 for merchant_uuid in merchant_uuids if merchant_uuid in existing_ids)
+            inserted += len(batch) - batch_updated
+            updated += batch_updated
+        
+        result = {"success": not failed_rows, "inserted": inserted, "updated": updated, "failed_rows": failed_rows}
+        if errors:
+            result["error"] = "; ".join(errors)
+        return result
 
 def main():
     """Main function to handle command line arguments and execute sync operations."""
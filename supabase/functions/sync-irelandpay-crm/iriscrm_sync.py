@@ -21,6 +21,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger('iriscrm_sync')
 
+# Records sent per atomic_batch_upsert call; each call is one round trip and
+# one transaction, so larger batches mean far fewer requests on big syncs
+UPSERT_BATCH_SIZE = int(os.environ.get('IRELANDPAY_UPSERT_BATCH_SIZE', '1000'))
+
 # IRIS CRM API Client (simplified version for Edge Function)
 class IrelandPayCRMClient:
     """Ireland Pay CRM API Client for Edge Functions"""
@@ -237,7 +241,7 @@ class IrelandPayCRMSync:
             per_page = 100
             total_pages = 1
             merchant_batch = []
-            batch_size = 50  # Process in smaller batches for better error handling
+            batch_size = UPSERT_BATCH_SIZE
             
             # Fetch and process merchants page by page
             while page <= total_pages:
@@ -405,7 +409,7 @@ class IrelandPayCRMSync:
             
             # Process residuals in batches for better performance and error handling
             residual_batch = []
-            batch_size = 100
+            batch_size = UPSERT_BATCH_SIZE
             
             for residual in residuals:
                 try:
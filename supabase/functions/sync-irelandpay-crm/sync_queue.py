@@ -26,7 +26,7 @@ class SyncQueue:
         """
         try:
             # Get all pending or running jobs from the queue
-            response = self.supabase.table("sync_queue").select("*").in_("status", ["pending", "running"]).execute()
+            response = self.supabase.table("sync_queue").select("id, parameters, status, retry_count, next_retry, last_error").in_("status", ["pending", "running"]).execute()
             
             if response.get("error"):
                 logger.error(f"Error loading sync queue: {response.get('error')}")
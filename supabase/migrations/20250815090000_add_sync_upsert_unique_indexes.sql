@@ -0,0 +1,36 @@
+-- Unique indexes backing the CRM sync's native upserts (INSERT ... ON CONFLICT)
+-- PostgREST's on_conflict needs a unique index on exactly these columns; a table
+-- missing here is reported, since the sync's upserts into it fail with 42P10
+BEGIN;
+
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT FROM information_schema.columns
+    WHERE table_schema = 'public' AND table_name = 'merchants' AND column_name = 'mid'
+  ) THEN
+    EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS merchants_mid_key ON public.merchants (mid)';
+  ELSE
+    RAISE NOTICE 'merchants.mid not found. Unique index merchants_mid_key not created; merchant upserts on mid will fail.';
+  END IF;
+END $$;
+
+DO $$
+BEGIN
+  IF to_regclass('public.residual_payouts') IS NOT NULL THEN
+    EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS residual_payouts_mid_payout_month_key ON public.residual_payouts (mid, payout_month)';
+  ELSE
+    RAISE NOTICE 'residual_payouts table not found. Unique index residual_payouts_mid_payout_month_key not created; residual upserts will fail.';
+  END IF;
+END $$;
+
+DO $$
+BEGIN
+  IF to_regclass('public.merchant_metrics') IS NOT NULL THEN
+    EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS merchant_metrics_mid_month_key ON public.merchant_metrics (mid, month)';
+  ELSE
+    RAISE NOTICE 'merchant_metrics table not found. Unique index merchant_metrics_mid_month_key not created; volume upserts will fail.';
+  END IF;
+END $$;
+
+COMMIT;
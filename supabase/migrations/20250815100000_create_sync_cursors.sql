@@ -0,0 +1,14 @@
+-- Incremental sync cursors: the newest source `modified` timestamp each sync has
+-- fully written, so the next run only fetches rows changed since then
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.sync_cursors (
+    entity TEXT PRIMARY KEY, -- e.g., 'merchants'
+    last_modified TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Only the service role (which bypasses RLS) reads and writes cursors
+ALTER TABLE public.sync_cursors ENABLE ROW LEVEL SECURITY;
+
+COMMIT;
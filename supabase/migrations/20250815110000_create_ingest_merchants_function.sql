@@ -0,0 +1,47 @@
+-- Bulk merchant ingest for the CRM sync: one RPC call merges a whole batch of
+-- merchants with a single INSERT ... SELECT ... ON CONFLICT, so large catch-up
+-- syncs need a handful of calls instead of one PostgREST upsert per 500 rows
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.ingest_merchants(rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path TO public
+AS $$
+DECLARE
+  ingested integer;
+BEGIN
+  INSERT INTO public.merchants (
+    mid, datasource, merchant_dba, opened, closed, status, active, "group",
+    processor, sic_code, vim, created, modified, synced_at
+  )
+  SELECT
+    mid, datasource, merchant_dba, opened, closed, status, active, "group",
+    processor, sic_code, vim, created, modified, synced_at
+  FROM jsonb_populate_recordset(NULL::public.merchants, rows)
+  ON CONFLICT (mid) DO UPDATE SET
+    datasource = EXCLUDED.datasource,
+    merchant_dba = EXCLUDED.merchant_dba,
+    opened = EXCLUDED.opened,
+    closed = EXCLUDED.closed,
+    status = EXCLUDED.status,
+    active = EXCLUDED.active,
+    "group" = EXCLUDED."group",
+    processor = EXCLUDED.processor,
+    sic_code = EXCLUDED.sic_code,
+    vim = EXCLUDED.vim,
+    created = EXCLUDED.created,
+    modified = EXCLUDED.modified,
+    synced_at = EXCLUDED.synced_at;
+
+  GET DIAGNOSTICS ingested = ROW_COUNT;
+  RETURN ingested;
+END;
+$$;
+
+-- Only the sync (service role) may bulk-write merchants
+REVOKE ALL ON FUNCTION public.ingest_merchants(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ingest_merchants(jsonb) TO service_role;
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Unique indexes backing the CRM edge sync's bulk monthly upserts
+-- (on_conflict merchant_id,processing_month); residuals already has the
+-- constraint where it was created by create_ireland_pay_crm_tables.sql
+BEGIN;
+
+DO $$
+BEGIN
+  IF to_regclass('public.residuals') IS NOT NULL THEN
+    EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS residuals_merchant_id_processing_month_key ON public.residuals (merchant_id, processing_month)';
+  END IF;
+END $$;
+
+DO $$
+BEGIN
+  IF to_regclass('public.merchant_processing_volumes') IS NOT NULL THEN
+    EXECUTE 'CREATE UNIQUE INDEX IF NOT EXISTS merchant_processing_volumes_merchant_id_processing_month_key ON public.merchant_processing_volumes (merchant_id, processing_month)';
+  END IF;
+END $$;
+
+COMMIT;
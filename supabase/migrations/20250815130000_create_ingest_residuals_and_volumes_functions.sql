@@ -0,0 +1,74 @@
+-- Bulk residual and volume ingest for the CRM sync, following ingest_merchants:
+-- one RPC call merges a whole batch with a single INSERT ... SELECT ... ON
+-- CONFLICT. PL/pgSQL caches the statement's plan per connection, so repeated
+-- batches skip the parse/plan work PostgREST repeats for every upsert
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.ingest_residual_payouts(rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path TO public
+AS $$
+DECLARE
+  ingested integer;
+BEGIN
+  INSERT INTO public.residual_payouts (
+    mid, merchant_dba, payout_month, transactions, sales_amount, income, expenses,
+    net_profit, bps, commission_pct, agent_net, source, synced_at
+  )
+  SELECT
+    mid, merchant_dba, payout_month, transactions, sales_amount, income, expenses,
+    net_profit, bps, commission_pct, agent_net, source, synced_at
+  FROM jsonb_populate_recordset(NULL::public.residual_payouts, rows)
+  ON CONFLICT (mid, payout_month) DO UPDATE SET
+    merchant_dba = EXCLUDED.merchant_dba,
+    transactions = EXCLUDED.transactions,
+    sales_amount = EXCLUDED.sales_amount,
+    income = EXCLUDED.income,
+    expenses = EXCLUDED.expenses,
+    net_profit = EXCLUDED.net_profit,
+    bps = EXCLUDED.bps,
+    commission_pct = EXCLUDED.commission_pct,
+    agent_net = EXCLUDED.agent_net,
+    source = EXCLUDED.source,
+    synced_at = EXCLUDED.synced_at;
+
+  GET DIAGNOSTICS ingested = ROW_COUNT;
+  RETURN ingested;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.ingest_merchant_metrics(rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path TO public
+AS $$
+DECLARE
+  ingested integer;
+BEGIN
+  INSERT INTO public.merchant_metrics (
+    mid, month, total_txns, total_volume, source, synced_at
+  )
+  SELECT
+    mid, month, total_txns, total_volume, source, synced_at
+  FROM jsonb_populate_recordset(NULL::public.merchant_metrics, rows)
+  ON CONFLICT (mid, month) DO UPDATE SET
+    total_txns = EXCLUDED.total_txns,
+    total_volume = EXCLUDED.total_volume,
+    source = EXCLUDED.source,
+    synced_at = EXCLUDED.synced_at;
+
+  GET DIAGNOSTICS ingested = ROW_COUNT;
+  RETURN ingested;
+END;
+$$;
+
+-- Only the sync (service role) may bulk-write residuals and volumes
+REVOKE ALL ON FUNCTION public.ingest_residual_payouts(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ingest_residual_payouts(jsonb) TO service_role;
+REVOKE ALL ON FUNCTION public.ingest_merchant_metrics(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ingest_merchant_metrics(jsonb) TO service_role;
+
+COMMIT;
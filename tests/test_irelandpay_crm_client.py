@@ -0,0 +1,549 @@
+"""
+Unit tests for the Ireland Pay CRM API client.
+"""
+import io
+import os
+import sys
+import json
+import asyncio
+import httpx
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.irelandpay_crm_client import (
+    IrelandPayCRMClient,
+    AsyncIrelandPayCRMClient,
+    FatalError,
+    RateLimitedError,
+    RetryableError,
+)
+from lib.irelandpay_crm_client.exceptions import parse_retry_after
+
+BASE_URL = "https://crm.ireland-pay.com/api/v1"
+
+
+class TestIrelandPayCRMClient:
+    """Test cases for the IrelandPayCRMClient class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = IrelandPayCRMClient(api_key="test_api_key")
+
+    def test_session_uses_pooled_keep_alive_adapter(self):
+        """Test that both schemes share one adapter with an enlarged pool."""
+        https_adapter = self.client.session.get_adapter("https://crm.ireland-pay.com")
+        http_adapter = self.client.session.get_adapter("http://crm.ireland-pay.com")
+
+        assert https_adapter is http_adapter
+        assert https_adapter._pool_connections == IrelandPayCRMClient.POOL_CONNECTIONS
+        assert https_adapter._pool_maxsize == IrelandPayCRMClient.POOL_MAXSIZE
+        assert https_adapter.max_retries.total == IrelandPayCRMClient.RETRY_TOTAL
+        assert self.client.session.headers["Connection"] == "keep-alive"
+
+    def test_pool_can_be_sized_for_concurrent_callers(self):
+        """Test that a custom pool size reaches the session adapter."""
+        client = IrelandPayCRMClient(api_key="test_api_key", pool_maxsize=128)
+        adapter = client.session.get_adapter("https://crm.ireland-pay.com")
+
+        assert adapter._pool_maxsize == 128
+
+    @responses.activate
+    def test_compressed_responses_are_decoded(self):
+        """Test that compression is advertised and gzip bodies are decoded transparently."""
+        import gzip
+
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123",
+                      body=gzip.compress(b'{"data": {"mid": "123"}}'),
+                      headers={"Content-Encoding": "gzip"}, status=200)
+
+        result = self.client.get_merchant("123")
+
+        assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+        assert result == {"data": {"mid": "123"}}
+
+    @responses.activate
+    def test_errors_are_categorized_by_status(self):
+        """Test that client errors are fatal while outages and server errors are retryable."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/404", body=b"missing" * 100, status=404)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/503", status=503)
+        self.client.session.get_adapter(BASE_URL).max_retries.backoff_factor = 0
+
+        with pytest.raises(FatalError) as fatal:
+            self.client.get_merchant("404")
+        assert fatal.value.status_code == 404
+        assert fatal.value.body == (b"missing" * 100)[:IrelandPayCRMClient.ERROR_BODY_LIMIT]
+
+        with pytest.raises(RetryableError) as retryable:
+            self.client.get_merchant("503")
+        assert retryable.value.status_code == 503
+
+        # Unregistered URLs raise ConnectionError, i.e. no response at all
+        with pytest.raises(RetryableError) as unreachable:
+            self.client.get_lead("1")
+        assert unreachable.value.status_code is None
+
+    @responses.activate
+    def test_rate_limited_errors_carry_retry_after(self):
+        """Test that a 429 with Retry-After tells the caller how long to wait."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123", status=429,
+                      headers={"Retry-After": "0"})
+        self.client.session.get_adapter(BASE_URL).max_retries.backoff_factor = 0
+
+        with pytest.raises(RateLimitedError) as limited:
+            self.client.get_merchant("123")
+
+        assert limited.value.status_code == 429
+        assert limited.value.retry_after == 0.0
+        # The caller waits out Retry-After; the adapter doesn't retry it first
+        assert len(responses.calls) == 1
+
+    def test_parse_retry_after_accepts_seconds_and_dates(self):
+        """Test that both Retry-After formats become a non-negative delay."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_deadline_caps_request_timeouts(self):
+        """Test that requests inside a deadline never wait past it."""
+        import time
+
+        with patch.object(self.client.session, "request", side_effect=requests.exceptions.Timeout) as request:
+            with self.client.deadline(time.monotonic() + 2):
+                with pytest.raises(RetryableError):
+                    self.client.get_lead("1")
+            with pytest.raises(RetryableError):
+                self.client.get_lead("2")
+
+        connect_timeout, read_timeout = request.call_args_list[0].kwargs["timeout"]
+        assert connect_timeout <= 2 and read_timeout <= 2
+        assert request.call_args_list[1].kwargs["timeout"] == self.client.timeout
+
+    def test_deadline_reaches_pooled_requests(self):
+        """Test that requests fanned out over a thread pool keep the caller's deadline."""
+        import time
+
+        with patch.object(self.client.session, "request", side_effect=requests.exceptions.Timeout) as request:
+            with self.client.deadline(time.monotonic() + 2):
+                with pytest.raises(RetryableError):
+                    self.client.get_merchants_bulk(["1", "2", "3"])
+
+        assert request.call_args_list
+        for call in request.call_args_list:
+            connect_timeout, read_timeout = call.kwargs["timeout"]
+            assert connect_timeout <= 2 and read_timeout <= 2
+
+    @responses.activate
+    def test_on_response_reports_each_request(self):
+        """Test that the metrics callback sees every request but not cache hits."""
+        seen = []
+        client = IrelandPayCRMClient(api_key="test_api_key",
+                                     on_response=lambda *info: seen.append(info))
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications", body=b'{"id": 1}', status=200)
+        responses.add(responses.GET, f"{BASE_URL}/leads/2", status=404)
+        
+        client.get_applications()
+        client.get_applications()
+        with pytest.raises(FatalError):
+            client.get_lead("2")
+
+        assert [(status, size) for status, size, _ in seen] == [(200, 9), (404, 0)]
+        assert all(elapsed >= 0 for _, _, elapsed in seen)
+
+    @responses.activate
+    def test_error_statuses_are_left_to_the_caller(self):
+        """Test that a 502 surfaces after one request instead of being retried in the pool."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123", status=502)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123", json={"data": {}}, status=200)
+        retry = self.client.session.get_adapter(BASE_URL).max_retries
+
+        with pytest.raises(RetryableError):
+            self.client.get_merchant("123")
+
+        assert len(responses.calls) == 1
+        assert retry.connect == IrelandPayCRMClient.RETRY_TOTAL
+        assert retry.read == 0
+
+    @responses.activate
+    def test_make_request_returns_json(self):
+        """Test that a successful request returns the decoded body."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123",
+                      json={"data": {"merchant_number": "123"}}, status=200)
+
+        result = self.client.get_merchant("123")
+
+        assert result == {"data": {"merchant_number": "123"}}
+        assert responses.calls[0].request.headers["X-API-KEY"] == "test_api_key"
+
+    @responses.activate
+    def test_undecodable_bodies_are_categorized(self):
+        """Test that a 200 without valid JSON raises instead of a bare ValueError."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/html",
+                      body="<html>Maintenance</html>", status=200)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/cut",
+                      body='{"data": {"merchant_numb', status=200)
+        
+        with pytest.raises(FatalError) as html:
+            self.client.get_merchant("html")
+        with pytest.raises(RetryableError) as truncated:
+            self.client.get_merchant("cut")
+        
+        assert html.value.body.startswith(b"<html>")
+        assert "<html>Maintenance" in str(html.value)
+        assert truncated.value.status_code == 200
+    
+    @responses.activate
+    def test_get_merchants_fetch_all_merges_pages_in_order(self):
+        """Test that fetch_all requests every page and keeps page order."""
+        def page_callback(request):
+            page = int(request.params["page"])
+            body = {"data": [{"mid": f"m{page}"}], "meta": {"current_page": page, "last_page": "3"}}
+            return (200, {}, json.dumps(body))
+
+        responses.add_callback(responses.GET, f"{BASE_URL}/merchants", callback=page_callback)
+
+        result = self.client.get_merchants(per_page=1, fetch_all=True, group="retail")
+
+        assert result == {"data": [{"mid": "m1"}, {"mid": "m2"}, {"mid": "m3"}]}
+        assert len(responses.calls) == 3
+        assert all(call.request.params["group"] == "retail" for call in responses.calls)
+        assert all(call.request.params["per_page"] == str(IrelandPayCRMClient.MAX_PER_PAGE)
+                   for call in responses.calls)
+
+    @responses.activate
+    def test_get_merchants_modified_since_filters_by_modified_date(self):
+        """Test that modified_since becomes the API's modified date filter."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants", json={"data": []}, status=200)
+
+        self.client.get_merchants(modified_since="2024-01-02T06:00:00+00:00")
+
+        params = responses.calls[0].request.params
+        assert params["date_filter"] == "modified"
+        assert params["start_date"] == "2024-01-02T06:00:00+00:00"
+        assert "%2B00%3A00" in responses.calls[0].request.url
+
+    @responses.activate
+    def test_paginate_all_single_page(self):
+        """Test that a single page result makes one request."""
+        responses.add(responses.GET, f"{BASE_URL}/leads",
+                      json={"data": [{"id": 1}], "meta": {"last_page": 1}}, status=200)
+
+        assert self.client.paginate_all("/leads") == [{"id": 1}]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_download_statement_streams_into_dest(self):
+        """Test that a statement download is streamed into the given file object."""
+        content = b"%PDF-" + b"x" * (IrelandPayCRMClient.DOWNLOAD_CHUNK_SIZE * 2 + 10)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123/statements/9",
+                      body=content, status=200)
+
+        dest = io.BytesIO()
+        result = self.client.download_statement("123", "9", dest=dest)
+
+        assert result is None
+        assert dest.getvalue() == content
+
+    @responses.activate
+    def test_download_statements_writes_each_file(self, tmp_path):
+        """Test that a batch of statements is downloaded into one file per job."""
+        for merchant_number, statement_id in [("1", "a"), ("2", "b")]:
+            responses.add(responses.GET, f"{BASE_URL}/merchants/{merchant_number}/statements/{statement_id}",
+                          body=f"statement {statement_id}".encode(), status=200)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/3/statements/c", status=404)
+
+        paths = self.client.download_statements([("1", "a"), ("2", "b")], str(tmp_path / "out"))
+
+        assert [os.path.basename(path) for path in paths] == ["1_a", "2_b"]
+        assert open(paths[1], "rb").read() == b"statement b"
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            self.client.download_statements([("3", "c")], str(tmp_path / "out"))
+        assert not os.path.exists(tmp_path / "out" / "3_c")
+
+    @responses.activate
+    def test_download_esignature_document_returns_bytes(self):
+        """Test that downloads without a dest still return the content."""
+        responses.add(responses.GET, f"{BASE_URL}/leads/signatures/5/download",
+                      body=b"signed", status=200)
+
+        assert self.client.download_esignature_document("5") == b"signed"
+
+    def test_requests_pass_default_timeout(self):
+        """Test that every API request carries a (connect, read) timeout."""
+        with patch.object(self.client.session, "request") as mock_request:
+            mock_request.return_value.content = b""
+            self.client.get_merchant("123")
+
+        assert mock_request.call_args[1]["timeout"] == IrelandPayCRMClient.DEFAULT_TIMEOUT
+
+    def test_timeout_override(self):
+        """Test that a client-level timeout replaces the default."""
+        client = IrelandPayCRMClient(api_key="test_api_key", timeout=(1, 2))
+
+        with patch.object(client.session, "request") as mock_request:
+            mock_request.return_value.content = b""
+            client.get_merchant("123")
+
+        assert mock_request.call_args[1]["timeout"] == (1, 2)
+
+    @responses.activate
+    def test_request_body_is_sent_as_json(self):
+        """Test that write requests serialize the body as JSON."""
+        responses.add(responses.PATCH, f"{BASE_URL}/merchants/123",
+                      json={"data": {"dba": "Café"}}, status=200)
+
+        result = self.client.update_merchant("123", {"dba": "Café"})
+
+        request = responses.calls[0].request
+        assert json.loads(request.body) == {"dba": "Café"}
+        assert request.headers["Content-Type"] == "application/json"
+        assert result == {"data": {"dba": "Café"}}
+
+    @responses.activate
+    def test_repeated_gets_are_served_from_cache(self):
+        """Test that identical reference data GETs within the TTL hit the API once."""
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications",
+                      json={"data": [{"id": 1}]}, status=200)
+        
+        first = self.client.get_applications()
+        second = self.client.get_applications()
+        
+        assert first == second
+        assert len(responses.calls) == 1
+    
+    @responses.activate
+    def test_record_reads_are_not_cached_by_default(self):
+        """Test that merchant reads always see the API's current state."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123",
+                      json={"data": {"merchant_number": "123"}}, status=200)
+        
+        self.client.get_merchant("123")
+        self.client.get_merchant("123")
+        
+        assert len(responses.calls) == 2
+    
+    @responses.activate
+    def test_cached_responses_are_not_shared(self):
+        """Test that changing a returned response doesn't change the cached one."""
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications",
+                      json={"data": [{"id": 1}]}, headers={"ETag": '"v1"'}, status=200)
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications", status=304)
+        
+        self.client.get_applications()["data"].append({"id": 2})
+        cached = self.client.get_applications()
+        cached["data"].clear()
+        revalidated = self.client._make_request("GET", "/leads/applications", cache_ttl=0)
+        
+        assert self.client.get_applications() == {"data": [{"id": 1}]}
+        assert revalidated == {"data": [{"id": 1}]}
+    
+    @responses.activate
+    def test_write_request_clears_cache(self):
+        """Test that a write invalidates cached GET responses."""
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications", json={"data": []}, status=200)
+        responses.add(responses.PATCH, f"{BASE_URL}/merchants/123", json={"data": {}}, status=200)
+        
+        self.client.get_applications()
+        self.client.update_merchant("123", {"dba": "New Name"})
+        self.client.get_applications()
+        
+        assert [call.request.method for call in responses.calls] == ["GET", "PATCH", "GET"]
+
+    @responses.activate
+    def test_unchanged_resource_is_revalidated_with_etag(self):
+        """Test that a 304 Not Modified returns the body stored with the ETag."""
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications",
+                      json={"data": [{"id": 1}]}, headers={"ETag": '"v1"'}, status=200)
+        responses.add(responses.GET, f"{BASE_URL}/leads/applications", status=304)
+
+        first = self.client._make_request("GET", "/leads/applications", cache_ttl=0)
+        second = self.client._make_request("GET", "/leads/applications", cache_ttl=0)
+
+        assert first == second == {"data": [{"id": 1}]}
+        assert "If-None-Match" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+    @responses.activate
+    def test_list_filters_are_sent_as_repeated_params(self):
+        """Test that a list-valued filter reaches the API instead of breaking the cache key."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants", json={"data": []}, status=200)
+        
+        self.client.get_merchants(status=["active", "closed"])
+        
+        assert "status=active&status=closed" in responses.calls[0].request.url
+    
+    @responses.activate
+    def test_cache_ttl_zero_bypasses_cache(self):
+        """Test that cache_ttl=0 always goes to the API."""
+        responses.add(responses.GET, f"{BASE_URL}/leads", json={"data": []}, status=200)
+
+        self.client._make_request("GET", "/leads", cache_ttl=0)
+        self.client._make_request("GET", "/leads", cache_ttl=0)
+
+        assert len(responses.calls) == 2
+
+
+    @responses.activate
+    def test_get_volumes_summary_collects_rows_from_every_processor(self):
+        """Test that the volumes summary pages through the merchant rows of each processor."""
+        responses.add(responses.GET, f"{BASE_URL}/residuals/reports/summary/2024/12",
+                      json={"data": [{"processor_id": 1}, {"processor_id": 2}]}, status=200)
+        responses.add(responses.GET, f"{BASE_URL}/residuals/reports/summary/rows/1/2024/12",
+                      json={"data": [{"mid": 10, "transactions": 3, "sales_amount": 300}]}, status=200)
+        responses.add(responses.GET, f"{BASE_URL}/residuals/reports/summary/rows/2/2024/12",
+                      json={"data": [{"mid": 11, "transactions": 1, "sales_amount": 50}]}, status=200)
+
+        result = self.client.get_volumes_summary(2024, 12)
+
+        assert [row["mid"] for row in result["data"]] == [10, 11]
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_get_merchants_bulk_deduplicates_ids(self):
+        """Test that bulk lookups fetch each merchant once and key results by ID."""
+        for mid in ["1", "2"]:
+            responses.add(responses.GET, f"{BASE_URL}/merchants/{mid}",
+                          json={"data": {"mid": mid}}, status=200)
+
+        result = self.client.get_merchants_bulk(["1", "2", "1"])
+
+        assert result == {"1": {"data": {"mid": "1"}}, "2": {"data": {"mid": "2"}}}
+        assert len(responses.calls) == 2
+        assert self.client.get_merchants_bulk([]) == {}
+
+
+    @responses.activate
+    def test_chargeback_date_window_is_sent_to_api(self):
+        """Test that date filters are forwarded and unset filters are omitted."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/123/chargebacks",
+                      json={"data": []}, status=200)
+
+        self.client.get_merchant_chargebacks("123", start_date="2023-05-01")
+
+        params = responses.calls[0].request.params
+        assert params["start_date"] == "2023-05-01"
+        assert "end_date" not in params
+
+
+    def test_generated_endpoints_build_paths_and_bodies(self):
+        """Test that table-generated endpoint methods call the right paths."""
+        with patch.object(self.client, "_make_request", return_value={}) as mock_request:
+            self.client.get_residuals_summary(year=2023, month=5)
+            self.client.add_ticket_comment("42", {"comment": "hi"})
+            self.client.get_applications()
+
+        assert mock_request.call_args_list[0] == (("GET", "/residuals/reports/summary/2023/5"),)
+        assert mock_request.call_args_list[1] == (("POST", "/helpdesk/42/comment"), {"data": {"comment": "hi"}})
+        assert mock_request.call_args_list[2] == (
+            ("GET", "/leads/applications"), {"cache_ttl": IrelandPayCRMClient.STATIC_CACHE_TTL}
+        )
+
+
+    def test_default_list_params_are_shared(self):
+        """Test that default list requests reuse one params mapping and filters get their own."""
+        with patch.object(self.client, "_make_request", return_value={}) as mock_request:
+            self.client.get_merchants()
+            self.client.get_leads()
+            self.client.get_leads(status="open", group=None)
+
+        first, second, filtered = (call[1]["params"] for call in mock_request.call_args_list)
+        assert first is second
+        assert dict(first) == {"page": 1, "per_page": 100}
+        assert filtered == {"page": 1, "per_page": 100, "status": "open"}
+
+    @responses.activate
+    def test_custom_base_url_trailing_slash(self):
+        """Test that a trailing slash on a custom base URL is not doubled."""
+        client = IrelandPayCRMClient(api_key="test_api_key", base_url="https://crm.example.com/api/")
+        responses.add(responses.GET, "https://crm.example.com/api/leads/7", json={}, status=200)
+
+        client.get_lead("7")
+
+        assert responses.calls[0].request.url == "https://crm.example.com/api/leads/7"
+
+
+    @responses.activate
+    def test_record_keys_are_shared_across_responses(self):
+        """Test that records from separate responses share interned key strings."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1/chargebacks",
+                      json={"data": [{"merchant_number": "1"}]}, status=200)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/2/chargebacks",
+                      json={"data": [{"merchant_number": "2"}]}, status=200)
+
+        with patch("lib.irelandpay_crm_client.client.orjson", None):
+            first = self.client.get_merchant_chargebacks("1")["data"][0]
+            second = self.client.get_merchant_chargebacks("2")["data"][0]
+
+        first_key, = first
+        second_key, = second
+        assert first_key is second_key
+        assert second == {"merchant_number": "2"}
+
+
+class TestAsyncIrelandPayCRMClient:
+    """Test cases for the AsyncIrelandPayCRMClient class."""
+
+    def test_concurrent_requests_share_one_client(self):
+        """Test that gathered requests all go through the same pooled client."""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            merchant_number = request.url.path.split("/")[-2]
+            return httpx.Response(200, json={"data": [{"mid": merchant_number, "amount": 1}]})
+
+        async def run():
+            async with AsyncIrelandPayCRMClient(
+                api_key="test_api_key", transport=httpx.MockTransport(handler)
+            ) as client:
+                return await asyncio.gather(*(
+                    client.get_merchant_transactions(mid, start_date="2023-05-01")
+                    for mid in ["1", "2", "3"]
+                ))
+
+        results = asyncio.run(run())
+
+        assert [r["data"][0]["mid"] for r in results] == ["1", "2", "3"]
+        assert all(r.headers["X-API-KEY"] == "test_api_key" for r in seen)
+        assert all(r.url.params["start_date"] == "2023-05-01" for r in seen)
+
+    def test_http_errors_are_categorized_by_status(self):
+        """Test that error statuses propagate as retryable or fatal errors."""
+        statuses = {"missing": 404, "busy": 503}
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(statuses[request.url.path.split("/")[-1]], json={})
+        )
+
+        async def run(merchant_number):
+            async with AsyncIrelandPayCRMClient(api_key="test_api_key", transport=transport) as client:
+                await client.get_merchant(merchant_number)
+
+        with pytest.raises(FatalError) as fatal:
+            asyncio.run(run("missing"))
+        with pytest.raises(RetryableError) as retryable:
+            asyncio.run(run("busy"))
+
+        assert fatal.value.status_code == 404
+        assert retryable.value.status_code == 503
+    
+    def test_undecodable_bodies_are_categorized_async(self):
+        """Test that the async client categorizes a 200 without valid JSON too."""
+        bodies = {"html": b"<html>Maintenance</html>", "cut": b'{"data": [1,'}
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=bodies[request.url.path.split("/")[-1]])
+        )
+        
+        async def run(merchant_number):
+            async with AsyncIrelandPayCRMClient(api_key="test_api_key", transport=transport) as client:
+                await client.get_merchant(merchant_number)
+        
+        with pytest.raises(FatalError):
+            asyncio.run(run("html"))
+        with pytest.raises(RetryableError):
+            asyncio.run(run("cut"))
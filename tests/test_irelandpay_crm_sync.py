@@ -1,22 +1,38 @@
 import os
 import time
+import asyncio
+import threading
 import pytest
 import responses
 from unittest.mock import patch, MagicMock, call
 import json
+import sys
+import types
 from datetime import datetime
 
+# lib/supabase is the TypeScript client; give the sync module a stand-in to import
+_supabase_stub = types.ModuleType("lib.supabase")
+_supabase_stub.createSupabaseServiceClient = MagicMock()
+sys.modules.setdefault("lib.supabase", _supabase_stub)
+
 # Import the module to test
 from lib.irelandpay_crm_sync import (
     IrelandPayCRMSyncManager,
     CircuitBreaker,
+    RedisCircuitBreaker,
     RetryableError,
     FatalError,
-    IRISCRMError,
     MAX_RETRIES,
     BACKOFF_BASE_MS,
-    TIMEOUT_SECONDS
+    TIMEOUT_SECONDS,
+    CIRCUIT_RESET_SECONDS,
+    CIRCUIT_MAX_FAILURES,
+    PREFETCH_PAGES,
+    _sync_deadline,
+    _with_sync_deadline
 )
+from postgrest.exceptions import APIError
+from tenacity import stop_after_attempt, wait_none
 
 # Setup mock environment variables for testing
 @pytest.fixture(autouse=True)
@@ -70,86 +86,83 @@ def mock_iris_client():
 def sync_manager(mock_supabase, mock_iris_client):
     # Mock the createSupabaseServiceClient and IrelandPayCRMClient
     with patch('lib.irelandpay_crm_sync.createSupabaseServiceClient', return_value=mock_supabase):
-        with patch('lib.irelandpay_crm_sync.IrelandPayCRMClient', return_value=mock_iris_client):
-            manager = IrelandPayCRMSyncManager()
-            # Reset circuit breaker state before each test
-            CircuitBreaker._instance = None
-            CircuitBreaker._failures = 0
-            CircuitBreaker._is_open = False
-            CircuitBreaker._last_failure_time = None
-            yield manager
+        with patch('lib.irelandpay_crm_sync.IrelandPayCRMClient', MagicMock(
+            return_value=mock_iris_client, POOL_MAXSIZE=10, MAX_PER_PAGE=100
+        )):
+            # Retry immediately so the tests don't sleep through backoff waits
+            with patch('lib.irelandpay_crm_sync.RETRY_WAIT', wait_none()):
+                manager = IrelandPayCRMSyncManager()
+                # Reset circuit breaker state before each test; it lives on the singleton instance
+                CircuitBreaker._instance = None
+                yield manager
 
 # Test retry logic success on second attempt
 @responses.activate
-@pytest.mark.asyncio
-async def test_retry_success_on_second_attempt(sync_manager, mock_iris_client):
-    # Setup the mock to fail once then succeed
-    mock_iris_client.get_merchants.side_effect = [
-        RetryableError("Network error"),
-        {'data': [{'merchantNumber': '12345', 'dbaName': 'Test Merchant 1'}]}
-    ]
+def test_retry_success_on_second_attempt(sync_manager, mock_iris_client):
+    # Setup the mock to fail page 1 once then succeed; prefetched later pages are empty
+    page_one_calls = []
+    
+    def get_merchants(page, **kwargs):
+        if page != 1:
+            return {'data': []}
+        page_one_calls.append(page)
+        if len(page_one_calls) == 1:
+            raise RetryableError("Network error")
+        return {'data': [{'mid': '12345', 'name': 'Test Merchant 1'}]}
+    
+    mock_iris_client.get_merchants.side_effect = get_merchants
     
     # Execute with resilience should retry and eventually succeed
-    result = await sync_manager.sync_merchants()
+    result = sync_manager.sync_merchants()
     
-    # Verify function was called twice (original + 1 retry)
-    assert mock_iris_client.get_merchants.call_count == 2
+    # Verify page 1 was requested twice (original + 1 retry)
+    assert len(page_one_calls) == 2
     
     # Check that the final result indicates success
     assert result["total_merchants"] == 1
-    assert result["merchants_added"] == 1
+    assert result["merchants_upserted"] == 1
     assert len(result["errors"]) == 0
 
 # Test circuit breaker opening after max failures
 @responses.activate
-@pytest.mark.asyncio
-async def test_circuit_breaker_opens_after_max_failures(sync_manager, mock_iris_client):
+def test_circuit_breaker_opens_after_max_failures(sync_manager, mock_iris_client):
     # Set up the mock to always fail with a retryable error
     mock_iris_client.get_merchants.side_effect = RetryableError("Server error 500")
     
-    # Create a custom execute_with_resilience function to track circuit state
     circuit_states = []
     
-    # Make multiple calls to observe circuit state changing
-    for _ in range(5):  # We expect circuit to open after 3 failures
-        try:
+    # Make one attempt per call to observe circuit state changing
+    with patch('lib.irelandpay_crm_sync.RETRY_STOP', stop_after_attempt(1)):
+        for _ in range(CIRCUIT_MAX_FAILURES + 1):
             # Call directly to see the circuit behavior
             sync_manager._execute_with_resilience(mock_iris_client.get_merchants)
-        except Exception:
-            # Just record the circuit state, don't care about exceptions here
-            pass
-        
-        circuit_states.append(CircuitBreaker.getInstance().is_open())
+            circuit_states.append(CircuitBreaker.getInstance().is_open())
     
-    # First calls should show circuit closed, then open
-    assert not circuit_states[0]  # First call - circuit closed
-    assert not circuit_states[1]  # Second call - circuit closed
-    assert circuit_states[3]      # Fourth call - circuit should be open now
-    assert circuit_states[4]      # Fifth call - circuit remains open
+    # The circuit stays closed until the last allowed failure, then stays open
+    assert not any(circuit_states[:CIRCUIT_MAX_FAILURES - 1])
+    assert all(circuit_states[CIRCUIT_MAX_FAILURES - 1:])
 
-# Test timeout triggering
+# Test that the sync deadline cuts retries short
 @responses.activate
-@pytest.mark.asyncio
-async def test_timeout_handling(sync_manager, mock_iris_client):
-    # Set up the mock to simulate a timeout
-    def sleep_then_return(*args, **kwargs):
-        time.sleep(0.1)  # Small sleep to simulate timeout
-        return {'data': []}
-    
-    # Mock the timeout duration to be shorter than our sleep for testing purposes
-    with patch('lib.iriscrm_sync.TIMEOUT_SECONDS', 0.05):
-        mock_iris_client.get_merchants.side_effect = sleep_then_return
-        
-        # Execute should catch the timeout
-        result = await sync_manager.sync_merchants()
+def test_timeout_handling(sync_manager, mock_iris_client):
+    # Set up the mock to simulate a slow request that times out
+    def time_out(*args, **kwargs):
+        time.sleep(0.1)
+        raise RetryableError("Request timed out")
+    
+    # Make the sync deadline shorter than one request
+    with patch('lib.irelandpay_crm_sync.SYNC_DEADLINE_SECONDS', 0.05):
+        mock_iris_client.get_merchants.side_effect = time_out
         
-        # Check the result indicates failure
-        assert len(result["errors"]) > 0
-        assert "timeout" in str(result["errors"]).lower() or "timed out" in str(result["errors"]).lower()
+        result = sync_manager.sync_merchants()
+    
+    # Each prefetched page is tried once instead of MAX_RETRIES times
+    assert mock_iris_client.get_merchants.call_count <= PREFETCH_PAGES
+    assert len(result["errors"]) > 0
+    assert "merchants page 1" in str(result["errors"])
 
 # Test proper error categorization (retry vs fail immediately)
-@pytest.mark.asyncio
-async def test_error_categorization(sync_manager):
+def test_error_categorization(sync_manager):
     # Create test functions that simulate different types of errors
     def raise_retryable_error():
         raise RetryableError("Should retry this")
@@ -158,31 +171,264 @@ async def test_error_categorization(sync_manager):
         raise FatalError("Should not retry this")
     
     # Test that retryable errors are retried
-    with patch('lib.iriscrm_sync.logger') as mock_logger:
+    with patch('lib.irelandpay_crm_sync.logger') as mock_logger:
         result = sync_manager._execute_with_resilience(raise_retryable_error)
         # Should log retry attempts
         assert any("retry" in str(call).lower() for call in mock_logger.warning.call_args_list)
     
     # Test that fatal errors fail immediately without retry
-    with patch('lib.iriscrm_sync.logger') as mock_logger:
+    with patch('lib.irelandpay_crm_sync.logger') as mock_logger:
         result = sync_manager._execute_with_resilience(raise_fatal_error)
         # Should not log retry attempts for fatal errors
         assert not any("retry" in str(call).lower() for call in mock_logger.warning.call_args_list)
-        assert "invalid" in result["error"].lower()
+        assert "non-retryable" in result["error"].lower()
 
 # Test graceful degradation when API is unavailable
-@pytest.mark.asyncio
-async def test_graceful_degradation(sync_manager, mock_iris_client):
+def test_graceful_degradation(sync_manager, mock_iris_client):
     # Set up the mock to always fail
     mock_iris_client.get_merchants.side_effect = RetryableError("API unavailable")
     
     # Execute should handle the failure gracefully
-    result = await sync_manager.sync_merchants()
+    result = sync_manager.sync_merchants()
     
     # Check we get error details
     assert result["total_merchants"] == 0
     assert len(result["errors"]) > 0
-    assert "unavailable" in str(result["errors"]).lower()
+    assert "failed to fetch merchants" in str(result["errors"]).lower()
+
+# Test that failed half-open probes back off the reset timeout
+def test_failed_probes_back_off_reset_timeout():
+    circuit = CircuitBreaker()
+    circuit._state = CircuitBreaker.HALF_OPEN
+    
+    circuit.record_failure()
+    first_backoff = circuit._reset_backoff
+    circuit._state = CircuitBreaker.HALF_OPEN
+    circuit.record_failure()
+    
+    assert circuit._reset_backoff == 2 * first_backoff
+    
+    # Once the timeout passes a probe is let through; success restores the base timeout
+    circuit._last_failure_time = time.monotonic() - circuit._reset_backoff - 1
+    assert not circuit.is_open()
+    circuit.record_success()
+    assert circuit._reset_backoff == CIRCUIT_RESET_SECONDS
+
+# Test that processes sharing Redis share one circuit
+def test_redis_circuit_is_shared_between_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first = RedisCircuitBreaker(fakeredis.FakeRedis(server=server))
+    second = RedisCircuitBreaker(fakeredis.FakeRedis(server=server))
+    
+    for _ in range(CIRCUIT_MAX_FAILURES):
+        first.record_failure()
+    
+    assert second.is_open()
+    
+    # Once the timeout passes only one process gets the probe
+    server_client = fakeredis.FakeRedis(server=server)
+    server_client.set(f"{RedisCircuitBreaker.KEY_PREFIX}:until", 0)
+    assert not second.is_open()
+    assert first.is_open()
+    
+    second.record_success()
+    assert not first.is_open()
+
+# Test that the breaker keeps working on local state while Redis is unreachable
+def test_redis_circuit_falls_back_to_local_state():
+    redis = pytest.importorskip("redis")
+    
+    class UnreachableRedis:
+        def register_script(self, script):
+            def run(**kwargs):
+                raise redis.ConnectionError("Timeout connecting to server")
+            return run
+        
+        def delete(self, *keys):
+            raise redis.ConnectionError("Timeout connecting to server")
+    
+    circuit = RedisCircuitBreaker(UnreachableRedis())
+    for _ in range(CIRCUIT_MAX_FAILURES):
+        assert not circuit.is_open()
+        circuit.record_failure()
+    
+    assert circuit.is_open()
+    
+    # Once the timeout passes the probe's success closes the local circuit
+    circuit._last_failure_time -= CIRCUIT_RESET_SECONDS + 1
+    assert not circuit.is_open()
+    circuit.record_success()
+    assert not circuit.is_open()
+
+# Test that async syncs check a network-backed breaker off the event loop
+def test_async_resilience_runs_blocking_breaker_on_a_thread(sync_manager):
+    threads = []
+    
+    class RemoteCircuitBreaker(CircuitBreaker):
+        BLOCKING = True
+        
+        def is_open(self):
+            threads.append(threading.current_thread())
+            return super().is_open()
+        
+        def record_success(self):
+            threads.append(threading.current_thread())
+            super().record_success()
+    
+    CircuitBreaker._instance = RemoteCircuitBreaker()
+    
+    async def operation():
+        return {"data": []}
+    
+    result = asyncio.run(sync_manager._execute_async_with_resilience(operation))
+    
+    assert result == {"data": []}
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+# Test that concurrent syncs don't reset each other's deadlines
+def test_concurrent_syncs_keep_their_own_deadlines():
+    @_with_sync_deadline
+    async def sync(delay):
+        started_with = _sync_deadline.get()
+        await asyncio.sleep(delay)
+        return started_with, _sync_deadline.get()
+    
+    async def run_both():
+        return await asyncio.gather(sync(0.05), sync(0))
+    
+    (first_start, first_end), (second_start, second_end) = asyncio.run(run_both())
+    
+    assert first_start == first_end
+    assert second_start == second_end
+    assert _sync_deadline.get() is None
+
+# Fake Supabase client whose upserts fail with a given database error code
+class FailingUpserts:
+    def __init__(self, code, bad_mid=None):
+        self.code = code
+        self.bad_mid = bad_mid
+        self.requests = []
+    
+    def table(self, name):
+        return self
+    
+    def rpc(self, name, params):
+        return self.upsert(params["rows"])
+    
+    def upsert(self, rows, **kwargs):
+        self.requests.append(rows)
+        self.rows = rows
+        return self
+    
+    def execute(self):
+        if self.bad_mid is None or any(row["mid"] == self.bad_mid for row in self.rows):
+            raise APIError({"code": self.code, "message": "rejected"})
+        return MagicMock(data=[])
+
+def new_results(kind):
+    return {f"total_{kind}": 0, f"{kind}_upserted": 0, f"{kind}_failed": 0, "errors": [], "errors_dropped": 0}
+
+# Test that a schema error fails the batch once instead of bisecting it
+def test_schema_error_fails_batch_without_bisecting(sync_manager):
+    sync_manager.supabase = FailingUpserts("42703")
+    rows = [{"mid": str(i)} for i in range(64)]
+    results = new_results("residuals")
+    
+    sync_manager._store_rows(sync_manager._upsert_residuals, rows, results, "residuals", "residual for merchant")
+    
+    # One ingest RPC, then one fallback upsert; neither is split up
+    assert len(sync_manager.supabase.requests) == 2
+    assert results["residuals_failed"] == 64
+    assert len(results["errors"]) == 1
+
+# Test that a row-level data error is isolated to the offending row
+def test_row_error_is_isolated_by_bisection(sync_manager):
+    sync_manager.supabase = FailingUpserts("23502", bad_mid="5")
+    rows = [{"mid": str(i)} for i in range(64)]
+    results = new_results("residuals")
+    
+    sync_manager._store_rows(sync_manager._upsert_residuals, rows, results, "residuals", "residual for merchant")
+    
+    assert results["residuals_upserted"] == 63
+    assert results["residuals_failed"] == 1
+    assert "residual for merchant 5" in results["errors"][0]
+
+# Test that a page listing a merchant twice is written once, with the last copy
+def test_repeated_merchant_is_written_once(sync_manager, mock_iris_client):
+    mock_iris_client.get_merchants.return_value = {"data": [
+        {"mid": "1", "name": "Old Name"},
+        {"mid": "2", "name": "Other"},
+        {"mid": None, "name": "No ID"},
+        {"mid": "1", "name": "New Name"}
+    ]}
+    sync_manager._get_sync_cursor = MagicMock(return_value=None)
+    sync_manager._set_sync_cursor = MagicMock()
+    sync_manager._upsert_merchants = MagicMock(return_value={"success": True, "failed": []})
+    
+    result = sync_manager.sync_merchants()
+    
+    written = sync_manager._upsert_merchants.call_args[0][0]
+    assert [(row["mid"], row["merchant_dba"]) for row in written] == [("2", "Other"), ("1", "New Name")]
+    assert result["total_merchants"] == 4
+    assert result["merchants_upserted"] == 2
+    assert result["merchants_failed"] == 2
+    assert len(result["errors"]) == 2
+
+# Test that an ingest function out of step with the tables falls back to upserts
+def test_unusable_ingest_rpc_falls_back_to_upserts(sync_manager):
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.side_effect = APIError({"code": "42703", "message": "column does not exist"})
+    sync_manager.supabase = supabase
+    
+    first = sync_manager._upsert_residuals([{"mid": "1"}])
+    second = sync_manager._upsert_residuals([{"mid": "2"}])
+    
+    assert first == second == {"success": True, "failed": []}
+    assert supabase.rpc.call_count == 1
+    assert "ingest_residual_payouts" in sync_manager.missing_ingest_rpcs
+
+# Stand-in for AsyncIrelandPayCRMClient that records the endpoints it is asked for
+class FakeAsyncClient:
+    def __init__(self, summary_rows):
+        self.summary_rows = summary_rows
+        self.calls = []
+    
+    async def get_volumes_summary(self, year, month):
+        self.calls.append("get_volumes_summary")
+        return {"data": self.summary_rows}
+    
+    async def get_merchant_transactions(self, merchant_number, start_date, end_date):
+        self.calls.append("get_merchant_transactions")
+        return {"data": [{"amount": 10}]}
+    
+    async def get_merchants(self, page, per_page):
+        self.calls.append("get_merchants")
+        return {"data": [{"mid": "1"}]}
+
+# Test that async volume syncs read the residuals summary before per-merchant transactions
+def test_async_volume_sync_uses_summary_first(sync_manager):
+    client = FakeAsyncClient([{"mid": "1", "transactions": 3, "sales_amount": 30.0}])
+    sync_manager._store_rows = MagicMock()
+    
+    result = asyncio.run(sync_manager.sync_volumes_async(2025, 6, client=client))
+    
+    assert result["errors"] == []
+    assert client.calls == ["get_volumes_summary"]
+    rows = sync_manager._store_rows.call_args[0][1]
+    assert [(row["mid"], row["total_txns"], row["total_volume"]) for row in rows] == [("1", 3, 30.0)]
+
+# Test that async volume syncs aggregate transactions for months without residuals rows
+def test_async_volume_sync_falls_back_to_transactions(sync_manager):
+    client = FakeAsyncClient([])
+    sync_manager._store_rows = MagicMock()
+    sync_manager._known_merchant_ids = MagicMock(return_value=["1"])
+    
+    asyncio.run(sync_manager.sync_volumes_async(2025, 6, client=client))
+    
+    assert client.calls == ["get_volumes_summary", "get_merchant_transactions"]
+    assert len(sync_manager._store_rows.call_args[0][1]) == 1
 
 if __name__ == "__main__":
     pytest.main(["-v"])
@@ -0,0 +1,346 @@
+"""
+Unit tests for the IRIS CRM API client.
+"""
+import os
+import sys
+import asyncio
+import json
+import httpx
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.iriscrm_client import (
+    IrelandPayCRMClient,
+    AsyncTokenBucket,
+    CircuitBreaker,
+    CircuitBreakerError,
+)
+
+BASE_URL = "https://crm.ireland-pay.com/api/v1"
+
+
+class TestIrelandPayCRMClient:
+    """Test cases for the client's synchronous requests."""
+
+    def test_session_uses_pooled_keep_alive_adapter(self):
+        """Test that both schemes share one enlarged connection pool."""
+        client = IrelandPayCRMClient(api_key="test_api_key")
+        adapter = client.session.get_adapter(BASE_URL)
+
+        assert adapter is client.session.get_adapter("http://crm.ireland-pay.com")
+        assert adapter._pool_connections == IrelandPayCRMClient.POOL_CONNECTIONS
+        assert adapter._pool_maxsize == IrelandPayCRMClient.POOL_MAXSIZE
+        assert client.session.headers["Connection"] == "keep-alive"
+
+    @responses.activate
+    def test_compressed_responses_are_decoded(self):
+        """Test that compression is advertised and gzip bodies are decoded transparently."""
+        import gzip
+
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1",
+                      body=gzip.compress(b'{"data": {"mid": "1"}}'),
+                      headers={"Content-Encoding": "gzip"})
+        client = IrelandPayCRMClient(api_key="test_api_key")
+
+        assert client.get_merchant("1") == {"data": {"mid": "1"}}
+        assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+
+    @responses.activate
+    def test_failed_gets_are_retried_by_the_session(self):
+        """Test that transient statuses are retried for GETs but not for POSTs."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1", status=503)
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1", json={"data": {"mid": "1"}})
+        responses.add(responses.POST, f"{BASE_URL}/leads", status=503)
+        client = IrelandPayCRMClient(api_key="test_api_key")
+        client.session.get_adapter(BASE_URL).max_retries.backoff_factor = 0
+
+        assert client.get_merchant("1") == {"data": {"mid": "1"}}
+        with pytest.raises(requests.exceptions.HTTPError):
+            client._make_request("POST", "/leads", data={})
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_json_bodies_are_encoded_and_decoded(self):
+        """Test that request bodies are sent as JSON and responses parsed, empty ones as {}."""
+        responses.add(responses.POST, f"{BASE_URL}/leads", json={"data": {"id": 7, "amount": 1.5}})
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1", body=b"", status=200)
+        responses.add(responses.DELETE, f"{BASE_URL}/leads/7", status=204)
+        client = IrelandPayCRMClient(api_key="test_api_key")
+
+        result = client._make_request("POST", "/leads", data={"name": "Test"})
+
+        assert result == {"data": {"id": 7, "amount": 1.5}}
+        assert json.loads(responses.calls[0].request.body) == {"name": "Test"}
+        assert responses.calls[0].request.headers["Content-Type"] == "application/json"
+        assert client.get_merchant("1") == {}
+        assert client._make_request("DELETE", "/leads/7") == {}
+
+    @responses.activate
+    def test_circuit_opens_after_consecutive_server_errors(self):
+        """Test that an open circuit fails requests without sending them."""
+        responses.add(responses.POST, f"{BASE_URL}/leads", status=500)
+        client = IrelandPayCRMClient(api_key="test_api_key")
+        client.breaker = CircuitBreaker(fail_max=2, reset_timeout=60)
+
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.HTTPError):
+                client._make_request("POST", "/leads", data={})
+        with pytest.raises(CircuitBreakerError):
+            client._make_request("POST", "/leads", data={})
+
+        assert client.breaker.current_state == CircuitBreaker.OPEN
+        assert len(responses.calls) == 2
+
+    def test_probe_success_closes_the_circuit(self):
+        """Test that the first call after the reset timeout is let through as a probe."""
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 60
+
+        breaker.before_call()
+        assert breaker.current_state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitBreakerError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.current_state == CircuitBreaker.CLOSED
+
+    def test_lost_probe_is_replaced_after_the_timeout(self):
+        """Test that a probe which never reports back doesn't leave the circuit half-open."""
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 60
+
+        breaker.before_call()
+        with pytest.raises(CircuitBreakerError):
+            breaker.before_call()
+
+        breaker._opened_at -= 60
+        breaker.before_call()
+        assert breaker.current_state == CircuitBreaker.HALF_OPEN
+
+    @responses.activate
+    def test_cached_responses_are_revalidated_with_etags(self, tmp_path):
+        """Test that cached GETs send If-None-Match and reuse the body on a 304."""
+        url = f"{BASE_URL}/merchants/1"
+        responses.add(responses.GET, url, json={"data": {"mid": "1"}}, headers={"ETag": '"v1"'})
+        responses.add(responses.GET, url, status=304)
+        cache_path = str(tmp_path / "cache.sqlite")
+
+        first = IrelandPayCRMClient(api_key="test_api_key", cache_path=cache_path).get_merchant("1")
+        second = IrelandPayCRMClient(api_key="test_api_key", cache_path=cache_path).get_merchant("1")
+
+        assert first == second == {"data": {"mid": "1"}}
+        assert "If-None-Match" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+    @responses.activate
+    def test_stale_cache_is_served_while_the_circuit_is_open(self, tmp_path):
+        """Test that an open circuit falls back to a cached copy instead of failing."""
+        responses.add(responses.GET, f"{BASE_URL}/merchants/1", json={"data": {"mid": "1"}},
+                      headers={"ETag": '"v1"'})
+        client = IrelandPayCRMClient(api_key="test_api_key", cache_path=str(tmp_path / "cache.sqlite"))
+        client.get_merchant("1")
+        client.breaker = CircuitBreaker(fail_max=1, reset_timeout=60)
+        client.breaker.record_failure()
+
+        assert client.get_merchant("1") == {"data": {"mid": "1"}}
+        with pytest.raises(CircuitBreakerError):
+            client.get_merchant("2")
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_closed_month_residuals_are_served_from_cache(self, tmp_path):
+        """Test that residuals for a past month are not requested again while fresh."""
+        responses.add(responses.GET, f"{BASE_URL}/residuals/lineitems/2020/1", json={"data": [1]})
+        client = IrelandPayCRMClient(api_key="test_api_key", cache_path=str(tmp_path / "cache.sqlite"))
+
+        assert client.get_residuals_lineitems(2020, 1) == {"data": [1]}
+        assert client.get_residuals_lineitems(2020, 1) == {"data": [1]}
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_summary_rows_decode_into_typed_structs(self):
+        """Test that typed summary rows keep declared fields and skip the rest."""
+        pytest.importorskip("msgspec")
+        responses.add(responses.GET, f"{BASE_URL}/residuals/reports/summary/rows/7/2024/5",
+                      json={"data": [{"mid": 123, "merchant": "Test", "transactions": 3,
+                                      "sales_amount": 150, "users": True}],
+                            "meta": {"current_page": 1, "last_page": 1}})
+        client = IrelandPayCRMClient(api_key="test_api_key")
+
+        page = client.get_residuals_summary_rows_typed("7", 2024, 5)
+
+        assert page.data[0].mid == 123
+        assert page.data[0].sales_amount == 150.0
+        assert not hasattr(page.data[0], "users")
+        assert page.meta.last_page == 1
+
+    @responses.activate
+    def test_residuals_details_rows_are_streamed(self):
+        """Test that detail rows are yielded one by one with query parameters passed on."""
+        rows = [{"mid": "1", "net": 10.5}, {"mid": "2", "net": 3}]
+        responses.add(responses.GET, f"{BASE_URL}/residuals/reports/details/7/2024/5",
+                      json={"data": rows, "meta": {"last_page": 1}})
+        client = IrelandPayCRMClient(api_key="test_api_key")
+
+        stream = client.iter_residuals_details("7", 2024, 5, page=2)
+
+        assert not responses.calls  # Nothing is requested until the rows are consumed
+        assert list(stream) == rows
+        assert "page=2" in responses.calls[0].request.url
+
+
+class TestAsyncRequests:
+    """Test cases for the client's async request path."""
+
+    def test_merchant_pages_are_fetched_concurrently(self):
+        """Test that bulk page fetches share one async client and keep page order."""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={"data": [{"merchant_number": str(page)}]})
+
+        client = IrelandPayCRMClient(api_key="test_api_key", transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await client.get_merchants_bulk([1, 2, 3], per_page=50)
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(run())
+
+        assert [r["data"][0]["merchant_number"] for r in results] == ["1", "2", "3"]
+        assert all(r.url.path == "/api/v1/merchants" for r in seen)
+        assert all(r.url.params["per_page"] == "50" for r in seen)
+        assert all(r.headers["X-API-KEY"] == "test_api_key" for r in seen)
+
+    def test_all_merchant_pages_follow_the_first(self):
+        """Test that the page count from page 1 drives the remaining requests."""
+        pages = []
+
+        def handler(request):
+            page = int(request.url.params["page"])
+            pages.append(page)
+            return httpx.Response(200, json={"data": [{"merchant_number": str(page)}],
+                                             "meta": {"last_page": 3}})
+
+        client = IrelandPayCRMClient(api_key="test_api_key", transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await client.get_merchants_all(status="active")
+            finally:
+                await client.aclose()
+
+        merchants = asyncio.run(run())
+
+        assert [m["merchant_number"] for m in merchants] == ["1", "2", "3"]
+        assert pages[0] == 1 and sorted(pages) == [1, 2, 3]
+
+    @pytest.mark.parametrize("orjson_installed", [False, True])
+    def test_large_bodies_are_decoded_off_the_event_loop(self, orjson_installed):
+        """Test that without orjson, bodies over the offload size are parsed by the worker pool."""
+        body = {"data": [{"merchant_number": str(n)} for n in range(50)]}
+        client = IrelandPayCRMClient(
+            api_key="test_api_key",
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+        )
+        client.DECODE_OFFLOAD_BYTES = 100
+        
+        async def run():
+            try:
+                result = await client.get_merchants_bulk([1])
+                assert (client._decode_pool is None) == orjson_installed
+                return result
+            finally:
+                await client.aclose()
+        
+        orjson = pytest.importorskip("orjson") if orjson_installed else None
+        with patch("lib.iriscrm_client.client.orjson", orjson):
+            assert asyncio.run(run()) == [body]
+        assert client._decode_pool is None
+
+    def test_http_errors_are_raised(self):
+        """Test that error statuses propagate from async requests."""
+        client = IrelandPayCRMClient(
+            api_key="test_api_key",
+            transport=httpx.MockTransport(lambda request: httpx.Response(500, text="boom"))
+        )
+
+        async def run():
+            try:
+                await client.get_merchants_bulk([1])
+            finally:
+                await client.aclose()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_rate_limit_headers_pace_requests(self):
+        """Test that rate-limit headers tune the limiter and a 429 is waited out and re-sent."""
+        responses = iter([
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"data": []},
+                           headers={"X-RateLimit-Limit": "120", "X-RateLimit-Remaining": "0"}),
+        ])
+        client = IrelandPayCRMClient(
+            api_key="test_api_key",
+            transport=httpx.MockTransport(lambda request: next(responses))
+        )
+
+        async def run():
+            try:
+                return await client.get_merchants_bulk([1])
+            finally:
+                await client.aclose()
+
+        assert asyncio.run(run()) == [{"data": []}]
+        assert client.limiter.rate == 2
+        assert client.limiter._tokens == 0
+    
+    def test_rate_limited_request_is_resent_up_to_the_retry_limit(self):
+        """Test that a request still limited after RATE_LIMIT_RETRIES re-sends raises."""
+        sent = []
+        
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        
+        client = IrelandPayCRMClient(api_key="test_api_key", transport=httpx.MockTransport(handler))
+        
+        async def run():
+            try:
+                return await client.get_merchants_bulk([1])
+            finally:
+                await client.aclose()
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert len(sent) == client.RATE_LIMIT_RETRIES + 1
+
+
+class TestAsyncTokenBucket:
+    """Test cases for the AsyncTokenBucket class."""
+
+    def test_requests_past_the_burst_wait_for_tokens(self):
+        """Test that an empty bucket delays callers by the refill time."""
+        bucket = AsyncTokenBucket(rate=20, capacity=2)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(4):
+                await bucket.acquire()
+            return loop.time() - start
+
+        # Two tokens are available up front, the other two take 1/20 s each
+        assert asyncio.run(run()) >= 0.09
@@ -277,3 +277,58 @@ class TestNotifier:
         assert '100' in content  # merchants_processed
         assert '50' in content   # residuals_processed
         assert '10' in content   # agents_processed
+    
+    def test_flush_slack_batches_queued_blocks(self):
+        """Test that queued agent statement blocks are sent in batches of 50."""
+        with patch.object(self.notifier, 'send_email', return_value=True), \
+             patch.object(self.notifier, 'send_slack_message', return_value=True) as mock_send:
+            for i in range(55):
+                self.notifier.notify_agent_statement_ready(f'Agent {i}', '2023-05', '/path/to/statement.pdf')
+            
+            # Nothing is sent until the queue is flushed
+            mock_send.assert_not_called()
+            
+            result = self.notifier.flush_slack()
+        
+        # Verify the results
+        assert result is True
+        assert mock_send.call_count == 2
+        assert len(mock_send.call_args_list[0][0][1]) == 50
+        assert len(mock_send.call_args_list[1][0][1]) == 5
+        assert self.notifier._slack_queue == []
+    
+    def test_notify_pipeline_error_flushes_queued_blocks(self):
+        """Test that agent statement blocks queued before a failure still go out."""
+        with patch.object(self.notifier, 'send_email', return_value=True), \
+             patch.object(self.notifier, 'send_slack_message', return_value=True) as mock_send:
+            self.notifier.notify_agent_statement_ready('Agent 1', '2023-05', '/path/to/statement.pdf')
+            self.notifier.notify_pipeline_error('2023-05', 'Test error message')
+        
+        # The error message, then the queued statement block
+        assert mock_send.call_count == 2
+        assert len(mock_send.call_args_list[1][0][1]) == 1
+        assert self.notifier._slack_queue == []
+    
+    def test_flush_slack_empty_queue(self):
+        """Test that flushing an empty queue does not call Slack."""
+        with patch.object(self.notifier, 'send_slack_message') as mock_send:
+            result = self.notifier.flush_slack()
+        
+        assert result is True
+        mock_send.assert_not_called()
+    
+    def test_send_slack_message_posts_encoded_payload(self):
+        """Test that the Slack payload is posted as pre-encoded JSON bytes."""
+        import json
+        
+        self.notifier.slack_webhook_url = 'https://hooks.slack.com/services/test'
+        blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": "Café ✓"}}]
+        
+        with patch('requests.post') as mock_post:
+            mock_post.return_value.status_code = 200
+            result = self.notifier.send_slack_message("Test message", blocks)
+        
+        assert result is True
+        data = mock_post.call_args[1]['data']
+        assert isinstance(data, bytes)
+        assert json.loads(data) == {"text": "Test message", "blocks": blocks}
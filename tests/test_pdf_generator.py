@@ -280,3 +280,42 @@ class TestPDFGenerator:
         
         # Verify that the output path is correct
         assert 'Monthly_Summary_2023-05.pdf' in output_path
+
+
+def test_close_flushes_background_writes(tmp_path):
+    """Reports are written in the background and are complete once close() returns."""
+    generator = PDFGenerator(output_dir=tmp_path)
+    merchants = pd.DataFrame({
+        'merchant_dba': ['Merchant A', 'Merchant B'],
+        'total_volume': [1000.0, 2000.0],
+        'total_txns': [10, 20],
+        'bps': [50.0, 40.0],
+        'earnings': [5.0, 8.0]
+    })
+    
+    path = generator.create_agent_statement('Test Agent', '2023-05', {'merchant_count': 2}, merchants)
+    generator.close()
+    
+    with open(path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_failed_batch_still_flushes_background_writes(tmp_path):
+    """Leaving the generator's with block on an error joins queued writes and keeps the error."""
+    merchants = pd.DataFrame({
+        'merchant_dba': ['Merchant A'],
+        'total_volume': [1000.0],
+        'total_txns': [10],
+        'bps': [50.0],
+        'earnings': [5.0]
+    })
+    
+    with pytest.raises(RuntimeError, match="report failed"):
+        with PDFGenerator(output_dir=tmp_path) as generator:
+            path = generator.create_agent_statement('Test Agent', '2023-05', {'merchant_count': 1}, merchants)
+            raise RuntimeError("report failed")
+    
+    with open(path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+    assert generator._writer._shutdown